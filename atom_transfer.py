@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Atom Transfer - Stream Trust Atoms between stores and export files
+
+    python atom_transfer.py export local_atoms.json atoms.ndjson.gz
+    python atom_transfer.py export local_atoms.json atoms.npz --offset 1000000 --limit 500000
+    python atom_transfer.py import atoms.ndjson.gz local_atoms.json
+    python atom_transfer.py import published_uals.json local_atoms.json
+
+Formats follow the file suffix: .json (store / published_uals.json),
+.ndjson / .jsonl (optionally .gz) and .npz (compressed columns).
+"""
+
+import argparse
+import sys
+import time
+from itertools import islice
+
+from src.core.atom_io import import_records, iter_records, write_records
+
+
+def _progress(records, every: int = 100000):
+    """Pass records through, printing a running count"""
+    started = time.perf_counter()
+    count = 0
+    for count, record in enumerate(records, 1):
+        if count % every == 0:
+            rate = count / (time.perf_counter() - started)
+            print(f"  … {count:,} atoms ({rate:,.0f}/s)", file=sys.stderr)
+        yield record
+
+
+def export_atoms(args):
+    records = iter_records(args.source)
+    stop = None if args.limit is None else args.offset + args.limit
+    records = islice(records, args.offset, stop)
+
+    print(f"📤 Exporting {args.source} → {args.destination}")
+    started = time.perf_counter()
+    count = write_records(_progress(records), args.destination)
+    print(f"✅ Exported {count:,} atoms in {time.perf_counter() - started:.1f}s")
+    print(f"   Resume with --offset {args.offset + count}")
+
+
+def import_atoms(args):
+    print(f"📥 Importing {args.source} → {args.destination}")
+    started = time.perf_counter()
+    result = import_records(_progress(iter_records(args.source)), args.destination, args.batch_size)
+    print(f"✅ Imported {result['imported']:,} atoms in {time.perf_counter() - started:.1f}s")
+    print(f"   Duplicates skipped: {result['duplicates']:,}")
+    print(f"   Store total: {result['total']:,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Stream atoms from a store into an export file")
+    export.add_argument("source", help="Store file (or any supported format)")
+    export.add_argument("destination", help=".ndjson[.gz], .jsonl[.gz] or .npz")
+    export.add_argument("--offset", type=int, default=0, help="Skip this many atoms (resume cursor)")
+    export.add_argument("--limit", type=int, default=None, help="Export at most this many atoms")
+    export.set_defaults(run=export_atoms)
+
+    imp = commands.add_parser("import", help="Merge atoms from a file into a store (duplicates skipped)")
+    imp.add_argument("source", help=".ndjson[.gz], .jsonl[.gz], .npz or .json")
+    imp.add_argument("destination", help="Store file, e.g. local_atoms.json")
+    imp.add_argument("--batch-size", type=int, default=10000)
+    imp.set_defaults(run=import_atoms)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Graph Analytics - Centralities of the trust graph beyond PageRank
+
+    python graph_analytics.py hits local_atoms.json [--top 20]
+    python graph_analytics.py degrees local_atoms
+    python graph_analytics.py betweenness atoms.ndjson.gz --samples 512 --workers 0
+
+The source is a store (file or segment directory) or any export file
+atom_transfer.py reads. Repeated issuer → target atoms are merged into one
+edge weighted by their overall score (--merge picks how).
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.algorithms.centrality import approximate_betweenness, degree_distribution, hits_scores
+from src.algorithms.graph_builder import MERGE_POLICIES, TrustGraph, TrustGraphBuilder, _parse_timestamp
+from src.core.atom_io import iter_records
+
+
+def load_graph(source: str, merge: str) -> TrustGraph:
+    started = time.perf_counter()
+    builder = TrustGraphBuilder(merge=merge)
+    for record in iter_records(source):
+        atom = record.get("trustAtom", {})
+        if atom.get("issuer") and atom.get("target"):
+            builder.add_edge(
+                atom["issuer"],
+                atom["target"],
+                float(atom.get("overall", 0.0)),
+                timestamp=_parse_timestamp(atom.get("issued"))
+            )
+    graph = builder.build()
+    print(f"🕸️  {len(builder):,} atoms → {graph.node_count:,} nodes, {graph.edge_count:,} edges "
+          f"({time.perf_counter() - started:.1f}s)\n")
+    return graph
+
+
+def print_top(title: str, graph: TrustGraph, scores: np.ndarray, n: int):
+    from src.algorithms.reputation_queries import top_k
+
+    print(f"🏆 {title}:")
+    for rank, i in enumerate(top_k(scores, n), 1):
+        print(f"  {rank:3d}. {str(graph.nodes[i])[:40]:40s} {scores[i]:.4f}")
+    print()
+
+
+def run_hits(args):
+    graph = load_graph(args.source, args.merge)
+    started = time.perf_counter()
+    hubs, authorities = hits_scores(graph, args.iterations)
+    print(f"🧮 HITS in {time.perf_counter() - started:.2f}s\n")
+    print_top(f"Top {args.top} hubs (endorsers)", graph, hubs, args.top)
+    print_top(f"Top {args.top} authorities (trusted targets)", graph, authorities, args.top)
+
+
+def run_degrees(args):
+    graph = load_graph(args.source, args.merge)
+    for direction, summary in degree_distribution(graph, args.bins).items():
+        print(f"📈 Weighted {direction}-degree:")
+        print(f"  Mean: {summary['mean']:.3f}  Max: {summary['max']:.3f} ({summary['maxEdges']:,} edges)")
+        print(f"  Nodes without {direction}-edges: {summary['isolated']:,}")
+        for name, value in summary["percentiles"].items():
+            print(f"  {name.upper()}: {value:.3f}")
+        for bucket in summary["histogram"]:
+            print(f"  {bucket['from']:10.3f} – {bucket['to']:10.3f}  {bucket['nodes']:10,}")
+        print()
+
+
+def run_betweenness(args):
+    graph = load_graph(args.source, args.merge)
+    samples = None if args.samples == 0 else args.samples
+    started = time.perf_counter()
+    betweenness = approximate_betweenness(graph, samples, args.seed, args.workers)
+    exact = samples is None or samples >= graph.node_count
+    label = "exact" if exact else f"{samples} sampled sources"
+    print(f"🧮 Betweenness ({label}) in {time.perf_counter() - started:.2f}s\n")
+    print_top(f"Top {args.top} brokers", graph, betweenness, args.top)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def command(name: str, help: str, run) -> argparse.ArgumentParser:
+        sub = commands.add_parser(name, help=help)
+        sub.add_argument("source", help="Store file / directory or export file")
+        sub.add_argument("--merge", choices=MERGE_POLICIES, default="mean", help="How repeated atoms merge")
+        sub.set_defaults(run=run)
+        return sub
+
+    hits = command("hits", "Hub (endorser) and authority (trusted target) scores", run_hits)
+    hits.add_argument("--iterations", type=int, default=100)
+    hits.add_argument("--top", type=int, default=20)
+
+    degrees = command("degrees", "Weighted in/out-degree distributions", run_degrees)
+    degrees.add_argument("--bins", type=int, default=10, help="Log-spaced histogram bins")
+
+    betweenness = command("betweenness", "Approximate betweenness from sampled BFS sources", run_betweenness)
+    betweenness.add_argument("--samples", type=int, default=256, help="Source nodes to sample (0: all, exact)")
+    betweenness.add_argument("--seed", type=int, default=0)
+    betweenness.add_argument("--workers", type=int, default=1, help="Processes (0: one per CPU)")
+    betweenness.add_argument("--top", type=int, default=20)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,123 @@
 #!/usr/bin/env python3
 """MCP Server - Model Context Protocol endpoint for AI agents"""
 
+import hmac
 import os
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Header
+from fastapi import Depends, FastAPI, HTTPException, Header, Request, Response
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-from typing import Optional, List, Dict
-from src.core.dkg_publisher import DKGPublisher
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Literal
+from src.core.anomaly import AnomalyDetector, AnomalyRejected
+from src.core.content_hash import atom_content_id, local_ka_id
+from src.core.delta_sync import StoreReplica
+from src.core.dkg_publisher import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, DKGPublisher, reputation_confidence
+from src.core.fake_chain import FakeChain
+from src.core.ingest_log import IngestLog
+from src.core.payments import CreditLedger, PaymentVerifier, Web3ChainBackend
+from src.core.rate_limit import ConcurrencyLimiter, TokenBucketLimiter
+from src.core.shared_state import SharedStateReader
+from src.core.stake_ledger import StakeLedger
 from src.core.trust_atom import TrustAtomV7, TrustVector
 
 # Load environment variables
 load_dotenv()
 
-app = FastAPI(title="Trust Graph v7 MCP Server")
-publisher = DKGPublisher()
+# Serving mode: "single" process owning the store, or (MCP_WORKERS > 1) a
+# "supervisor" that spawns one state writer process plus N "worker" processes.
+# Workers answer reputation from the writer's memory-mapped snapshot and
+# queue new atoms in the ingest log instead of writing the store themselves.
+MCP_WORKERS = int(os.getenv("MCP_WORKERS", "1"))
+MCP_ROLE = os.getenv("MCP_ROLE") or ("supervisor" if __name__ == "__main__" and MCP_WORKERS > 1 else "single")
+STATE_FILE = os.getenv("MCP_STATE_FILE", "reputation_state.bin")
+INGEST_FILE = os.getenv("MCP_INGEST_FILE", "ingest.log")
+OUTBOX_FILE = os.getenv("DKG_OUTBOX_FILE", "publish_outbox.log")
+RANK_REFRESH_INTERVAL = float(os.getenv("RANK_REFRESH_INTERVAL", "300"))
+RANK_REFRESH_AFTER = int(os.getenv("RANK_REFRESH_AFTER", "100"))
+# Stake ledger written by the publishing pipeline (StakeValidator); when set, PageRank
+# weights issuers by stake and re-ranks on slashes the ledger file picks up
+STAKE_LEDGER_FILE = os.getenv("STAKE_LEDGER_FILE")
+# How strongly PageRank damps trust flowing out of suspected Sybil clusters (0 = off, 1 = fully)
+RANK_SYBIL_STRENGTH = float(os.getenv("RANK_SYBIL_STRENGTH", "0"))
+
+# Atom storage: a .json file, or a segment directory; with ATOM_STORE_HOT_ATOMS > 0 a
+# segment directory is tiered (bodies paged in from disk, at most that many cached)
+ATOM_STORE_PATH = os.getenv("ATOM_STORE_PATH", "local_atoms.json")
+ATOM_STORE_HOT_ATOMS = int(os.getenv("ATOM_STORE_HOT_ATOMS", "0")) or None
+
+# Burst detection on published atoms: "flag", "throttle" (429), "quarantine" (202, held) or "off".
+# Each worker process counts its own share of the traffic. Quarantined atoms are kept in
+# ANOMALY_QUARANTINE_FILE and reviewed through /mcp/quarantine/* (X-Review-Secret header).
+ANOMALY_ACTION = os.getenv("ANOMALY_ACTION", "flag")
+QUARANTINE_FILE = os.getenv("ANOMALY_QUARANTINE_FILE", "quarantine.log")
+QUARANTINE_REVIEW_SECRET = os.getenv("QUARANTINE_REVIEW_SECRET")
+if ANOMALY_ACTION == "quarantine" and MCP_ROLE != "single":
+    print("⚠️  ANOMALY_ACTION=quarantine needs single-process mode - throttling anomalous atoms instead")
+    ANOMALY_ACTION = "throttle"
+anomaly_detector = None if ANOMALY_ACTION == "off" else AnomalyDetector(
+    action=ANOMALY_ACTION,
+    short_window=float(os.getenv("ANOMALY_WINDOW", "60")),
+    issuer_limit=int(os.getenv("ANOMALY_ISSUER_LIMIT", "60")),
+    target_limit=int(os.getenv("ANOMALY_TARGET_LIMIT", "200")),
+    max_quarantine=int(os.getenv("ANOMALY_MAX_QUARANTINE", "10000")),
+    quarantine_file=QUARANTINE_FILE if ANOMALY_ACTION == "quarantine" else None
+)
+
+# Admission control (per process): token buckets per client address and per
+# publishing issuer, and a cap on requests in flight beyond which requests are
+# shed with 503 instead of queueing for the thread pool.
+client_limiter = TokenBucketLimiter(
+    rate=float(os.getenv("RATE_LIMIT_CLIENT_RPS", "20")),
+    burst=float(os.getenv("RATE_LIMIT_CLIENT_BURST", "40")),
+    max_keys=int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+)
+issuer_limiter = TokenBucketLimiter(
+    rate=float(os.getenv("RATE_LIMIT_ISSUER_PER_MIN", "30")) / 60,
+    burst=float(os.getenv("RATE_LIMIT_ISSUER_BURST", "10")),
+    max_keys=int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+)
+concurrency = ConcurrencyLimiter(int(os.getenv("MCP_MAX_CONCURRENT", "64")))
+TRUST_FORWARDED_FOR = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+ADMISSION_EXEMPT = ("/", "/health", "/stats", "/mcp/tools")
+
+# /sync/* is only served to peers sending X-Sync-Secret or connecting from an
+# allowlisted address (comma separated); with neither configured sync is off.
+SYNC_PEER_SECRET = os.getenv("SYNC_PEER_SECRET")
+SYNC_PEER_ALLOWLIST = {a.strip() for a in os.getenv("SYNC_PEER_ALLOWLIST", "").split(",") if a.strip()}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the outbox and start background work when the server starts (not on import)"""
+    stake_ledger = None
+    if MCP_ROLE == "single":
+        publisher.open_outbox(OUTBOX_FILE)
+        if publisher.dkg_configured:
+            publisher.start_outbox_drainer()
+        stake_ledger = StakeLedger(STAKE_LEDGER_FILE, read_only=True) if STAKE_LEDGER_FILE else None
+        publisher.start_rank_refresher(
+            interval=RANK_REFRESH_INTERVAL,
+            refresh_after=RANK_REFRESH_AFTER,
+            stake_ledger=stake_ledger,
+            sybil_strength=RANK_SYBIL_STRENGTH
+        )
+        if stake_ledger is not None:
+            stake_ledger.follow()
+    yield
+    publisher.stop_outbox_drainer()
+    publisher.stop_rank_refresher()
+    if stake_ledger is not None:
+        stake_ledger.stop()
+
+
+app = FastAPI(title="Trust Graph v7 MCP Server", lifespan=lifespan)
+publisher = DKGPublisher(
+    storage_file=ATOM_STORE_PATH,
+    anomaly_detector=anomaly_detector,
+    hot_atoms=ATOM_STORE_HOT_ATOMS
+)
+shared_state = SharedStateReader(STATE_FILE) if MCP_ROLE == "worker" else None
+ingest_log = IngestLog(INGEST_FILE) if MCP_ROLE == "worker" else None
 
 
 # Request models
@@ -29,6 +132,35 @@ class CheckThresholdRequest(BaseModel):
     threshold: float
 
 
+AtomField = Literal["atom", "contentId", "issuer", "target", "overall", "content", "mode", "timestamp", "issued"]
+
+
+class AtomPageRequest(BaseModel):
+    limit: int = Field(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+    fields: Optional[List[AtomField]] = None
+
+
+class IssuerQueryRequest(AtomPageRequest):
+    issuer: str
+
+
+class TargetAtomsRequest(AtomPageRequest):
+    target: str
+
+
+class NeighborhoodRequest(BaseModel):
+    did: str
+    hops: int = Field(default=2, ge=1, le=4)
+    direction: Literal["out", "in", "both"] = "out"
+
+
+class MutualTrustRequest(BaseModel):
+    did: str
+    limit: int = Field(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+
+
 class PublishAtomRequest(BaseModel):
     issuer: str
     target: str
@@ -36,16 +168,120 @@ class PublishAtomRequest(BaseModel):
     content: str = ""
 
 
+class QuarantineListRequest(BaseModel):
+    limit: int = Field(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    offset: int = Field(default=0, ge=0)
+
+
+class QuarantineReleaseRequest(BaseModel):
+    content_id: str = Field(alias="contentId")
+    publish: bool = True
+
+
+class SyncPrefixesRequest(BaseModel):
+    prefixes: List[str] = Field(max_length=4096)
+
+
+class SyncRecordsRequest(BaseModel):
+    content_ids: List[str] = Field(alias="contentIds", max_length=5000)
+
+
+class SyncChangesRequest(BaseModel):
+    since: int = Field(ge=0)
+    limit: int = Field(default=1000, ge=1, le=5000)
+
+
+class SyncAcceptRequest(BaseModel):
+    records: List[Dict] = Field(max_length=5000)
+
+
 # x402 Payment middleware
-def verify_payment(payment_proof: Optional[str], price: float) -> bool:
-    """Verify x402 payment (simplified for demo)"""
+PAYMENT_ADDRESS = os.getenv("X402_WALLET_ADDRESS", "0x742d35Cc...")
+QUERY_PRICE = float(os.getenv("X402_PRICE_PER_QUERY", "0.001"))
+# Spent credits per proof, shared by all worker processes and kept across restarts
+CREDITS_FILE = os.getenv("X402_CREDITS_FILE", "x402_credits.log")
+
+
+def _payment_backend():
+    """On-chain backend when an RPC is configured, otherwise an empty local chain"""
+    rpc_url = os.getenv("X402_CHAIN_RPC")
+    if rpc_url:
+        return Web3ChainBackend(
+            rpc_url,
+            os.getenv("X402_TOKEN_ADDRESS", ""),
+            decimals=int(os.getenv("X402_TOKEN_DECIMALS", "6"))
+        )
+    print("⚠️  X402_CHAIN_RPC not configured - only the bypass token is accepted")
+    return FakeChain()
+
+
+payments = PaymentVerifier(
+    _payment_backend(),
+    PAYMENT_ADDRESS,
+    price=QUERY_PRICE,
+    ledger=CreditLedger(CREDITS_FILE)
+)
+
+
+def verify_payment(payment_proof: Optional[str]) -> Dict:
+    """Charge one query to an x402 payment proof (verified on-chain once, then cached)"""
     bypass_token = os.getenv("X402_BYPASS_TOKEN")
     
-    if payment_proof == bypass_token:
-        return True
+    if bypass_token and payment_proof == bypass_token:
+        return {"ok": True, "status": "bypass", "remaining": None}
+    
+    return payments.charge(payment_proof)
+
+
+def get_reputation(target: str) -> Dict:
+    """Aggregate reputation for target (from the shared snapshot in worker processes)"""
+    if shared_state is None:
+        return publisher.get_aggregate_reputation(target)
     
-    # In production: verify on-chain transaction
-    return payment_proof and len(payment_proof) > 32
+    view = shared_state.current()
+    row = (view.lookup(target) if view is not None else None) or {}
+    atom_count = int(row.get("atomCount", 0))
+    average = row.get("averageOverall", 0.0)
+    graph_score = row.get("graphScore")
+    return {
+        "target": target,
+        "atomCount": atom_count,
+        "averageOverall": average if atom_count else 0.0,
+        "confidence": reputation_confidence(atom_count),
+        "graphScore": None if graph_score is None or graph_score != graph_score else graph_score,
+        "generation": view.generation if view is not None else None
+    }
+
+
+def _client_key(request: Request) -> str:
+    if TRUST_FORWARDED_FOR and request.headers.get("x-forwarded-for"):
+        return request.headers["x-forwarded-for"].split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def _too_many(error: str, retry_after: float, status_code: int = 429) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={"error": error, "retryAfter": round(retry_after, 3)},
+        headers={"Retry-After": str(max(1, int(retry_after + 0.999)))}
+    )
+
+
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    """Per-client rate limit and global load shedding, decided before any work is queued"""
+    if request.url.path in ADMISSION_EXEMPT:
+        return await call_next(request)
+    
+    allowed, retry_after = client_limiter.acquire(_client_key(request))
+    if not allowed:
+        return _too_many("Too Many Requests", retry_after)
+    if not concurrency.try_acquire():
+        return _too_many("Server Busy", 1.0, status_code=503)
+    try:
+        return await call_next(request)
+    finally:
+        concurrency.release()
 
 
 @app.get("/")
@@ -59,7 +295,30 @@ def root():
 
 @app.get("/health")
 def health():
-    return {"status": "healthy", "service": "Trust Graph v7 MCP Server"}
+    status = {"status": "healthy", "service": "Trust Graph v7 MCP Server", "role": MCP_ROLE}
+    if shared_state is not None:
+        status["sharedState"] = shared_state.get_stats()
+    if publisher.dkg_configured and publisher.client_manager is not None:
+        # Cached node state only - health checks must not wait on the DKG node
+        status["dkg"] = publisher.client_manager.get_stats()
+    return status
+
+
+@app.get("/stats")
+def stats():
+    """Request coalescing, payment verification, admission control and anomaly detection metrics"""
+    stats = publisher.get_coalescing_stats()
+    stats["payments"] = payments.get_stats()
+    stats["admission"] = {
+        "clients": client_limiter.get_stats(),
+        "issuers": issuer_limiter.get_stats(),
+        "concurrency": concurrency.get_stats()
+    }
+    if anomaly_detector is not None:
+        stats["anomalies"] = anomaly_detector.get_stats()
+    if shared_state is not None:
+        stats["sharedState"] = shared_state.get_stats()
+    return stats
 
 
 @app.get("/mcp/tools")
@@ -71,7 +330,7 @@ def get_tools():
         "tools": [
             {
                 "name": "query_reputation",
-                "description": "Query aggregated reputation score for a target entity",
+                "description": "Query aggregated reputation score (and PageRank graphScore) for a target entity",
                 "inputSchema": {
                     "type": "object",
                     "properties": {
@@ -94,6 +353,60 @@ def get_tools():
                     "required": ["target", "dimension", "threshold"]
                 }
             },
+            {
+                "name": "list_trust_atoms",
+                "description": "List Trust Atoms about a target, highest overall first (paginated)",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "target": {"type": "string"},
+                        "limit": {"type": "integer", "minimum": 1, "maximum": MAX_PAGE_SIZE},
+                        "cursor": {"type": "string", "description": "nextCursor from the previous page"},
+                        "fields": {"type": "array", "items": {"type": "string", "enum": list(AtomField.__args__)}}
+                    },
+                    "required": ["target"]
+                }
+            },
+            {
+                "name": "query_by_issuer",
+                "description": "List Trust Atoms published by an issuer, highest overall first (paginated)",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "issuer": {"type": "string"},
+                        "limit": {"type": "integer", "minimum": 1, "maximum": MAX_PAGE_SIZE},
+                        "cursor": {"type": "string", "description": "nextCursor from the previous page"},
+                        "fields": {"type": "array", "items": {"type": "string", "enum": list(AtomField.__args__)}}
+                    },
+                    "required": ["issuer"]
+                }
+            },
+            {
+                "name": "trust_neighborhood",
+                "description": "Find DIDs within k trust hops of a DID",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "did": {"type": "string"},
+                        "hops": {"type": "integer", "minimum": 1, "maximum": 4},
+                        "direction": {"type": "string", "enum": ["out", "in", "both"]}
+                    },
+                    "required": ["did"]
+                }
+            },
+            {
+                "name": "mutual_trust",
+                "description": "Find DIDs that trust a DID and are trusted by it (paginated)",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "did": {"type": "string"},
+                        "limit": {"type": "integer", "minimum": 1, "maximum": MAX_PAGE_SIZE},
+                        "cursor": {"type": "string", "description": "nextCursor from the previous page"}
+                    },
+                    "required": ["did"]
+                }
+            },
             {
                 "name": "publish_trust_atom",
                 "description": "Publish a new Trust Atom to the DKG",
@@ -115,24 +428,33 @@ def get_tools():
 @app.post("/mcp/query_reputation")
 def query_reputation(
     request: QueryReputationRequest,
+    response: Response,
     x_payment_proof: Optional[str] = Header(None)
 ):
     """Query reputation (x402 protected)"""
     
     # Check payment
-    if not verify_payment(x_payment_proof, 0.001):
+    payment = verify_payment(x_payment_proof)
+    if not payment["ok"]:
         return JSONResponse(
             status_code=402,
             content={
                 "error": "Payment Required",
                 "protocol": "x402",
-                "price": "0.001 USDC",
-                "paymentAddress": os.getenv("X402_WALLET_ADDRESS", "0x742d35Cc..."),
-                "instructions": "Include X-Payment-Proof header with transaction hash"
-            }
+                "price": f"{QUERY_PRICE} USDC",
+                "paymentAddress": PAYMENT_ADDRESS,
+                "paymentStatus": payment["status"],
+                "reason": payment.get("error"),
+                "instructions": "Include X-Payment-Proof header with transaction hash "
+                                "(a payment of N x price prepays N queries)"
+            },
+            # Verification still running on-chain - the same proof will work shortly
+            headers={"Retry-After": "1"} if payment["status"] == "pending" else None
         )
+    if payment["remaining"] is not None:
+        response.headers["X-Payment-Credits-Remaining"] = str(payment["remaining"])
     
-    reputation = publisher.get_aggregate_reputation(request.target)
+    reputation = get_reputation(request.target)
     
     # Filter dimensions if requested
     if request.dimensions:
@@ -152,7 +474,7 @@ def query_reputation(
 def check_trust_threshold(request: CheckThresholdRequest):
     """Check trust threshold (free endpoint)"""
     
-    reputation = publisher.get_aggregate_reputation(request.target)
+    reputation = get_reputation(request.target)
     
     # Simplified: use overall score for all dimensions
     score = reputation["averageOverall"]
@@ -168,10 +490,61 @@ def check_trust_threshold(request: CheckThresholdRequest):
     }
 
 
+def _require_local_store():
+    """Listings and graph walks read the atom store, which worker processes don't keep current"""
+    if MCP_ROLE == "worker":
+        raise HTTPException(
+            status_code=503,
+            detail="Served in single-process mode only (workers answer reputation from the shared snapshot)"
+        )
+
+
+@app.post("/mcp/list_trust_atoms")
+def list_trust_atoms(request: TargetAtomsRequest):
+    """Page of atoms about a target (free endpoint)"""
+    
+    _require_local_store()
+    try:
+        return publisher.list_trust_atoms(request.target, request.limit, request.cursor, request.fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/mcp/query_by_issuer")
+def query_by_issuer(request: IssuerQueryRequest):
+    """Page of atoms issued by an issuer (free endpoint)"""
+    
+    _require_local_store()
+    try:
+        return publisher.list_atoms_by_issuer(request.issuer, request.limit, request.cursor, request.fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/mcp/trust_neighborhood")
+def trust_neighborhood(request: NeighborhoodRequest):
+    """k-hop trust neighborhood (free endpoint)"""
+    
+    _require_local_store()
+    return publisher.get_trust_neighborhood(request.did, request.hops, request.direction)
+
+
+@app.post("/mcp/mutual_trust")
+def mutual_trust(request: MutualTrustRequest):
+    """Mutual trust relationships (free endpoint)"""
+    
+    _require_local_store()
+    return publisher.get_mutual_trust(request.did, request.limit, request.cursor)
+
+
 @app.post("/mcp/publish_trust_atom")
 def publish_trust_atom(request: PublishAtomRequest):
     """Publish Trust Atom"""
     
+    allowed, retry_after = issuer_limiter.acquire(request.issuer)
+    if not allowed:
+        return _too_many("Issuer rate limit exceeded", retry_after)
+    
     try:
         atom = TrustAtomV7(
             issuer=request.issuer,
@@ -180,6 +553,21 @@ def publish_trust_atom(request: PublishAtomRequest):
             content=request.content
         )
         
+        if ingest_log is not None:
+            # Worker process: the state writer owns the store and publishes it
+            if not atom.is_valid():
+                raise ValueError("Invalid Trust Atom - cannot publish")
+            jsonld = atom.to_jsonld()
+            content_id = atom_content_id(jsonld)
+            publisher.screen_atom(atom, jsonld, content_id)
+            ingest_log.append({"atom": jsonld, "contentId": content_id})
+            return {
+                "success": True,
+                "kaId": local_ka_id(content_id),
+                "queued": True,
+                "atom": jsonld
+            }
+        
         ka_id = publisher.publish_trust_atom(atom)
         
         return {
@@ -187,20 +575,152 @@ def publish_trust_atom(request: PublishAtomRequest):
             "kaId": ka_id,
             "atom": atom.to_jsonld()
         }
+    except AnomalyRejected as rejected:
+        if rejected.verdict["action"] == "quarantine":
+            return JSONResponse(
+                status_code=202,
+                content={
+                    "success": False,
+                    "quarantined": True,
+                    "contentId": rejected.content_id,
+                    "anomaly": rejected.verdict
+                }
+            )
+        return JSONResponse(
+            status_code=429,
+            content={"error": "Too Many Requests", "anomaly": rejected.verdict},
+            headers={"Retry-After": str(max(1, round(rejected.retry_after)))}
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _quarantine_reviewer(x_review_secret: Optional[str] = Header(None)) -> AnomalyDetector:
+    """The anomaly detector holding quarantined atoms, for reviewers only"""
+    if anomaly_detector is None or anomaly_detector.action != "quarantine":
+        raise HTTPException(status_code=404, detail="Quarantine is off (ANOMALY_ACTION is not quarantine)")
+    if not QUARANTINE_REVIEW_SECRET:
+        raise HTTPException(status_code=403, detail="Quarantine review is disabled (set QUARANTINE_REVIEW_SECRET)")
+    if not x_review_secret or not hmac.compare_digest(x_review_secret.encode(), QUARANTINE_REVIEW_SECRET.encode()):
+        raise HTTPException(status_code=403, detail="Invalid review secret")
+    return anomaly_detector
+
+
+@app.post("/mcp/quarantine/list")
+def list_quarantine(request: QuarantineListRequest, detector: AnomalyDetector = Depends(_quarantine_reviewer)):
+    """Atoms held for review, oldest first"""
+    return {
+        "total": len(detector.quarantine),
+        "atoms": detector.quarantine.held(request.limit, request.offset)
+    }
+
+
+@app.post("/mcp/quarantine/release")
+def release_quarantine(request: QuarantineReleaseRequest, detector: AnomalyDetector = Depends(_quarantine_reviewer)):
+    """Publish a held atom (publish=true) or drop it"""
+    if request.content_id not in detector.quarantine:
+        raise HTTPException(status_code=404, detail="Atom not in quarantine")
+    if not request.publish:
+        return {"success": publisher.discard_quarantined(request.content_id), "published": False}
+    ka_id = publisher.release_quarantined(request.content_id)
+    if ka_id is None:
+        raise HTTPException(status_code=404, detail="Atom not in quarantine")
+    return {"success": True, "published": True, "kaId": ka_id}
+
+
+# Delta sync between TrustGraph nodes (see src/core/delta_sync.py)
+def _sync_replica(request: Request, x_sync_secret: Optional[str] = Header(None)) -> StoreReplica:
+    """The local sync peer, for authenticated peers only"""
+    if MCP_ROLE != "single":
+        raise HTTPException(status_code=503, detail="Delta sync is served in single-process mode only")
+    if not SYNC_PEER_SECRET and not SYNC_PEER_ALLOWLIST:
+        raise HTTPException(status_code=403, detail="Delta sync is disabled (set SYNC_PEER_SECRET or SYNC_PEER_ALLOWLIST)")
+    if SYNC_PEER_SECRET and x_sync_secret and hmac.compare_digest(x_sync_secret.encode(), SYNC_PEER_SECRET.encode()):
+        return publisher.sync_replica
+    if _client_key(request) in SYNC_PEER_ALLOWLIST:
+        return publisher.sync_replica
+    raise HTTPException(status_code=403, detail="Unknown sync peer")
+
+
+@app.post("/sync/info")
+def sync_info(replica: StoreReplica = Depends(_sync_replica)):
+    return replica.info()
+
+
+@app.post("/sync/children")
+def sync_children(request: SyncPrefixesRequest, replica: StoreReplica = Depends(_sync_replica)):
+    return replica.children(request.prefixes)
+
+
+@app.post("/sync/ids")
+def sync_ids(request: SyncPrefixesRequest, replica: StoreReplica = Depends(_sync_replica)):
+    return replica.ids(request.prefixes)
+
+
+@app.post("/sync/records")
+def sync_records(request: SyncRecordsRequest, replica: StoreReplica = Depends(_sync_replica)):
+    return {"records": replica.records(request.content_ids)}
+
+
+@app.post("/sync/changes")
+def sync_changes(request: SyncChangesRequest, replica: StoreReplica = Depends(_sync_replica)):
+    return replica.changes(request.since, request.limit)
+
+
+@app.post("/sync/accept")
+def sync_accept(request: SyncAcceptRequest, replica: StoreReplica = Depends(_sync_replica)):
+    """Store a peer's atoms: verified by content, screened and held to the issuer rate limit"""
+    rejected = replica.rejected
+    accepted = replica.accept(request.records, admit=lambda atom, record: issuer_limiter.acquire(atom.issuer)[0])
+    if accepted:
+        publisher.store.save()
+    return {"accepted": accepted, "rejected": replica.rejected - rejected}
+
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("MCP_PORT", "3000"))
     
     print(f"🚀 Trust Graph v7 MCP Server starting on port {port}")
     print(f"\n📡 MCP Endpoints:")
+    print(f"  GET  /stats - Coalescing and payment metrics")
     print(f"  GET  /mcp/tools - Tool discovery")
     print(f"  POST /mcp/query_reputation - Query reputation (x402 protected)")
     print(f"  POST /mcp/check_trust_threshold - Check trust threshold (free)")
+    print(f"  POST /mcp/query_by_issuer - Atoms issued by a DID (free)")
+    print(f"  POST /mcp/list_trust_atoms - Atoms about a target, paginated (free)")
+    print(f"  POST /mcp/trust_neighborhood - k-hop trust neighborhood (free)")
+    print(f"  POST /mcp/mutual_trust - Mutual trust relationships (free)")
     print(f"  POST /mcp/publish_trust_atom - Publish new atom")
+    print(f"  POST /mcp/quarantine/list, /mcp/quarantine/release - Review quarantined atoms")
+    print(f"  POST /sync/* - Delta sync with other TrustGraph nodes")
     print(f"\n💡 Use with AI agents via Model Context Protocol\n")
     
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    if MCP_ROLE == "supervisor":
+        import multiprocessing
+        from src.core.shared_state import run_state_writer
+        
+        print(f"🧵 Multi-worker mode: 1 state writer + {MCP_WORKERS} workers ({STATE_FILE})")
+        writer = multiprocessing.get_context("spawn").Process(
+            target=run_state_writer,
+            kwargs={
+                "storage_file": publisher.local_storage_file,
+                "hot_atoms": ATOM_STORE_HOT_ATOMS,
+                "state_file": STATE_FILE,
+                "ingest_file": INGEST_FILE,
+                "outbox_file": OUTBOX_FILE,
+                "rank_interval": RANK_REFRESH_INTERVAL,
+                "rank_refresh_after": RANK_REFRESH_AFTER,
+                "stake_ledger_file": STAKE_LEDGER_FILE,
+                "sybil_strength": RANK_SYBIL_STRENGTH
+            },
+            name="state-writer",
+            daemon=True
+        )
+        writer.start()
+        
+        # Worker processes re-import this module and pick up the worker role
+        os.environ["MCP_ROLE"] = "worker"
+        uvicorn.run("mcp_server:app", host="0.0.0.0", port=port, workers=MCP_WORKERS)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=port)
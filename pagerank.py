@@ -2,6 +2,7 @@
 """PageRank Analysis - Compute reputation scores from Trust Atoms"""
 
 from src.algorithms.pagerank import TrustPageRank
+from src.algorithms.graph_builder import TrustGraphBuilder
 from src.data.guardian_processor import GuardianProcessor
 from src.core.stake_validator import StakeValidator
 
@@ -31,12 +32,15 @@ def main():
     atoms = processor.process_dataset(guardian_data)
     print(f"  Generated {len(atoms)} Trust Atoms\n")
     
-    # Build PageRank graph
+    # Build PageRank graph (repeated issuer → target atoms merged by stake-weighted mean)
     print("🕸️  Building trust network graph...")
+    builder = TrustGraphBuilder(merge="stake_mean")
     for atom in atoms:
         stake_weight = stake_validator.calculate_stake_weight(atom.issuer)
-        pagerank.add_trust_atom(atom, stake_weight)
-    print("  Graph built\n")
+        builder.add_trust_atom(atom, stake_weight)
+    trust_graph = builder.build()
+    pagerank.add_graph(trust_graph)
+    print(f"  Graph built ({len(builder)} atoms → {trust_graph.edge_count} edges)\n")
     
     # Compute PageRank
     print("🧮 Computing weighted PageRank...")
@@ -49,6 +53,12 @@ def main():
         bar = "█" * int(entry["score"] * 30)
         print(f"{i:2d}. {node_id}... {bar} {score:.2f}%")
     
+    print("\n🗂️  Top 3 per Platform:")
+    platforms = processor.node_attribute(guardian_data, "platform")
+    for platform, entries in sorted(pagerank.get_top_n_by_group(platforms, 3).items()):
+        ranked = ", ".join(f"{e['node'][13:21]}… {e['score'] * 100:.1f}%" for e in entries)
+        print(f"  {platform:8s} {ranked}")
+    
     print("\n📈 Network Statistics:")
     stats = pagerank.get_stats()
     print(f"  Total Nodes: {stats['nodeCount']}")
@@ -56,6 +66,8 @@ def main():
     print(f"  Avg Score: {stats['avgScore'] * 100:.2f}%")
     print(f"  Max Score: {stats['maxScore'] * 100:.2f}%")
     print(f"  Min Score: {stats['minScore'] * 100:.2f}%")
+    for name, value in stats["percentiles"].items():
+        print(f"  {name.upper()} Score: {value * 100:.2f}%")
     
     print("\n💎 Stake Statistics:")
     print(stake_validator.get_stats())
@@ -8,6 +8,7 @@ import os
 from dotenv import load_dotenv
 from src.core.dkg_publisher import DKGPublisher
 from src.core.trust_atom import TrustAtomV7, TrustVector
+from src.core.stake_ledger import StakeLedger
 from src.core.stake_validator import StakeValidator
 
 # Load environment variables
@@ -120,7 +121,8 @@ def main():
     
     # Initialize
     publisher = DKGPublisher()
-    stake_validator = StakeValidator()
+    # Stake events go to STAKE_LEDGER_FILE when set, which the MCP server follows for ranking
+    stake_validator = StakeValidator(StakeLedger(os.getenv("STAKE_LEDGER_FILE")))
     
     # Create atoms
     print("\n⚙️  Creating Trust Atoms...")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark - measures cold-start cost of the package entry points
+Each case runs in a fresh interpreter; reports the median of several runs.
+
+    python scripts/bench_import_time.py [--runs 7]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = [
+    ("interpreter baseline", "pass"),
+    ("import src", "import src"),
+    ("import trust_atom", "from src.core.trust_atom import TrustAtomV7"),
+    ("import dkg_publisher", "from src.core.dkg_publisher import DKGPublisher"),
+    ("import pagerank", "from src.algorithms.pagerank import TrustPageRank"),
+    ("DKGPublisher()", "from src import DKGPublisher; DKGPublisher()"),
+    ("DKGPublisher() + first query", "from src import DKGPublisher; DKGPublisher().query_trust_atoms('x')"),
+    ("TrustPageRank()", "from src import TrustPageRank; TrustPageRank()"),
+]
+
+HEAVY_MODULES = ("networkx", "numpy", "dotenv", "dkg", "web3", "fastapi")
+
+TIMER = """
+import sys, time
+_t = time.perf_counter()
+{stmt}
+_elapsed = time.perf_counter() - _t
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(f"{{_elapsed * 1000:.2f}} {{','.join(heavy) or '-'}}")
+"""
+
+
+def run_case(stmt: str) -> tuple:
+    """Run one statement in a fresh interpreter, returns (ms, loaded heavy modules)"""
+    code = TIMER.format(stmt=stmt, heavy=HEAVY_MODULES)
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout.strip().splitlines()[-1]
+    ms, heavy = out.split(" ", 1)
+    return float(ms), heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"⏱️  Import-time benchmark ({args.runs} runs each, median)\n")
+    print(f"  {'case':32s} {'ms':>9s}  heavy modules loaded")
+    for name, stmt in CASES:
+        samples = [run_case(stmt) for _ in range(args.runs)]
+        median = statistics.median(ms for ms, _ in samples)
+        print(f"  {name:32s} {median:9.2f}  {samples[-1][1]}")
+
+
+if __name__ == "__main__":
+    main()
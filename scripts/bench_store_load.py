@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Atom store cold-start benchmark - JSON store file vs segment directory
+Writes the same synthetic atoms both ways, then times a fresh load into the
+in-memory indexes (segments with 1..N reader threads) and compares the
+memory held against the records kept as a list of dicts.
+
+    python scripts/bench_store_load.py [--atoms 1000000] [--workers 8]
+"""
+
+import argparse
+import gc
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.atom_store import AtomStore
+from src.core.content_hash import atom_content_ids, local_ka_id
+from src.core.trust_atom import TrustAtomV7, TrustVector
+
+
+def make_records(count: int, seed: int):
+    rng = random.Random(seed)
+    records = []
+    for _ in range(count):
+        atom = TrustAtomV7(
+            issuer=f"did:key:{rng.randrange(count // 10 + 1)}",
+            target=f"did:web:{rng.randrange(count // 20 + 1)}",
+            trust_vector=TrustVector(honesty=rng.random(), expertise=rng.random(), stake_weight=rng.uniform(0.5, 2.0)),
+            content="Endorsed for quality content",
+            required_stake="100"
+        )
+        records.append({"trustAtom": atom.to_jsonld(), "timestamp": atom.issued, "mode": "LOCAL"})
+    for record, cid in zip(records, atom_content_ids([r["trustAtom"] for r in records])):
+        record["kaId"] = local_ka_id(cid)
+        record["contentId"] = cid
+    return records
+
+
+def disk_size(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def timed_load(label: str, path: str, workers: int = 0) -> AtomStore:
+    gc.collect()
+    started = time.perf_counter()
+    store = AtomStore(path, load_workers=workers)
+    count = store.load()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:28s} {elapsed:8.2f}s  {count / elapsed:12,.0f} atoms/s")
+    return store
+
+
+def traced_mb(build) -> float:
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--atoms", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=8, help="Most reader threads to try")
+    parser.add_argument("--segment-size", type=int, default=65536)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"⏱️  Atom store load benchmark ({args.atoms:,} atoms)\n")
+    records = make_records(args.atoms, args.seed)
+    workdir = tempfile.mkdtemp()
+    json_file = os.path.join(workdir, "atoms.json")
+    segment_dir = os.path.join(workdir, "atoms")
+    try:
+        for path in (json_file, segment_dir):
+            store = AtomStore(path, segment_size=args.segment_size)
+            store.table.extend_records(records)
+            store.save()
+            del store
+        del records
+        print(f"  JSON file    {disk_size(json_file) / 1e6:10.1f} MB")
+        print(f"  segments     {disk_size(segment_dir) / 1e6:10.1f} MB\n")
+
+        timed_load("JSON store file", json_file)
+        workers = 1
+        while workers <= args.workers:
+            timed_load(f"segments, {workers} thread(s)", segment_dir, workers)
+            workers *= 2
+
+        print()
+        dicts = traced_mb(lambda: list(timed_load("segments as dicts (traced)", segment_dir).atoms))
+        columns = traced_mb(lambda: timed_load("segments (traced)", segment_dir))
+        print(f"\n  list of dicts {dicts:9.1f} MB")
+        print(f"  atom store    {columns:9.1f} MB ({columns / dicts:.0%})")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Trust Atom construction benchmark - per-atom cost of building and scoring atoms
+Builds atoms the way the Guardian processor and store replay do, then runs
+the accessors publishing touches (is_valid, to_jsonld, to_dkg_asset).
+
+    python scripts/bench_trust_atom.py [--atoms 100000]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.trust_atom import TrustAtomV7, TrustVector
+
+DIMENSIONS = ("honesty", "expertise", "bias", "safety", "speed", "alignment", "responsiveness")
+
+
+def timed(label: str, count: int, fn):
+    # The cyclic GC rescans every live atom as the lists grow; keep it out of the numbers
+    gc.collect()
+    gc.disable()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    gc.enable()
+    print(f"  {label:34s} {elapsed:8.2f}s {elapsed / count * 1e6:9.2f} µs/atom")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--atoms", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rows = [
+        (f"did:key:{i % 5000}", f"did:web:{rng.randrange(20000)}",
+         {name: rng.random() for name in DIMENSIONS}, rng.uniform(0.5, 2.0))
+        for i in range(args.atoms)
+    ]
+    n = len(rows)
+    print(f"⏱️  Trust Atom construction benchmark ({n:,} atoms)\n")
+
+    built = timed("construct", n, lambda: [
+        TrustAtomV7(issuer=issuer, target=target, trust_vector=TrustVector(stake_weight=stake, **dims), required_stake="100")
+        for issuer, target, dims, stake in rows
+    ])
+
+    exports = [atom.to_jsonld() for atom in built]
+    replayed = timed("from_jsonld", n, lambda: [TrustAtomV7.from_jsonld(data) for data in exports])
+
+    print()
+    timed("overall, first access", n, lambda: [atom.overall for atom in replayed])
+    timed("overall, cached", n, lambda: [atom.overall for atom in replayed])
+    timed("is_valid + to_jsonld + to_dkg_asset", n, lambda: [
+        (atom.is_valid(), atom.to_jsonld(), atom.to_dkg_asset()) for atom in replayed
+    ])
+
+
+if __name__ == "__main__":
+    main()
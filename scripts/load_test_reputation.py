@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Reputation load test - CPU per request with and without request coalescing
+Concurrent clients query targets drawn from a Zipf distribution, so a few
+popular targets receive most of the traffic (a trending target).
+
+    python scripts/load_test_reputation.py [--targets 200] [--atoms 20000] [--clients 64]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.dkg_publisher import DKGPublisher
+from src.core.trust_atom import TrustAtomV7, TrustVector
+
+
+def zipf_weights(n: int, s: float) -> list:
+    return [1.0 / (rank ** s) for rank in range(1, n + 1)]
+
+
+def seed_store(storage_file: str, targets: list, weights: list, atom_count: int, rng: random.Random):
+    """Write atom_count local atoms, spread over targets with the same skew as the traffic"""
+    publisher = _publisher(storage_file, coalesce=False)
+    atoms = []
+    for i, target in enumerate(rng.choices(targets, weights=weights, k=atom_count)):
+        atoms.append(TrustAtomV7(
+            issuer=f"did:key:issuer{i}",
+            target=target,
+            trust_vector=TrustVector(honesty=rng.random(), expertise=rng.random())
+        ))
+    with contextlib.redirect_stdout(io.StringIO()):
+        publisher.publish_batch(atoms)
+
+
+def _publisher(storage_file: str, coalesce: bool) -> DKGPublisher:
+    with contextlib.redirect_stdout(io.StringIO()):
+        publisher = DKGPublisher(storage_file=storage_file, coalesce_reputation=coalesce)
+        publisher.store
+    # Measure the aggregation itself, not DKG node round trips
+    publisher.dkg_configured = False
+    return publisher
+
+
+def run(publisher: DKGPublisher, targets: list, weights: list, clients: int, requests: int, seed: int) -> dict:
+    """Fire requests lookups from clients threads, returns CPU and wall time per request"""
+    per_client = requests // clients
+    plans = []
+    for c in range(clients):
+        rng = random.Random(seed + c)
+        plans.append(rng.choices(targets, weights=weights, k=per_client))
+
+    start = threading.Barrier(clients + 1)
+
+    def client(plan):
+        start.wait()
+        for target in plan:
+            publisher.get_aggregate_reputation(target)
+
+    threads = [threading.Thread(target=client, args=(plan,)) for plan in plans]
+    for t in threads:
+        t.start()
+    start.wait()
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    for t in threads:
+        t.join()
+    cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+
+    total = per_client * clients
+    return {"requests": total, "cpuPerRequest": cpu / total, "wallPerRequest": wall / total}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--targets", type=int, default=200)
+    parser.add_argument("--atoms", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=6400)
+    parser.add_argument("--skew", type=float, default=1.2, help="Zipf exponent")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    targets = [f"did:web:target{i}" for i in range(args.targets)]
+    weights = zipf_weights(args.targets, args.skew)
+    storage_file = os.path.join(tempfile.mkdtemp(), "atoms.json")
+
+    print(f"🌱 Seeding {args.atoms} atoms over {args.targets} targets (zipf s={args.skew})")
+    seed_store(storage_file, targets, weights, args.atoms, rng)
+
+    print(f"🔥 {args.requests} lookups from {args.clients} concurrent clients\n")
+    print(f"  {'mode':12s} {'cpu ms/req':>11s} {'wall ms/req':>12s}  executed / coalesced")
+    for label, coalesce in (("independent", False), ("coalesced", True)):
+        publisher = _publisher(storage_file, coalesce)
+        result = run(publisher, targets, weights, args.clients, args.requests, args.seed)
+        if publisher.reputation_flight is not None:
+            flight = publisher.reputation_flight.get_stats()
+            calls = f"{flight['executed']} / {flight['coalesced']} ({flight['coalescedRatio']:.0%})"
+        else:
+            calls = f"{result['requests']} / 0"
+        print(
+            f"  {label:12s} {result['cpuPerRequest'] * 1000:11.3f} "
+            f"{result['wallPerRequest'] * 1000:12.3f}  {calls}"
+        )
+
+
+if __name__ == "__main__":
+    main()
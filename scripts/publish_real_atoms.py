@@ -9,6 +9,7 @@ import json
 from datetime import datetime
 from src.core.dkg_publisher import DKGPublisher
 from src.core.trust_atom import TrustAtomV7, TrustVector
+from src.core.stake_ledger import StakeLedger
 from src.core.stake_validator import StakeValidator
 from src.data.guardian_processor import GuardianProcessor
 
@@ -27,7 +28,7 @@ def load_guardian_dataset(file_path="data/guardian_full.json"):
 
 
 def publish_batch_to_mainnet(atoms, publisher, batch_size=100):
-    """Publish atoms in batches to avoid rate limits"""
+    """Publish atoms in batches, each batch as one Knowledge Asset collection"""
     total = len(atoms)
     published_uals = []
     
@@ -35,7 +36,7 @@ def publish_batch_to_mainnet(atoms, publisher, batch_size=100):
         batch = atoms[i:i+batch_size]
         print(f"\n📤 Publishing batch {i//batch_size + 1}/{(total + batch_size - 1)//batch_size}")
         
-        results = publisher.publish_batch(batch)
+        results = publisher.publish_batch(batch, collection_size=batch_size)
         
         for result in results:
             if result["success"]:
@@ -66,7 +67,8 @@ def main():
     
     # Initialize components
     publisher = DKGPublisher()
-    stake_validator = StakeValidator()
+    # Stake events go to STAKE_LEDGER_FILE when set, which the MCP server follows for ranking
+    stake_validator = StakeValidator(StakeLedger(os.getenv("STAKE_LEDGER_FILE")))
     processor = GuardianProcessor(stake_validator)
     
     # Load Guardian dataset
@@ -98,7 +100,7 @@ def main():
     
     # Publish to DKG
     print("\n📤 Publishing to DKG Mainnet...")
-    print("   This may take 30-60 minutes for 2000+ atoms")
+    print("   One Knowledge Asset collection per 50 atoms")
     
     published_uals = publish_batch_to_mainnet(atoms, publisher, batch_size=50)
     
@@ -2,16 +2,30 @@
 
 __version__ = "7.0.0"
 
-from .core.trust_atom import TrustAtomV7
-from .core.dkg_publisher import DKGPublisher
-from .core.stake_validator import StakeValidator
-from .algorithms.pagerank import TrustPageRank
-from .data.guardian_processor import GuardianProcessor
-
-__all__ = [
-    "TrustAtomV7",
-    "DKGPublisher",
-    "StakeValidator",
-    "TrustPageRank",
-    "GuardianProcessor",
-]
+import importlib
+
+# Public name -> defining module; imported on first attribute access (PEP 562)
+# so `import src` doesn't pay for networkx, numpy or the DKG SDK up front.
+_LAZY_ATTRS = {
+    "TrustAtomV7": ".core.trust_atom",
+    "DKGPublisher": ".core.dkg_publisher",
+    "StakeValidator": ".core.stake_validator",
+    "TrustPageRank": ".algorithms.pagerank",
+    "TrustGraphBuilder": ".algorithms.graph_builder",
+    "GuardianProcessor": ".data.guardian_processor",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,213 @@
+"""Graph Centralities - HITS, weighted degree distributions and sampled betweenness on the CSR graph"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .graph_builder import TrustGraph
+from .reputation_queries import score_percentiles
+
+
+def hits_scores(
+    graph: TrustGraph,
+    iterations: int = 100,
+    tol: float = 1e-8
+) -> Tuple[np.ndarray, np.ndarray]:
+    """(hub, authority) score per node, each normalized to max 1
+
+    Hubs are good endorsers (they trust good authorities), authorities are
+    trusted targets (endorsed by good hubs). Edge weights are the endorsement
+    strength; edges with weight <= 0 are left out. Each iteration is two
+    sparse products done with bincount over the edge arrays.
+    """
+    n = graph.node_count
+    if n == 0:
+        return np.zeros(0), np.zeros(0)
+
+    sources = graph.sources()
+    targets = graph.indices
+    weights = np.clip(graph.weights, 0.0, None)
+
+    hubs = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        authorities = np.bincount(targets, weights=weights * hubs[sources], minlength=n)
+        authorities /= max(authorities.sum(), 1e-300)
+        updated = np.bincount(sources, weights=weights * authorities[targets], minlength=n)
+        updated /= max(updated.sum(), 1e-300)
+        change = np.abs(updated - hubs).sum()
+        hubs = updated
+        if change < n * tol:
+            break
+
+    return _max_normalized(hubs), _max_normalized(authorities)
+
+
+def weighted_degrees(graph: TrustGraph) -> Tuple[np.ndarray, np.ndarray]:
+    """(out, in) total edge weight per node"""
+    n = graph.node_count
+    out_weight = np.bincount(graph.sources(), weights=graph.weights, minlength=n)
+    in_weight = np.bincount(graph.indices, weights=graph.weights, minlength=n)
+    return out_weight, in_weight
+
+
+def degree_distribution(graph: TrustGraph, bins: int = 10) -> Dict[str, Dict]:
+    """Summary of the weighted out- and in-degree distributions
+
+    Per direction: mean, max, nodes without edges that way, percentiles
+    (KLL sketch) and a histogram of the nonzero degrees on log-spaced bins.
+    """
+    n = graph.node_count
+    out_edges = np.diff(graph.indptr)
+    in_edges = np.bincount(graph.indices, minlength=n)
+    distribution = {}
+    for direction, weights, edges in zip(("out", "in"), weighted_degrees(graph), (out_edges, in_edges)):
+        nonzero = weights[weights > 0]
+        summary = {
+            "mean": float(weights.mean()) if n else 0.0,
+            "max": float(weights.max()) if n else 0.0,
+            "maxEdges": int(edges.max()) if n else 0,
+            "isolated": int((edges == 0).sum()),
+            "percentiles": score_percentiles(weights) if n else {},
+            "histogram": []
+        }
+        if len(nonzero):
+            low, high = nonzero.min(), nonzero.max()
+            edges_of_bins = np.geomspace(low, high, bins + 1) if high > low else np.array([low, high])
+            counts, edges_of_bins = np.histogram(nonzero, bins=edges_of_bins)
+            summary["histogram"] = [
+                {"from": float(lo), "to": float(hi), "nodes": int(count)}
+                for lo, hi, count in zip(edges_of_bins[:-1], edges_of_bins[1:], counts)
+            ]
+        distribution[direction] = summary
+    return distribution
+
+
+def approximate_betweenness(
+    graph: TrustGraph,
+    samples: Optional[int] = 256,
+    seed: int = 0,
+    workers: int = 1,
+    normalized: bool = True
+) -> np.ndarray:
+    """Betweenness centrality per node estimated from shortest paths out of sampled sources
+
+    Brandes' dependency accumulation from `samples` source nodes drawn
+    uniformly without replacement, scaled by node_count / samples (exact
+    when samples is None or at least node_count). Paths follow endorsements
+    (issuer -> target) over edges with positive weight and are counted in
+    hops. Each BFS level is expanded for the whole frontier at once.
+
+    workers > 1 splits the sources over a process pool (0: one per CPU, at
+    most 8). normalized divides by (n - 1)(n - 2) like networkx does for
+    directed graphs.
+    """
+    n = graph.node_count
+    if n == 0:
+        return np.zeros(0)
+
+    positive = graph.weights > 0
+    indices = graph.indices[positive].astype(np.int64)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(graph.sources()[positive], minlength=n), out=indptr[1:])
+
+    if samples is None or samples >= n:
+        sources = np.arange(n)
+    else:
+        sources = np.sort(np.random.default_rng(seed).choice(n, samples, replace=False))
+
+    workers = workers or min(8, os.cpu_count() or 1)
+    if workers > 1 and len(sources) > 1:
+        chunks = np.array_split(sources, min(len(sources), workers * 4))
+        with ProcessPoolExecutor(workers, initializer=_set_worker_graph, initargs=(indptr, indices)) as pool:
+            betweenness = sum(pool.map(_worker_dependencies, chunks))
+    else:
+        betweenness = _dependencies(indptr, indices, sources)
+
+    betweenness = betweenness * (n / len(sources))
+    if normalized and n > 2:
+        betweenness /= (n - 1) * (n - 2)
+    return betweenness
+
+
+def _dependencies(indptr: np.ndarray, indices: np.ndarray, sources: np.ndarray) -> np.ndarray:
+    """Sum of Brandes dependencies from each source, per node"""
+    n = len(indptr) - 1
+    total = np.zeros(n)
+    distance = np.full(n, -1, dtype=np.int64)
+    sigma = np.zeros(n)
+    delta = np.zeros(n)
+
+    for source in sources.tolist():
+        distance[source], sigma[source] = 0, 1.0
+        frontier = np.array([source], dtype=np.int64)
+        levels: List[Tuple[np.ndarray, np.ndarray]] = []
+        visited = [frontier]
+        depth = 0
+
+        # Forward: expand a whole BFS level, keep the edges that lie on shortest paths
+        while len(frontier):
+            owners, reached = _expand(indptr, indices, frontier)
+            fresh = reached[distance[reached] < 0]
+            distance[fresh] = depth + 1
+            on_path = distance[reached] == depth + 1
+            owners, reached = owners[on_path], reached[on_path]
+            frontier = _scatter_add(sigma, reached, sigma[owners])
+            levels.append((owners, reached))
+            visited.append(frontier)
+            depth += 1
+
+        # Backward: pull dependencies from the deepest level up
+        for owners, reached in reversed(levels):
+            share = sigma[owners] / sigma[reached] * (1.0 + delta[reached])
+            _scatter_add(delta, owners, share)
+
+        seen = np.concatenate(visited)
+        delta[source] = 0.0
+        total[seen] += delta[seen]
+        distance[seen], sigma[seen], delta[seen] = -1, 0.0, 0.0
+
+    return total
+
+
+def _expand(indptr: np.ndarray, indices: np.ndarray, frontier: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(owner, target) for every out-edge of the frontier nodes"""
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    offsets = np.cumsum(counts) - counts
+    edges = np.repeat(starts - offsets, counts) + np.arange(counts.sum())
+    return np.repeat(frontier, counts), indices[edges]
+
+
+def _scatter_add(totals: np.ndarray, nodes: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """totals[nodes] += values with repeated nodes summed, returns the distinct nodes
+
+    Large batches use one bincount over all nodes, small ones sort the batch.
+    """
+    if len(nodes) * 8 > len(totals):
+        sums = np.bincount(nodes, weights=values, minlength=len(totals))
+        touched = np.flatnonzero(np.bincount(nodes, minlength=len(totals)))
+        totals[touched] += sums[touched]
+        return touched
+    touched, inverse = np.unique(nodes, return_inverse=True)
+    totals[touched] += np.bincount(inverse, weights=values, minlength=len(touched))
+    return touched
+
+
+def _max_normalized(scores: np.ndarray) -> np.ndarray:
+    top = scores.max() if len(scores) else 0.0
+    return scores / top if top > 0 else scores
+
+
+# Process pool workers get the graph once, then only source chunks
+_worker_graph: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+
+def _set_worker_graph(indptr: np.ndarray, indices: np.ndarray):
+    global _worker_graph
+    _worker_graph = (indptr, indices)
+
+
+def _worker_dependencies(sources: np.ndarray) -> np.ndarray:
+    return _dependencies(*_worker_graph, sources)
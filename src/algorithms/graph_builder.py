@@ -0,0 +1,227 @@
+"""Trust Graph Builder - Vectorized edge deduplication with merge policies"""
+
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.trust_atom import TrustAtomV7
+
+
+# How repeated atoms for the same (issuer, target) pair collapse into one edge
+MERGE_POLICIES = ("latest", "max", "mean", "stake_mean")
+
+
+class TrustGraph:
+    """Merged trust graph in CSR form (rows are issuers, columns are targets)"""
+
+    def __init__(
+        self,
+        nodes: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        weights: np.ndarray,
+        counts: np.ndarray
+    ):
+        self.nodes = nodes        # node id for each index
+        self.indptr = indptr      # row offsets, length node_count + 1
+        self.indices = indices    # target index for each edge
+        self.weights = weights    # merged weight for each edge
+        self.counts = counts      # number of atoms merged into each edge
+        self._node_index: Optional[Dict[str, int]] = None
+
+    @property
+    def node_count(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices)
+
+    @property
+    def node_index(self) -> Dict[str, int]:
+        """Node id -> row index (built on first use)"""
+        if self._node_index is None:
+            self._node_index = {str(node): i for i, node in enumerate(self.nodes)}
+        return self._node_index
+
+    def sources(self) -> np.ndarray:
+        """Source index for each edge (COO row array)"""
+        return np.repeat(
+            np.arange(self.node_count, dtype=self.indices.dtype),
+            np.diff(self.indptr)
+        )
+
+    def out_edges(self, node: str) -> List[Tuple[str, float]]:
+        """Merged outgoing edges of a node"""
+        i = self.node_index.get(node)
+        if i is None:
+            return []
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        return [
+            (str(self.nodes[j]), float(w))
+            for j, w in zip(self.indices[lo:hi], self.weights[lo:hi])
+        ]
+
+    def iter_edges(self) -> Iterator[Tuple[str, str, float]]:
+        """Iterate (issuer, target, weight) triples"""
+        for src, dst, w in zip(self.sources(), self.indices, self.weights):
+            yield str(self.nodes[src]), str(self.nodes[dst]), float(w)
+
+
+class TrustGraphBuilder:
+    """Collect raw trust edges and merge duplicates in one vectorized pass"""
+
+    def __init__(self, merge: str = "latest"):
+        if merge not in MERGE_POLICIES:
+            raise ValueError(f"Unknown merge policy '{merge}' (expected one of {MERGE_POLICIES})")
+        self.merge = merge
+
+        # Single edges are buffered in lists, bulk loads are kept as array chunks
+        self._issuers: List[str] = []
+        self._targets: List[str] = []
+        self._weights: List[float] = []
+        self._stakes: List[float] = []
+        self._times: List[float] = []
+        self._chunks: List[Tuple[np.ndarray, ...]] = []
+
+    def __len__(self) -> int:
+        return len(self._weights) + sum(len(chunk[2]) for chunk in self._chunks)
+
+    def add_edge(
+        self,
+        issuer: str,
+        target: str,
+        weight: float = 1.0,
+        stake: float = 1.0,
+        timestamp: Optional[float] = None
+    ):
+        """Add one raw edge (duplicates are merged at build time)"""
+        self._flush_pending_if_needed()
+        self._issuers.append(issuer)
+        self._targets.append(target)
+        self._weights.append(weight)
+        self._stakes.append(stake)
+        self._times.append(0.0 if timestamp is None else timestamp)
+
+    def add_trust_atom(self, atom: TrustAtomV7, stake_weight: float = 1.0):
+        """Add Trust Atom as a raw weighted edge of overall * stake_weight
+
+        The stake is in the weight only, so stake_mean counts it once: atoms
+        on one edge merge to their stake-weighted mean overall times their
+        mean stake, and a single atom's edge stays overall * stake_weight.
+        """
+        self.add_edge(
+            atom.issuer,
+            atom.target,
+            atom.overall * stake_weight,
+            timestamp=_parse_timestamp(atom.issued)
+        )
+
+    def add_arrays(
+        self,
+        issuers: Sequence[str],
+        targets: Sequence[str],
+        weights: Sequence[float],
+        stakes: Optional[Sequence[float]] = None,
+        timestamps: Optional[Sequence[float]] = None
+    ):
+        """Add many raw edges at once from parallel arrays"""
+        weights = np.asarray(weights, dtype=np.float64)
+        n = len(weights)
+        if len(issuers) != n or len(targets) != n:
+            raise ValueError("issuers, targets and weights must have the same length")
+
+        stakes = np.ones(n) if stakes is None else np.asarray(stakes, dtype=np.float64)
+        times = np.zeros(n) if timestamps is None else np.asarray(timestamps, dtype=np.float64)
+        if len(stakes) != n or len(times) != n:
+            raise ValueError("stakes and timestamps must match the number of edges")
+
+        # Keep pending single edges ahead of this chunk so insertion order is preserved
+        self._flush_pending()
+        self._chunks.append((np.asarray(issuers), np.asarray(targets), weights, stakes, times))
+
+    def build(self) -> TrustGraph:
+        """Sort raw edges by (issuer, target) and reduce each run with the merge policy"""
+        self._flush_pending()
+
+        if not self._chunks:
+            return TrustGraph(
+                np.array([], dtype=str),
+                np.zeros(1, dtype=np.int64),
+                np.array([], dtype=np.int64),
+                np.array([], dtype=np.float64),
+                np.array([], dtype=np.int64)
+            )
+
+        issuers = np.concatenate([c[0] for c in self._chunks])
+        targets = np.concatenate([c[1] for c in self._chunks])
+        weights = np.concatenate([c[2] for c in self._chunks])
+        stakes = np.concatenate([c[3] for c in self._chunks])
+        times = np.concatenate([c[4] for c in self._chunks])
+        n_raw = len(weights)
+
+        # Factorize node ids: one sorted vocabulary shared by issuers and targets
+        nodes, inverse = np.unique(np.concatenate([issuers, targets]), return_inverse=True)
+        inverse = inverse.astype(np.int64)
+        src, dst = inverse[:n_raw], inverse[n_raw:]
+        n_nodes = len(nodes)
+
+        # Group key sorts by issuer then target; ties ordered by time then insertion
+        key = src * n_nodes + dst
+        order = np.lexsort((np.arange(n_raw), times, key))
+        key = key[order]
+        weights = weights[order]
+
+        starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+        counts = np.diff(np.r_[starts, n_raw])
+
+        if self.merge == "latest":
+            merged = weights[starts + counts - 1]
+        elif self.merge == "max":
+            merged = np.maximum.reduceat(weights, starts)
+        elif self.merge == "mean":
+            merged = np.add.reduceat(weights, starts) / counts
+        else:
+            stakes = stakes[order]
+            numerator = np.add.reduceat(weights * stakes, starts)
+            denominator = np.add.reduceat(stakes, starts)
+            plain_mean = np.add.reduceat(weights, starts) / counts
+            with np.errstate(divide="ignore", invalid="ignore"):
+                merged = np.where(denominator > 0, numerator / denominator, plain_mean)
+
+        edge_keys = key[starts]
+        edge_src = edge_keys // n_nodes
+        indices = edge_keys % n_nodes
+
+        indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edge_src, minlength=n_nodes), out=indptr[1:])
+
+        return TrustGraph(nodes, indptr, indices, merged, counts)
+
+    def _flush_pending_if_needed(self, limit: int = 65536):
+        """Move buffered single edges into an array chunk once the buffer is large"""
+        if len(self._weights) >= limit:
+            self._flush_pending()
+
+    def _flush_pending(self):
+        """Move buffered single edges into an array chunk"""
+        if not self._weights:
+            return
+        self._chunks.append((
+            np.asarray(self._issuers),
+            np.asarray(self._targets),
+            np.asarray(self._weights, dtype=np.float64),
+            np.asarray(self._stakes, dtype=np.float64),
+            np.asarray(self._times, dtype=np.float64)
+        ))
+        self._issuers, self._targets = [], []
+        self._weights, self._stakes, self._times = [], [], []
+
+
+def _parse_timestamp(issued: str) -> float:
+    """ISO-8601 issue time -> POSIX seconds (0.0 if unparseable)"""
+    try:
+        return datetime.fromisoformat(issued.replace("Z", "+00:00")).timestamp()
+    except (AttributeError, ValueError):
+        return 0.0
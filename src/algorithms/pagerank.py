@@ -1,9 +1,14 @@
 """Weighted PageRank for Trust Networks"""
 
-import networkx as nx
-from typing import List, Dict, Tuple
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple, Mapping
 from ..core.trust_atom import TrustAtomV7
 
+if TYPE_CHECKING:
+    import numpy as np
+    from .graph_builder import TrustGraph
+
+# networkx and numpy are imported on first use to keep module import cheap
+
 
 class TrustPageRank:
     """Compute reputation scores using weighted PageRank"""
@@ -11,6 +16,8 @@ class TrustPageRank:
     def __init__(self, damping_factor: float = 0.85, iterations: int = 20):
         self.damping_factor = damping_factor
         self.iterations = iterations
+        
+        import networkx as nx
         self.graph = nx.DiGraph()
     
     def add_edge(self, from_node: str, to_node: str, weight: float = 1.0):
@@ -22,11 +29,17 @@ class TrustPageRank:
         edge_weight = atom.overall * stake_weight
         self.add_edge(atom.issuer, atom.target, edge_weight)
     
+    def add_graph(self, trust_graph: "TrustGraph"):
+        """Add all merged edges from a TrustGraphBuilder result"""
+        self.graph.add_weighted_edges_from(trust_graph.iter_edges(), weight='weight')
+    
     def compute(self) -> Dict[str, float]:
         """Compute PageRank scores"""
         if len(self.graph.nodes()) == 0:
             return {}
         
+        import networkx as nx
+        
         # Use NetworkX's pagerank with edge weights
         scores = nx.pagerank(
             self.graph,
@@ -49,18 +62,109 @@ class TrustPageRank:
     
     def get_top_n(self, n: int = 10) -> List[Dict]:
         """Get top N nodes"""
-        ranked = self.get_ranked_nodes()
-        return [{"node": node, "score": score} for node, score in ranked[:n]]
+        from .reputation_queries import top_k
+        
+        nodes, values = self._score_arrays()
+        return [{"node": nodes[i], "score": float(values[i])} for i in top_k(values, n)]
+    
+    def get_top_n_by_group(self, groups: Mapping[str, str], n: int = 10) -> Dict[str, List[Dict]]:
+        """Get top N nodes per group (e.g. platform), nodes without a group go to 'unknown'"""
+        from .reputation_queries import top_k_by_group
+        
+        nodes, values = self._score_arrays()
+        labels = [groups.get(node, "unknown") for node in nodes]
+        return {
+            label: [{"node": nodes[i], "score": float(values[i])} for i in indices]
+            for label, indices in top_k_by_group(values, labels, n).items()
+        }
     
     def get_stats(self) -> Dict:
         """Get network statistics"""
-        scores = self.compute()
-        values = list(scores.values())
+        from .reputation_queries import score_percentiles
+        
+        _, values = self._score_arrays()
+        has_scores = len(values) > 0
         
         return {
             "nodeCount": len(self.graph.nodes()),
             "edgeCount": len(self.graph.edges()),
-            "avgScore": sum(values) / len(values) if values else 0,
-            "maxScore": max(values) if values else 0,
-            "minScore": min(values) if values else 0
+            "avgScore": float(values.mean()) if has_scores else 0,
+            "maxScore": float(values.max()) if has_scores else 0,
+            "minScore": float(values.min()) if has_scores else 0,
+            "percentiles": score_percentiles(values) if has_scores else {}
         }
+    
+    def _score_arrays(self) -> Tuple[List[str], "np.ndarray"]:
+        """Compute scores as parallel (node list, score array)"""
+        import numpy as np
+        
+        scores = self.compute()
+        return list(scores), np.fromiter(scores.values(), dtype=np.float64, count=len(scores))
+
+
+def pagerank_scores(
+    trust_graph: "TrustGraph",
+    damping_factor: float = 0.85,
+    iterations: int = 50,
+    tol: float = 1e-6,
+    issuer_weights: Optional["np.ndarray"] = None,
+    initial: Optional["np.ndarray"] = None
+) -> "np.ndarray":
+    """Weighted PageRank by power iteration on the CSR graph, normalized to max 1
+    
+    Same model as TrustPageRank.compute (dangling mass spread uniformly),
+    without building a networkx graph. Stops early once the L1 change is
+    below node_count * tol.
+    
+    issuer_weights (one multiplier per node, e.g. stake weights) scale how
+    much of a node's rank flows along its edges, relative to the largest
+    multiplier; the rest is spread uniformly like dangling mass. Scaling a
+    node's edge weights instead would cancel out in the per-node
+    normalization. initial warm-starts the iteration from earlier scores.
+    """
+    return pagerank_iterate(trust_graph, damping_factor, iterations, tol, issuer_weights, initial)[0]
+
+
+def pagerank_iterate(
+    trust_graph: "TrustGraph",
+    damping_factor: float = 0.85,
+    iterations: int = 50,
+    tol: float = 1e-6,
+    issuer_weights: Optional["np.ndarray"] = None,
+    initial: Optional["np.ndarray"] = None
+) -> Tuple["np.ndarray", int]:
+    """pagerank_scores plus the number of iterations it took"""
+    import numpy as np
+    
+    n = trust_graph.node_count
+    if n == 0:
+        return np.zeros(0, dtype=np.float64), 0
+    
+    sources = trust_graph.sources()
+    weights = np.clip(trust_graph.weights, 0.0, None)
+    out_weight = np.bincount(sources, weights=weights, minlength=n)
+    dangling = out_weight == 0
+    share = np.divide(weights, out_weight[sources], out=np.zeros_like(weights), where=weights > 0)
+    
+    flow = np.where(dangling, 0.0, 1.0)
+    if issuer_weights is not None:
+        multipliers = np.clip(np.asarray(issuer_weights, dtype=np.float64), 0.0, None)
+        if multipliers.max() > 0:
+            flow *= multipliers / multipliers.max()
+    
+    if initial is not None and len(initial) == n and initial.sum() > 0:
+        scores = initial / initial.sum()
+    else:
+        scores = np.full(n, 1.0 / n)
+    
+    for iteration in range(1, iterations + 1):
+        passed = scores * flow
+        spread = np.bincount(trust_graph.indices, weights=passed[sources] * share, minlength=n)
+        teleport = (damping_factor * (scores.sum() - passed.sum()) + 1.0 - damping_factor) / n
+        updated = damping_factor * spread + teleport
+        change = np.abs(updated - scores).sum()
+        scores = updated
+        if change < n * tol:
+            break
+    
+    return scores / scores.max(), iteration
@@ -0,0 +1,284 @@
+"""Rank Refresher - Background PageRank recomputation with atomically swapped snapshots"""
+
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Sequence
+
+import numpy as np
+
+from ..core.stake_ledger import stake_weight
+from ..core.trust_atom import vector_score
+from .graph_builder import TrustGraph, TrustGraphBuilder, _parse_timestamp
+from .pagerank import pagerank_iterate
+from .sybil import detect_sybils
+
+
+class ScoreSnapshot:
+    """Immutable PageRank result: O(1) score lookup by node id"""
+
+    def __init__(
+        self,
+        nodes: Sequence[str],
+        scores: np.ndarray,
+        atom_count: int,
+        version: int,
+        elapsed: float,
+        iterations: int = 0,
+        incremental: bool = False
+    ):
+        self.nodes = list(nodes)
+        self.scores = scores
+        self.atom_count = atom_count          # store size the scores were computed from
+        self.version = version
+        self.elapsed = elapsed                # seconds spent computing
+        self.iterations = iterations          # power iterations until convergence
+        self.incremental = incremental        # re-ranked on the previous graph (stake change only)
+        self.computed_at = time.time()
+        self._index: Dict[str, int] = {node: i for i, node in enumerate(self.nodes)}
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def score(self, node: str) -> Optional[float]:
+        """Normalized PageRank of node (None if it isn't in the graph)"""
+        i = self._index.get(node)
+        return None if i is None else float(self.scores[i])
+
+    def get_stats(self) -> Dict:
+        return {
+            "version": self.version,
+            "nodeCount": len(self.nodes),
+            "atomCount": self.atom_count,
+            "computedAt": self.computed_at,
+            "computeSeconds": self.elapsed,
+            "iterations": self.iterations,
+            "incremental": self.incremental
+        }
+
+
+class PageRankRefresher:
+    """Recomputes PageRank off the request path and swaps in the new snapshot
+
+    A refresh runs every interval seconds, or sooner once refresh_after new
+    atoms have been reported through notify(). The next snapshot is built
+    on the side while readers keep using the current one; publishing it is
+    a single reference assignment, so a reader always sees a complete
+    snapshot, never a half-written one.
+    
+    With a stake_ledger, edges carry the stake-free atom score and each
+    issuer's stake weight lives in a separate per-node array. A slash (or
+    any stake event) updates one entry of that array and re-ranks the
+    existing graph warm-started from the previous scores, instead of
+    rebuilding the graph from every record.
+    
+    sybil_strength > 0 runs detect_sybils on every full rebuild and feeds
+    the result back: endorsements inside suspicious groups are down-weighted
+    and suspicious nodes pass on less rank (scaled by the strength).
+    """
+
+    def __init__(
+        self,
+        load_records: Callable[[], Iterable[Dict]],
+        interval: float = 300.0,
+        refresh_after: int = 100,
+        damping_factor: float = 0.85,
+        iterations: int = 50,
+        merge: str = "mean",
+        stake_ledger=None,
+        sybil_strength: float = 0.0
+    ):
+        self.load_records = load_records
+        self.interval = interval
+        self.refresh_after = refresh_after
+        self.damping_factor = damping_factor
+        self.iterations = iterations
+        self.merge = merge
+        self.stake_ledger = stake_ledger
+        self.sybil_strength = sybil_strength
+
+        self._snapshot: Optional[ScoreSnapshot] = None
+        # Graph of the last full refresh and its per-node stake weights
+        self._graph: Optional[TrustGraph] = None
+        self._issuer_weights: Optional[np.ndarray] = None
+        self._sybil_flow: Optional[np.ndarray] = None
+        self.sybil_report = None
+        self._stake_changes = 0
+        self._refresh_lock = threading.RLock()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.refreshes = 0
+        self.incremental_refreshes = 0
+
+        if stake_ledger is not None:
+            stake_ledger.subscribe(self.on_stake_event)
+
+    @property
+    def snapshot(self) -> Optional[ScoreSnapshot]:
+        """Current snapshot (None until the first refresh finishes)"""
+        return self._snapshot
+
+    def score(self, node: str) -> Optional[float]:
+        snapshot = self._snapshot
+        return None if snapshot is None else snapshot.score(node)
+
+    def notify(self, count: int = 1):
+        """Report new atoms; wakes the refresher once refresh_after have accumulated"""
+        with self._lock:
+            self._pending += count
+            due = self._pending >= self.refresh_after
+        if due:
+            self._wake.set()
+
+    def on_stake_event(self, event: Dict):
+        """Ledger listener: update the issuer's stake weight and wake for a re-rank"""
+        with self._lock:
+            if self._graph is None:
+                return
+            i = self._graph.node_index.get(event["issuer"])
+            if i is None:
+                return
+            weights = self._issuer_weights.copy()
+            weights[i] = stake_weight(event["balance"])
+            self._issuer_weights = weights
+            self._stake_changes += 1
+        self._wake.set()
+
+    def refresh(self) -> ScoreSnapshot:
+        """Rebuild the graph from the current records and swap in fresh scores"""
+        with self._refresh_lock:
+            with self._lock:
+                self._pending = 0
+                self._stake_changes = 0
+            started = time.perf_counter()
+            # Streamed: a tiered store pages bodies in a batch at a time instead of all at once
+            atom_count = 0
+            builder = TrustGraphBuilder(merge=self.merge)
+            for record in self.load_records():
+                atom_count += 1
+                atom = record.get("trustAtom", {})
+                if atom.get("issuer") and atom.get("target"):
+                    if self.stake_ledger is not None:
+                        weight = min(max(vector_score(atom.get("trustVector", {})), 0.0), 1.0)
+                    else:
+                        weight = float(atom.get("overall", 0.0))
+                    builder.add_edge(
+                        atom["issuer"],
+                        atom["target"],
+                        weight,
+                        timestamp=_parse_timestamp(atom.get("issued"))
+                    )
+            graph = builder.build()
+
+            issuer_weights = None
+            with self._lock:
+                # Under the lock so a stake event can't land between reading and installing the weights
+                if self.stake_ledger is not None:
+                    issuer_weights = self.stake_ledger.weights_at(None, [str(node) for node in graph.nodes])
+                self._graph, self._issuer_weights = graph, issuer_weights
+
+            self._sybil_flow = None
+            if self.sybil_strength > 0:
+                self.sybil_report = detect_sybils(graph, issuer_weights)
+                graph = self._graph = self.sybil_report.apply(self.sybil_strength)
+                self._sybil_flow = self.sybil_report.flow_weights(self.sybil_strength)
+
+            scores, iterations = pagerank_iterate(
+                graph,
+                self.damping_factor,
+                self.iterations,
+                issuer_weights=self._rank_weights(issuer_weights)
+            )
+            return self._publish(graph, scores, atom_count, started, iterations, incremental=False)
+
+    def refresh_weights(self) -> ScoreSnapshot:
+        """Re-rank the last graph with the current stake weights (no rebuild)"""
+        with self._refresh_lock:
+            if self._graph is None or self._snapshot is None:
+                # Nothing ranked yet (or the last full refresh failed midway): rebuild
+                return self.refresh()
+            with self._lock:
+                self._stake_changes = 0
+                graph, issuer_weights = self._graph, self._issuer_weights
+            started = time.perf_counter()
+            previous = self._snapshot
+            scores, iterations = pagerank_iterate(
+                graph,
+                self.damping_factor,
+                self.iterations,
+                issuer_weights=self._rank_weights(issuer_weights),
+                initial=previous.scores
+            )
+            self.incremental_refreshes += 1
+            return self._publish(graph, scores, previous.atom_count, started, iterations, incremental=True)
+
+    def _rank_weights(self, issuer_weights: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        """Stake weights combined with the sybil flow multipliers"""
+        if self._sybil_flow is None:
+            return issuer_weights
+        if issuer_weights is None:
+            return self._sybil_flow
+        return issuer_weights * self._sybil_flow
+
+    def _publish(
+        self,
+        graph: TrustGraph,
+        scores: np.ndarray,
+        atom_count: int,
+        started: float,
+        iterations: int,
+        incremental: bool
+    ) -> ScoreSnapshot:
+        previous = self._snapshot
+        self._snapshot = ScoreSnapshot(
+            [str(node) for node in graph.nodes],
+            scores,
+            atom_count=atom_count,
+            version=(previous.version + 1) if previous else 1,
+            elapsed=time.perf_counter() - started,
+            iterations=iterations,
+            incremental=incremental
+        )
+        self.refreshes += 1
+        return self._snapshot
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="rank-refresher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def get_stats(self) -> Dict:
+        snapshot = self._snapshot
+        with self._lock:
+            pending, stake_changes = self._pending, self._stake_changes
+        return {
+            "refreshes": self.refreshes,
+            "incrementalRefreshes": self.incremental_refreshes,
+            "pendingAtoms": pending,
+            "pendingStakeChanges": stake_changes,
+            "sybil": self.sybil_report.get_stats() if self.sybil_report is not None else None,
+            "snapshot": snapshot.get_stats() if snapshot else None
+        }
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                with self._lock:
+                    weights_only = self._pending == 0 and self._stake_changes > 0
+                if weights_only:
+                    self.refresh_weights()
+                else:
+                    self.refresh()
+            except Exception as error:
+                print(f"⚠️  PageRank refresh error: {error}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
@@ -0,0 +1,182 @@
+"""Reputation Queries - Bounded-memory top-K and quantile sketches over score vectors"""
+
+import math
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first (argpartition + sort of k)"""
+    scores = np.asarray(scores)
+    n = len(scores)
+    if k <= 0 or n == 0:
+        return np.array([], dtype=np.int64)
+    if k >= n:
+        return np.argsort(-scores, kind="stable")
+
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def top_k_by_group(scores: np.ndarray, groups: Sequence, k: int) -> Dict[str, np.ndarray]:
+    """Indices of the k highest scores within each group (e.g. platform)"""
+    scores = np.asarray(scores)
+    if len(groups) != len(scores):
+        raise ValueError("groups must have one entry per score")
+    if len(scores) == 0:
+        return {}
+
+    labels, codes = np.unique(np.asarray(groups), return_inverse=True)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+
+    result = {}
+    for g, label in enumerate(labels):
+        members = order[bounds[g]:bounds[g + 1]]
+        result[str(label)] = members[top_k(scores[members], k)]
+    return result
+
+
+class StreamingTopK:
+    """Running top-K over score chunks, optionally per group; keeps at most k items per group"""
+
+    def __init__(self, k: int):
+        self.k = k
+        self._best: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def update(self, ids: Sequence, scores: Sequence[float], groups: Optional[Sequence] = None):
+        """Fold one chunk of (id, score[, group]) into the running top-K"""
+        ids = np.asarray(ids)
+        scores = np.asarray(scores, dtype=np.float64)
+        if groups is None:
+            self._merge("*", ids, scores)
+            return
+
+        for label, idx in top_k_by_group(scores, groups, self.k).items():
+            self._merge(label, ids[idx], scores[idx])
+
+    def result(self, group: str = "*") -> List[Dict]:
+        """Best-first [{"node", "score"}] for a group ("*" when ungrouped)"""
+        ids, scores = self._best.get(group, (np.array([]), np.array([])))
+        return [{"node": str(i), "score": float(s)} for i, s in zip(ids, scores)]
+
+    def groups(self) -> List[str]:
+        return sorted(self._best)
+
+    def _merge(self, group: str, ids: np.ndarray, scores: np.ndarray):
+        if group in self._best:
+            old_ids, old_scores = self._best[group]
+            ids = np.concatenate([old_ids, ids])
+            scores = np.concatenate([old_scores, scores])
+        keep = top_k(scores, self.k)
+        self._best[group] = (ids[keep], scores[keep])
+
+
+class KLLSketch:
+    """KLL streaming quantile sketch (Karnin, Lang, Liberty 2016)
+
+    Memory is O(k) items regardless of how many values are added; rank
+    error is roughly 1.7 / k with high probability.
+    """
+
+    def __init__(self, k: int = 200, c: float = 2 / 3, seed: Optional[int] = None):
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.c = c
+        self.n = 0
+        self._levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def update(self, values: Iterable[float]):
+        """Add a chunk of values"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values) == 0:
+            return
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self.n += len(values)
+        self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        """Fold another sketch into this one"""
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for h, items in enumerate(other._levels):
+            self._levels[h] = np.concatenate([self._levels[h], items])
+        self.n += other.n
+        self._compress()
+
+    def quantile(self, q: float) -> float:
+        """Approximate value at quantile q (0..1)"""
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """Approximate values at several quantiles"""
+        if self.n == 0:
+            return [0.0 for _ in qs]
+        items, cumulative = self._sorted_view()
+        total = cumulative[-1]
+        positions = np.searchsorted(cumulative, np.clip(qs, 0.0, 1.0) * total, side="left")
+        positions = np.minimum(positions, len(items) - 1)
+        return [float(v) for v in items[positions]]
+
+    def rank(self, value: float) -> float:
+        """Approximate fraction of values <= value"""
+        if self.n == 0:
+            return 0.0
+        items, cumulative = self._sorted_view()
+        pos = np.searchsorted(items, value, side="right")
+        return float(cumulative[pos - 1] / cumulative[-1]) if pos else 0.0
+
+    def size(self) -> int:
+        """Number of retained items"""
+        return sum(len(level) for level in self._levels)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, int(math.ceil(self.k * self.c ** depth)))
+
+    def _compress(self):
+        """Compact over-full levels, promoting every other sorted item one level up"""
+        while self.size() > sum(self._capacity(h) for h in range(len(self._levels))):
+            for h, items in enumerate(self._levels):
+                if len(items) < self._capacity(h):
+                    continue
+                if h + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+
+                items = np.sort(items)
+                # Odd leftover stays behind so weights are preserved exactly
+                leftover = items[:len(items) % 2]
+                items = items[len(leftover):]
+                promoted = items[self._rng.integers(2)::2]
+
+                self._levels[h] = leftover
+                self._levels[h + 1] = np.concatenate([self._levels[h + 1], promoted])
+                break
+
+    def _sorted_view(self) -> Tuple[np.ndarray, np.ndarray]:
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([
+            np.full(len(level), 2.0 ** h) for h, level in enumerate(self._levels)
+        ])
+        order = np.argsort(items, kind="stable")
+        return items[order], np.cumsum(weights[order])
+
+
+def score_percentiles(
+    scores: np.ndarray,
+    percentiles: Sequence[float] = (50, 90, 99),
+    chunk_size: int = 1 << 20,
+    k: int = 200
+) -> Dict[str, float]:
+    """Approximate score percentiles from a KLL sketch fed in fixed-size chunks"""
+    sketch = KLLSketch(k=k, seed=0)
+    for start in range(0, len(scores), chunk_size):
+        sketch.update(scores[start:start + chunk_size])
+    values = sketch.quantiles([p / 100 for p in percentiles])
+    return {f"p{p:g}": v for p, v in zip(percentiles, values)}
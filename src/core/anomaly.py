@@ -0,0 +1,349 @@
+"""Anomaly Detection - Streaming burst detection on incoming Trust Atoms
+
+Per-issuer and per-target counts over sliding windows live in count-min
+sketches (fixed memory however many DIDs appear), the overall atom rate
+in an exponential histogram. Each atom costs a constant number of
+counter updates and lookups.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Iterator, List, Optional
+
+ANOMALY_ACTIONS = ("flag", "throttle", "quarantine")
+
+_MASK64 = (1 << 64) - 1
+
+
+class AnomalyRejected(Exception):
+    """An atom was throttled or quarantined instead of stored"""
+
+    def __init__(self, verdict: Dict, retry_after: float, content_id: Optional[str] = None):
+        self.verdict = verdict
+        self.retry_after = retry_after
+        self.content_id = content_id
+        super().__init__(f"Atom {verdict['action']}d: {', '.join(verdict['reasons'])}")
+
+
+def sketch_indexes(key: str, width: int, depth: int) -> List[int]:
+    """Counter position per sketch row (double hashing from one 64-bit hash)"""
+    h = hash(key) & _MASK64
+    step = (h >> 32) | 1
+    return [((h + row * step) & _MASK64) % width for row in range(depth)]
+
+
+class CountMinSketch:
+    """Approximate counts per key in depth x width counters (never under-counts)"""
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.rows = [[0] * width for _ in range(depth)]
+
+    def indexes(self, key: str) -> List[int]:
+        return sketch_indexes(key, self.width, self.depth)
+
+    def add(self, indexes: List[int], count: int = 1):
+        for row, i in zip(self.rows, indexes):
+            row[i] += count
+
+    def estimate(self, indexes: List[int]) -> int:
+        return min(row[i] for row, i in zip(self.rows, indexes))
+
+    def clear(self):
+        for row in self.rows:
+            row[:] = [0] * self.width
+
+
+class WindowedCountMin:
+    """Count-min sketch over a sliding time window: a ring of sub-window sketches
+
+    The window is split into buckets; a bucket is cleared when the clock
+    moves past it, so counts older than the window drop out in steps of
+    window / buckets.
+    """
+
+    def __init__(self, window: float, buckets: int = 6, width: int = 2048, depth: int = 4):
+        self.window = window
+        self.span = window / buckets
+        self.sketches = [CountMinSketch(width, depth) for _ in range(buckets)]
+        self._epochs = [-1] * buckets
+
+    def add(self, indexes: List[int], now: float, count: int = 1) -> int:
+        """Count key (by its indexes) at now, returns its estimate over the window"""
+        epoch = int(now // self.span)
+        slot = epoch % len(self.sketches)
+        if self._epochs[slot] != epoch:
+            self.sketches[slot].clear()
+            self._epochs[slot] = epoch
+        self.sketches[slot].add(indexes, count)
+        return self.estimate(indexes, now)
+
+    def estimate(self, indexes: List[int], now: float) -> int:
+        oldest = int(now // self.span) - len(self.sketches) + 1
+        live = [s for s, e in zip(self.sketches, self._epochs) if e >= oldest]
+        return min(sum(s.rows[d][i] for s in live) for d, i in enumerate(indexes))
+
+
+class ExponentialHistogram:
+    """Events in the last window seconds, within a relative error of about 1/k (DGIM)
+
+    Level j holds buckets of 2**j events (newest timestamp each, newest
+    first); once a level has k + 2 buckets its two oldest merge into one
+    bucket of the next level. Memory is O(k log count), add is amortized O(1).
+    """
+
+    def __init__(self, window: float, k: int = 8):
+        self.window = window
+        self.k = k
+        self._levels: List[deque] = []
+        self.total = 0
+
+    def add(self, now: float):
+        self._expire(now)
+        self.total += 1
+        level = 0
+        stamp = now
+        while True:
+            if level == len(self._levels):
+                self._levels.append(deque())
+            buckets = self._levels[level]
+            buckets.appendleft(stamp)
+            if len(buckets) <= self.k + 1:
+                break
+            buckets.pop()
+            stamp = buckets.pop()       # merged bucket keeps the newer timestamp
+            level += 1
+
+    def count(self, now: float) -> int:
+        """Estimated events in (now - window, now]"""
+        self._expire(now)
+        for level in range(len(self._levels) - 1, -1, -1):
+            if self._levels[level]:
+                # Only part of the oldest bucket may still be inside the window
+                return self.total - (1 << level) // 2
+        return 0
+
+    def _expire(self, now: float):
+        for level in range(len(self._levels) - 1, -1, -1):
+            buckets = self._levels[level]
+            while buckets and buckets[-1] <= now - self.window:
+                buckets.pop()
+                self.total -= 1 << level
+            if buckets:
+                return
+
+
+class Quarantine:
+    """Atoms held back for review, oldest first, optionally kept in a JSON-lines log
+
+    Every hold and release is one line; the log is replayed on startup and
+    rewritten with just the held atoms once releases make up most of it.
+    A full quarantine refuses new atoms (hold returns False) instead of
+    dropping held ones nobody has reviewed.
+    """
+
+    def __init__(self, log_file: Optional[str] = None, max_atoms: int = 10000, compact_min_lines: int = 1000):
+        self.log_file = log_file
+        self.max_atoms = max_atoms
+        self.compact_min_lines = compact_min_lines
+        self.entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._log_lines = 0
+        self._lock = threading.Lock()
+        self._recover()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, content_id: str) -> bool:
+        return content_id in self.entries
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self.entries))
+
+    def hold(self, content_id: str, jsonld: Dict, verdict: Dict, held_at: float) -> bool:
+        """Keep an atom for review; False if the quarantine is full"""
+        with self._lock:
+            if content_id in self.entries:
+                return True
+            if len(self.entries) >= self.max_atoms:
+                return False
+            entry = {"contentId": content_id, "atom": jsonld, "verdict": verdict, "heldAt": held_at}
+            self.entries[content_id] = entry
+            self._append({"hold": entry})
+            return True
+
+    def get(self, content_id: str) -> Optional[Dict]:
+        with self._lock:
+            return self.entries.get(content_id)
+
+    def release(self, content_id: str) -> Optional[Dict]:
+        """Remove an atom from quarantine, returns its entry"""
+        with self._lock:
+            entry = self.entries.pop(content_id, None)
+            if entry is not None:
+                self._append({"release": content_id})
+                if self._log_lines > max(self.compact_min_lines, 2 * len(self.entries)):
+                    self._compact()
+            return entry
+
+    def held(self, limit: int = 100, offset: int = 0) -> List[Dict]:
+        """Held atoms, oldest first"""
+        with self._lock:
+            entries = list(self.entries.values())
+        return entries[offset:offset + limit]
+
+    def _recover(self):
+        if not self.log_file or not os.path.exists(self.log_file):
+            return
+        with open(self.log_file) as log:
+            for line in log:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # torn write at the tail of the log
+                if "hold" in record:
+                    self.entries[record["hold"]["contentId"]] = record["hold"]
+                else:
+                    self.entries.pop(record["release"], None)
+        self._compact()
+
+    def _append(self, record: Dict):
+        # Called with the lock held
+        if not self.log_file:
+            return
+        with open(self.log_file, "a") as log:
+            log.write(json.dumps(record) + "\n")
+            log.flush()
+            os.fsync(log.fileno())
+        self._log_lines += 1
+
+    def _compact(self):
+        """Rewrite the log with only held atoms (atomic replace)"""
+        tmp_file = self.log_file + ".tmp"
+        with open(tmp_file, "w") as log:
+            for entry in self.entries.values():
+                log.write(json.dumps({"hold": entry}) + "\n")
+            log.flush()
+            os.fsync(log.fileno())
+        os.replace(tmp_file, self.log_file)
+        self._log_lines = len(self.entries)
+
+
+class AnomalyDetector:
+    """Flags bursts from one issuer and sudden endorsement spikes on one target
+
+    A key is anomalous when its count in the short window reaches its hard
+    limit, or reaches min_count and exceeds burst_factor times what its
+    long-window rate predicts for a short window. action decides what the
+    publisher does with anomalous atoms: "flag" (store and record),
+    "throttle" (reject) or "quarantine" (hold in self.quarantine, kept in
+    quarantine_file if given, instead of storing).
+    """
+
+    def __init__(
+        self,
+        action: str = "flag",
+        short_window: float = 60.0,
+        long_window: float = 3600.0,
+        issuer_limit: int = 60,
+        target_limit: int = 200,
+        min_count: int = 10,
+        burst_factor: float = 5.0,
+        width: int = 2048,
+        depth: int = 4,
+        max_flagged: int = 1000,
+        max_quarantine: int = 10000,
+        quarantine_file: Optional[str] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        if action not in ANOMALY_ACTIONS:
+            raise ValueError(f"Unknown anomaly action: {action} (expected one of {ANOMALY_ACTIONS})")
+        self.action = action
+        self.short_window = short_window
+        self.long_window = long_window
+        self.limits = {"issuer": issuer_limit, "target": target_limit}
+        self.min_count = min_count
+        self.burst_factor = burst_factor
+        self.max_flagged = max_flagged
+        self.clock = clock
+
+        self._short = {kind: WindowedCountMin(short_window, 6, width, depth) for kind in self.limits}
+        self._long = {kind: WindowedCountMin(long_window, 12, width, depth) for kind in self.limits}
+        self._rate = ExponentialHistogram(short_window)
+        self._width, self._depth = width, depth
+
+        # Recently flagged keys (LRU) and atoms held back in quarantine mode
+        self.flagged: "OrderedDict[str, Dict]" = OrderedDict()
+        self.quarantine = Quarantine(quarantine_file, max_quarantine)
+        self._lock = threading.Lock()
+        self.observed = 0
+        self.anomalies = 0
+
+    def observe(self, issuer: str, target: str, now: Optional[float] = None) -> Dict:
+        """Count one atom and judge it, O(1)"""
+        now = self.clock() if now is None else now
+        reasons = []
+        counts = {}
+        with self._lock:
+            self.observed += 1
+            self._rate.add(now)
+            for kind, key in (("issuer", issuer), ("target", target)):
+                indexes = sketch_indexes(key, self._width, self._depth)
+                short = self._short[kind].add(indexes, now)
+                long = self._long[kind].add(indexes, now)
+                expected = max(long * self.short_window / self.long_window, 1.0)
+                counts[kind] = short
+                if short >= self.limits[kind]:
+                    reasons.append(f"{kind}_limit")
+                elif short >= self.min_count and short > self.burst_factor * expected:
+                    reasons.append(f"{kind}_burst")
+
+            verdict = {
+                "anomalous": bool(reasons),
+                "reasons": reasons,
+                "action": self.action if reasons else None,
+                "issuerCount": counts["issuer"],
+                "targetCount": counts["target"]
+            }
+            if reasons:
+                self.anomalies += 1
+                for reason in reasons:
+                    key = issuer if reason.startswith("issuer") else target
+                    self.flagged[key] = {"reason": reason, "count": counts[reason.split("_")[0]], "at": now}
+                    self.flagged.move_to_end(key)
+                while len(self.flagged) > self.max_flagged:
+                    self.flagged.popitem(last=False)
+        return verdict
+
+    def retry_after(self, now: Optional[float] = None) -> float:
+        """Seconds until the oldest short-window bucket expires"""
+        now = self.clock() if now is None else now
+        span = self._short["issuer"].span
+        return span - (now % span)
+
+    def hold(self, content_id: str, jsonld: Dict, verdict: Dict) -> bool:
+        """Keep a quarantined atom for review; False if the quarantine is full"""
+        return self.quarantine.hold(content_id, jsonld, verdict, self.clock())
+
+    def release(self, content_id: str) -> Optional[Dict]:
+        """Remove an atom from quarantine, returns its JSON-LD"""
+        entry = self.quarantine.release(content_id)
+        return entry["atom"] if entry is not None else None
+
+    def get_stats(self) -> Dict:
+        now = self.clock()
+        with self._lock:
+            return {
+                "action": self.action,
+                "observed": self.observed,
+                "anomalies": self.anomalies,
+                "atomsLastWindow": self._rate.count(now),
+                "flaggedKeys": len(self.flagged),
+                "recentlyFlagged": list(self.flagged)[-10:],
+                "quarantined": len(self.quarantine)
+            }
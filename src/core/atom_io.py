@@ -0,0 +1,431 @@
+"""Atom I/O - Streaming export and bulk import of stored atom records
+
+Formats (picked by file suffix):
+  .json            store file ({"atoms": [...]}) or published_uals.json, parsed incrementally
+  .ndjson / .jsonl one record per line, optionally gzip-compressed (.gz)
+  .npz             compressed columnar chunks (one set of arrays per chunk_size records)
+  directory        segmented store (manifest.json + segment files, see atom_store)
+
+Every reader is a generator and every writer consumes one, so memory use
+is bounded by a batch, not by the number of atoms.
+"""
+
+import gzip
+import json
+import os
+import zipfile
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+import numpy as np
+
+from .atom_store import AtomStore
+from .content_hash import atom_content_ids, local_ka_id
+
+TRUST_DIMENSIONS = (
+    "honesty", "expertise", "bias", "safety", "speed", "alignment", "responsiveness", "stake_weight"
+)
+
+# Record and trustAtom fields stored as their own string columns in .npz exports
+_RECORD_STRINGS = ("kaId", "contentId", "mode", "timestamp")
+_ATOM_STRINGS = ("issuer", "target", "content", "issued")
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[List]:
+    """Consecutive lists of up to size items"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _open_text(path: str, mode: str = "r", compressed: Optional[bool] = None):
+    if path.endswith(".gz") if compressed is None else compressed:
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=6)
+    return open(path, mode, encoding="utf-8")
+
+
+# -- Incremental JSON ---------------------------------------------------------
+
+class _JSONStream:
+    """Pull-parser over a text file for a top-level {"key": value, ...} document"""
+
+    def __init__(self, f, chunk_size: int = 1 << 16):
+        self._f = f
+        self._chunk = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size: int) -> bool:
+        if self._eof:
+            return False
+        data = self._f.read(size)
+        if not data:
+            self._eof = True
+            return False
+        if self._pos > len(self._buf) // 2:
+            self._buf, self._pos = self._buf[self._pos:], 0
+        self._buf += data
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of input)"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill(self._chunk):
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self._pos} of JSON stream")
+        self._pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value, reading more input as needed"""
+        self.peek()
+        size = self._chunk
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # A number ending exactly at the buffer edge may continue in the next chunk
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill(size)
+            size *= 2
+
+
+def iter_json_array(path: str, key: str = "atoms", other: Optional[Dict] = None) -> Iterator:
+    """Stream the items of the top-level array at key; values of keys seen before it go into other"""
+    with _open_text(path) as f:
+        stream = _JSONStream(f)
+        stream.expect("{")
+        while stream.peek() not in ("}", ""):
+            name = stream.value()
+            stream.expect(":")
+            if name != key:
+                value = stream.value()
+                if other is not None:
+                    other[name] = value
+            else:
+                stream.expect("[")
+                while stream.peek() != "]":
+                    yield stream.value()
+                    if stream.peek() == ",":
+                        stream.expect(",")
+                stream.expect("]")
+            if stream.peek() == ",":
+                stream.expect(",")
+
+
+# -- Readers ------------------------------------------------------------------
+
+def normalize_records(items: Iterable[Dict], uals: Optional[List[str]] = None, batch_size: int = 10000) -> Iterator[Dict]:
+    """Store records from records or bare atom JSON-LD, with contentId filled in batches"""
+    position = 0
+    for batch in batched(items, batch_size):
+        records = []
+        for item in batch:
+            if "trustAtom" in item:
+                records.append(item)
+            else:
+                ual = uals[position] if uals and position < len(uals) else None
+                records.append({
+                    "kaId": ual,
+                    "trustAtom": item,
+                    "timestamp": item.get("issued"),
+                    "mode": "LOCAL" if ual is None or ual.startswith("local:") else "DKG_TESTNET"
+                })
+            position += 1
+
+        missing = [r for r in records if "contentId" not in r]
+        for record, cid in zip(missing, atom_content_ids([r["trustAtom"] for r in missing])):
+            record["contentId"] = cid
+            if record.get("kaId") is None:
+                record["kaId"] = local_ka_id(cid)
+        yield from records
+
+
+def iter_records(path: str, batch_size: int = 10000) -> Iterator[Dict]:
+    """Stream store records from any supported format"""
+    if os.path.isdir(path):
+        store = AtomStore(path)
+        store.load()
+        yield from store.atoms
+    elif path.endswith(".npz"):
+        yield from iter_npz(path)
+    elif path.endswith((".ndjson", ".jsonl", ".ndjson.gz", ".jsonl.gz")):
+        yield from normalize_records(iter_ndjson(path), batch_size=batch_size)
+    else:
+        # published_uals.json keeps its UALs in a separate array ahead of the atoms
+        header: Dict = {}
+        items = iter_json_array(path, "atoms", header)
+        first = next(items, None)
+        if first is None:
+            return
+        yield from normalize_records(chain([first], items), header.get("uals"), batch_size)
+
+
+def iter_ndjson(path: str) -> Iterator[Dict]:
+    """One JSON object per non-empty line"""
+    with _open_text(path) as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as error:
+                raise ValueError(f"{path}:{line_number}: {error}") from None
+
+
+def iter_npz(path: str) -> Iterator[Dict]:
+    """Records from a columnar export, one chunk in memory at a time"""
+    with np.load(path, allow_pickle=False) as archive:
+        chunks = int(archive["chunks"])
+        for chunk in range(chunks):
+            columns = {
+                name.split("/", 1)[1]: archive[name]
+                for name in archive.files if name.startswith(f"{chunk:06d}/")
+            }
+            yield from _columns_to_records(columns)
+
+
+# -- Writers ------------------------------------------------------------------
+
+def write_ndjson(records: Iterable[Dict], path: str) -> int:
+    """Write records one per line (gzip if path ends in .gz); returns the count"""
+    count = 0
+    tmp = f"{path}.tmp"
+    with _open_text(tmp, "w", compressed=path.endswith(".gz")) as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    os.replace(tmp, path)
+    return count
+
+
+def write_npz(records: Iterable[Dict], path: str, chunk_size: int = 20000) -> int:
+    """Write records as compressed column chunks; returns the count"""
+    count = 0
+    chunk = -1
+    tmp = f"{path}.tmp"
+    with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+        for chunk, batch in enumerate(batched(records, chunk_size)):
+            for name, column in _records_to_columns(batch).items():
+                _write_array(archive, f"{chunk:06d}/{name}", column)
+            count += len(batch)
+        _write_array(archive, "chunks", np.array(chunk + 1))
+    os.replace(tmp, path)
+    return count
+
+
+def write_records(records: Iterable[Dict], path: str) -> int:
+    """Write records in the format implied by path's suffix"""
+    if path.endswith(".npz"):
+        return write_npz(records, path)
+    if path.endswith((".ndjson", ".jsonl", ".ndjson.gz", ".jsonl.gz")):
+        return write_ndjson(records, path)
+    raise ValueError(f"Unsupported export format: {path} (use .ndjson[.gz] or .npz)")
+
+
+def _write_array(archive: zipfile.ZipFile, name: str, array: np.ndarray):
+    with archive.open(name + ".npy", "w", force_zip64=True) as member:
+        np.lib.format.write_array(member, np.asanyarray(array), allow_pickle=False)
+
+
+def _records_to_columns(records: List[Dict]) -> Dict[str, np.ndarray]:
+    strings = {name: [] for name in _RECORD_STRINGS + _ATOM_STRINGS}
+    vectors = np.full((len(records), len(TRUST_DIMENSIONS)), np.nan)
+    overall = np.full(len(records), np.nan)
+    extra = []
+
+    for row, record in enumerate(records):
+        rest = dict(record)
+        atom = dict(rest.pop("trustAtom", {}))
+        # Empty strings and non-string values stay in the JSON column so they round-trip exactly
+        for fields, source in ((_RECORD_STRINGS, rest), (_ATOM_STRINGS, atom)):
+            for name in fields:
+                value = source.get(name)
+                if isinstance(value, str) and value:
+                    strings[name].append(value)
+                    del source[name]
+                else:
+                    strings[name].append("")
+
+        vector = atom.get("trustVector")
+        if isinstance(vector, dict) and set(vector) <= set(TRUST_DIMENSIONS) and all(
+            isinstance(v, (int, float)) for v in vector.values()
+        ):
+            for col, dim in enumerate(TRUST_DIMENSIONS):
+                vectors[row, col] = vector.get(dim, np.nan)
+            del atom["trustVector"]
+        if isinstance(atom.get("overall"), float):
+            overall[row] = atom.pop("overall")
+
+        # Whatever didn't fit a column (evidence, x402 config, collection, ...) stays JSON
+        rest["trustAtom"] = atom
+        extra.append(json.dumps(rest, separators=(",", ":"), ensure_ascii=False))
+
+    columns = {name: np.array(values, dtype=str) for name, values in strings.items()}
+    columns["trustVector"] = vectors
+    columns["overall"] = overall
+    columns["extra"] = np.array(extra, dtype=str)
+    return columns
+
+
+def _columns_to_records(columns: Dict[str, np.ndarray]) -> Iterator[Dict]:
+    vectors, overall = columns["trustVector"], columns["overall"]
+    for row, extra in enumerate(columns["extra"]):
+        record = json.loads(str(extra))
+        atom = record.pop("trustAtom")
+        for name in _ATOM_STRINGS:
+            value = str(columns[name][row])
+            if value:
+                atom[name] = value
+        if not np.isnan(vectors[row]).all():
+            atom["trustVector"] = {
+                dim: float(v) for dim, v in zip(TRUST_DIMENSIONS, vectors[row]) if not np.isnan(v)
+            }
+        if not np.isnan(overall[row]):
+            atom["overall"] = float(overall[row])
+
+        out = {}
+        for name in _RECORD_STRINGS:
+            value = str(columns[name][row])
+            if value:
+                out[name] = value
+        out["trustAtom"] = atom
+        out.update(record)
+        yield out
+
+
+# -- Import -------------------------------------------------------------------
+
+class ContentIdSet:
+    """Set of sha256 content IDs as a sorted array of 32-byte digests
+
+    Membership is a binary search; new IDs are buffered and merged into the
+    array in bulk, so 50M IDs cost ~1.6 GB of digests rather than 50M
+    Python strings. IDs that aren't 64 hex digits (legacy records) are kept
+    as strings on the side.
+    """
+
+    def __init__(self, merge_every: int = 1 << 20):
+        self._sorted = np.array([], dtype="S32")
+        self._pending: set = set()
+        self._other: Set[str] = set()
+        self.merge_every = merge_every
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._pending) + len(self._other)
+
+    def __contains__(self, cid: str) -> bool:
+        digest = _digest(cid)
+        if digest is None:
+            return cid in self._other
+        if digest in self._pending:
+            return True
+        i = int(np.searchsorted(self._sorted, digest))
+        return i < len(self._sorted) and self._sorted[i] == digest
+
+    def add(self, cid: str):
+        digest = _digest(cid)
+        if digest is None:
+            self._other.add(cid)
+            return
+        self._pending.add(digest)
+        if len(self._pending) >= self.merge_every:
+            self._merge()
+
+    def _merge(self):
+        if self._pending:
+            added = np.array(sorted(self._pending), dtype="S32")
+            self._sorted = np.union1d(self._sorted, added)
+            self._pending.clear()
+
+
+def _digest(cid: str) -> Optional[bytes]:
+    """32-byte digest of a hex sha256 content ID (None for any other ID)"""
+    if len(cid) != 64:
+        return None
+    try:
+        return bytes.fromhex(cid)
+    except ValueError:
+        return None
+
+
+def import_records(records: Iterable[Dict], storage_file: str, batch_size: int = 10000) -> Dict:
+    """Merge records into a store file without loading it
+
+    The existing file is streamed into a new one, then incoming records
+    are appended in batches (atoms already stored are skipped), and the new
+    file replaces the old one atomically. A segmented store (a path not
+    ending in .json) is loaded instead and only gains new segments.
+    """
+    if not storage_file.endswith(".json"):
+        return _import_segmented(records, storage_file, batch_size)
+
+    seen = ContentIdSet()
+    existing = 0
+    imported = 0
+    duplicates = 0
+    tmp = f"{storage_file}.tmp"
+
+    with open(tmp, "w", encoding="utf-8") as out:
+        out.write('{\n  "atoms": [')
+        first = True
+
+        # One compact record per line (indent=2 would force the slow pure-Python encoder)
+        def emit(record: Dict):
+            nonlocal first
+            out.write(("\n    " if first else ",\n    ") + json.dumps(record, ensure_ascii=False))
+            first = False
+
+        if os.path.exists(storage_file):
+            for record in iter_records(storage_file, batch_size):
+                seen.add(record["contentId"])
+                emit(record)
+                existing += 1
+
+        # Atoms already stored, or repeated within the source, are skipped
+        for batch in batched(normalize_records(records, batch_size=batch_size), batch_size):
+            for record in batch:
+                if record["contentId"] in seen:
+                    duplicates += 1
+                    continue
+                seen.add(record["contentId"])
+                emit(record)
+                imported += 1
+
+        out.write(f'\n  ],\n  "total": {existing + imported}\n}}\n')
+    os.replace(tmp, storage_file)
+
+    return {"existing": existing, "imported": imported, "duplicates": duplicates, "total": existing + imported}
+
+
+def _import_segmented(records: Iterable[Dict], directory: str, batch_size: int) -> Dict:
+    store = AtomStore(directory)
+    existing = store.load()
+    imported = 0
+    duplicates = 0
+    for record in normalize_records(records, batch_size=batch_size):
+        # As with store files, atoms already stored or imported are skipped
+        if store.position(record["contentId"]) is not None:
+            duplicates += 1
+            continue
+        store.append(record)
+        imported += 1
+    store.save()
+    return {"existing": existing, "imported": imported, "duplicates": duplicates, "total": existing + imported}
@@ -0,0 +1,588 @@
+"""Atom Store - Local Trust Atom storage with issuer/target adjacency indexes
+
+Records live in a columnar AtomTable. The storage file is either one JSON
+document (*.json) or a directory of segment files plus a manifest; a
+segment directory loads with array copies instead of parsing JSON, and
+its segments are read by several threads at once.
+"""
+
+import functools
+import heapq
+import json
+import os
+import threading
+import uuid
+from bisect import bisect_right, insort
+from collections import deque
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .atom_table import AtomTable, read_patches, read_segment, write_segment
+from .content_hash import atom_content_id, atom_content_ids
+from .delta_sync import RangeHashIndex
+
+
+NEIGHBORHOOD_DIRECTIONS = ("out", "in", "both")
+
+MANIFEST_FILE = "manifest.json"
+PATCH_FILE = "patches.npz"
+
+_NO_ROWS = np.empty(0, dtype=np.int64)
+
+
+def _prefix_key(cid: str) -> Optional[int]:
+    """First 64 bits of a sha256 hex content ID (None for other IDs)"""
+    if len(cid) != 64:
+        return None
+    try:
+        return int(cid[:16], 16)
+    except ValueError:
+        return None
+
+
+def _locked(method):
+    """Run a store method while holding the store's lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class PositionIndex:
+    """Rows per integer key: a CSR block over bulk-indexed rows plus per-key tails for appends
+
+    Within a key, rows are ordered by a per-row rank (then by row): the
+    block by the rebuild's sort, each tail by insertion in order. The best
+    rows of a key are read off in order without sorting them.
+    """
+
+    def __init__(self):
+        self._order = _NO_ROWS
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._tail: Dict[int, List[Tuple[float, int]]] = {}
+        self.tail_size = 0
+
+    def rebuild(self, keys: np.ndarray, key_count: int, rank: np.ndarray):
+        """Index every row of keys (one key per row, -1 for none), rows of a key by ascending rank"""
+        rows = np.flatnonzero(keys >= 0)
+        self._order = rows[np.lexsort((rank[rows], keys[rows]))]
+        self._offsets = np.zeros(key_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys[rows], minlength=key_count), out=self._offsets[1:])
+        self._tail = {}
+        self.tail_size = 0
+
+    def add(self, key: int, row: int, rank: float):
+        insort(self._tail.setdefault(key, []), (rank, row))
+        self.tail_size += 1
+
+    def count(self, key: int) -> int:
+        return len(self._block(key)) + len(self._tail.get(key, ()))
+
+    def get(self, key: int) -> np.ndarray:
+        """Rows with key, in row order"""
+        tail = self._tail.get(key)
+        if tail is None:
+            return np.sort(self._block(key))
+        return np.sort(np.concatenate([self._block(key), np.array([row for _, row in tail], dtype=np.int64)]))
+
+    def page(self, key: int, rank_of: Callable[[int], float], after: Optional[int], limit: int) -> List[int]:
+        """Up to limit rows with key in (rank, row) order, starting after row `after`"""
+        block = self._block(key)
+        tail = self._tail.get(key, [])
+        start = tail_start = 0
+        if after is not None:
+            cursor = (rank_of(after), after)
+            high = len(block)
+            while start < high:
+                middle = (start + high) // 2
+                row = int(block[middle])
+                if (rank_of(row), row) <= cursor:
+                    start = middle + 1
+                else:
+                    high = middle
+            tail_start = bisect_right(tail, cursor)
+        head = ((rank_of(row), row) for row in block[start:start + limit].tolist())
+        return [row for _, row in islice(heapq.merge(head, tail[tail_start:tail_start + limit]), limit)]
+
+    def _block(self, key: int) -> np.ndarray:
+        if key + 1 < len(self._offsets):
+            return self._order[self._offsets[key]:self._offsets[key + 1]]
+        return _NO_ROWS
+
+
+class RecordView(Sequence):
+    """Read-only sequence over a table's records, each materialized on access"""
+
+    def __init__(self, table: AtomTable, lock: Optional[threading.RLock] = None):
+        self._table = table
+        self._lock = lock or threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __getitem__(self, index):
+        with self._lock:
+            if isinstance(index, slice):
+                return [self._table.record(row) for row in range(*index.indices(len(self)))]
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError("record index out of range")
+            return self._table.record(index)
+
+    def __iter__(self) -> Iterator[Dict]:
+        start = 0
+        while True:
+            # One batch per lock hold, so appends can go ahead between batches
+            with self._lock:
+                batch = self._table.records(start, min(start + 4096, len(self._table)))
+            if not batch:
+                return
+            yield from batch
+            start += len(batch)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+
+class AtomStore:
+    """Append-only atom records, indexed by content ID, issuer and target
+
+    Records are kept in columns (see AtomTable); by_issuer, by_target and
+    get_by_content_id return freshly built dicts, so changes to a stored
+    record go through update().
+
+    Public methods hold `lock` (re-entrant), so publishing threads, the
+    outbox drainer and readers can share a store. Code reading `table`
+    directly should hold it too.
+    """
+
+    def __init__(self, storage_file: str = "local_atoms.json", segment_size: int = 65536, load_workers: int = 0):
+        self.storage_file = storage_file
+        self.segment_size = segment_size
+        self.load_workers = load_workers
+        self.table = AtomTable()
+        self.lock = threading.RLock()
+
+        # Rows per DID code, for issuer / target lookups and graph walks
+        self._by_issuer = PositionIndex()
+        self._by_target = PositionIndex()
+
+        # 64-bit content ID prefix -> first row; full IDs only for prefix collisions and odd IDs
+        self._content_ids: Dict[int, int] = {}
+        self._content_spill: Dict[str, int] = {}
+
+        # Identity and per-prefix content summaries for delta sync with other stores;
+        # a record's position is its sequence number
+        self.store_id = uuid.uuid4().hex
+        self._range_index: Optional[RangeHashIndex] = None
+
+        # Saved segment files ({"file", "start", "count"}) and those with rows changed since
+        self._segments: List[Dict] = []
+        self._dirty: Set[int] = set()
+
+    @property
+    def segmented(self) -> bool:
+        """Stored as a segment directory rather than one JSON file"""
+        return not self.storage_file.endswith(".json")
+
+    @property
+    def atoms(self) -> RecordView:
+        """All records, oldest first"""
+        return RecordView(self.table, self.lock)
+
+    @property
+    @_locked
+    def range_index(self) -> RangeHashIndex:
+        """Per-prefix content summaries for delta sync (built on first use)"""
+        if self._range_index is None:
+            index = RangeHashIndex()
+            for row in sorted(list(self._content_ids.values()) + list(self._content_spill.values())):
+                index.add(self.table.content_id(row))
+            self._range_index = index
+        return self._range_index
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.atoms)
+
+    @_locked
+    def __contains__(self, cid: str) -> bool:
+        return self._find(cid) is not None
+
+    # -- Persistence ----------------------------------------------------------
+
+    @_locked
+    def load(self) -> int:
+        """Load records from the storage file or segment directory and index them"""
+        if self.segmented:
+            self._load_segments()
+        elif os.path.exists(self.storage_file):
+            with open(self.storage_file, 'r') as f:
+                data = json.load(f)
+            records = data.pop("atoms", [])
+            self.store_id = data.get("storeId") or self.store_id
+
+            # Records written before content addressing are hashed in one batch
+            missing = [r for r in records if "contentId" not in r]
+            for record, cid in zip(missing, atom_content_ids([r.get("trustAtom", {}) for r in missing])):
+                record["contentId"] = cid
+
+            self.table.reserve(len(records))
+            for i in range(0, len(records), self.segment_size):
+                self.table.extend_records(records[i:i + self.segment_size])
+            del records
+        self._reindex()
+        return len(self.table)
+
+    def _load_segments(self):
+        manifest = self._read_manifest()
+        if manifest is None:
+            return
+        self.table.reserve(manifest["total"])
+        for columns in self._read_segments(read_segment, self._segments):
+            self.table.extend(columns)
+
+        # Records updated by a TieredAtomStore since its last compaction
+        patches = manifest.get("patches")
+        if patches:
+            for row, record in read_patches(self._segment_path(patches["file"])):
+                self.table.update(row, record)
+                self._dirty.add(bisect_right([s["start"] for s in self._segments], row) - 1)
+
+    def _read_manifest(self) -> Optional[Dict]:
+        manifest_file = self._segment_path(MANIFEST_FILE)
+        if not os.path.exists(manifest_file):
+            return None
+        with open(manifest_file, 'r') as f:
+            manifest = json.load(f)
+        self.store_id = manifest.get("storeId") or self.store_id
+        self._segments = manifest["segments"]
+        return manifest
+
+    def _read_segments(self, reader, segments: List[Dict]) -> Iterator[Dict[str, np.ndarray]]:
+        """reader(path) for each segment, in order"""
+        # Segments decode independently (zip reads release the GIL)
+        paths = [self._segment_path(segment["file"]) for segment in segments]
+        workers = self.load_workers or min(8, os.cpu_count() or 1)
+        if workers > 1 and len(paths) > 1:
+            with ThreadPoolExecutor(workers) as pool:
+                yield from pool.map(reader, paths)
+        else:
+            for path in paths:
+                yield reader(path)
+
+    def _segment_path(self, name: str) -> str:
+        return os.path.join(self.storage_file, name)
+
+    @_locked
+    def save(self):
+        """Write records to the storage file, or changed and new segments to the directory"""
+        if self.segmented:
+            self._save_segments()
+            return
+        with open(self.storage_file, 'w') as f:
+            json.dump({
+                "storeId": self.store_id,
+                "total": len(self.table),
+                "atoms": list(self.atoms)
+            }, f, indent=2)
+
+    def _save_segments(self):
+        os.makedirs(self.storage_file, exist_ok=True)
+        segments = self._segments
+        total = len(self.table)
+
+        # A short last segment is topped up before new segments are started
+        saved = segments[-1]["start"] + segments[-1]["count"] if segments else 0
+        if segments and saved < total and segments[-1]["count"] < self.segment_size:
+            last = segments[-1]
+            last["count"] = min(self.segment_size, total - last["start"])
+            self._dirty.add(len(segments) - 1)
+            saved = last["start"] + last["count"]
+        while saved < total:
+            count = min(self.segment_size, total - saved)
+            segments.append({"file": f"segment-{len(segments):06d}.npz", "start": saved, "count": count})
+            self._dirty.add(len(segments) - 1)
+            saved += count
+
+        for number in sorted(self._dirty):
+            segment = segments[number]
+            self._write_segment(segment["file"], self.table.segment(segment["start"], segment["start"] + segment["count"]))
+        self._dirty.clear()
+        self._write_manifest()
+
+    def _write_segment(self, name: str, columns: Dict[str, np.ndarray]) -> str:
+        path = self._segment_path(name)
+        write_segment(path + ".tmp", columns)
+        os.replace(path + ".tmp", path)
+        return path
+
+    def _write_manifest(self, patches: Optional[Dict] = None):
+        """Point the manifest at the current segments (and patch file), replacing it atomically"""
+        manifest = {"storeId": self.store_id, "total": len(self.table), "segments": self._segments}
+        if patches:
+            manifest["patches"] = patches
+        manifest_file = self._segment_path(MANIFEST_FILE)
+        with open(manifest_file + ".tmp", 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(manifest_file + ".tmp", manifest_file)
+        if not patches and os.path.exists(self._segment_path(PATCH_FILE)):
+            os.remove(self._segment_path(PATCH_FILE))
+
+    # -- Records --------------------------------------------------------------
+
+    @_locked
+    def append(self, record: Dict) -> int:
+        """Add a record and index it, returns its position"""
+        cid = record.get("contentId")
+        if cid is None:
+            cid = record["contentId"] = atom_content_id(record.get("trustAtom", {}))
+        position = self.table.append(record)
+
+        if self._find(cid) is None:
+            self._index_content(cid, position)
+            if self._range_index is not None:
+                self._range_index.add(cid)
+
+        issuer, target = int(self.table.issuer[position]), int(self.table.target[position])
+        rank = self._rank_of(position)
+        if issuer >= 0:
+            self._by_issuer.add(issuer, position, rank)
+        if target >= 0:
+            self._by_target.add(target, position, rank)
+        # Fold long append tails back into the CSR blocks
+        if self._by_issuer.tail_size + self._by_target.tail_size > max(2 * self.segment_size, len(self.table) // 4):
+            self._reindex_dids()
+
+        return position
+
+    @_locked
+    def update(self, cid: str, **fields) -> Optional[Dict]:
+        """Update non-indexed fields (kaId, mode, ...) of the record with this content ID"""
+        row = self._find(cid)
+        if row is None:
+            return None
+        record = self.table.update(row, fields)
+        segment = bisect_right([s["start"] for s in self._segments], row) - 1
+        if segment >= 0 and row < self._segments[segment]["start"] + self._segments[segment]["count"]:
+            self._dirty.add(segment)
+        return record
+
+    @_locked
+    def position(self, cid: str) -> Optional[int]:
+        """Position of the first record stored with this content ID"""
+        return self._find(cid)
+
+    @_locked
+    def get_by_content_id(self, cid: str) -> Optional[Dict]:
+        """First record stored with this content ID"""
+        row = self._find(cid)
+        return None if row is None else self.table.record(row)
+
+    @_locked
+    def by_issuer(self, issuer: str) -> List[Dict]:
+        """Records issued by a DID"""
+        return [self.table.record(row) for row in self.issuer_rows(issuer).tolist()]
+
+    @_locked
+    def by_target(self, target: str) -> List[Dict]:
+        """Records about a target"""
+        return [self.table.record(row) for row in self.target_rows(target).tolist()]
+
+    @_locked
+    def target_fields(self, target: str, rows: Sequence[int], names: Sequence[str]) -> Dict[str, List]:
+        """Selected fields of rows about a target (see AtomTable.fields)"""
+        return self.table.fields(rows, names)
+
+    @_locked
+    def issuer_rows(self, issuer: str) -> np.ndarray:
+        """Positions of the records issued by a DID"""
+        code = self.table.dids.codes.get(issuer)
+        return _NO_ROWS if code is None else self._by_issuer.get(code)
+
+    @_locked
+    def target_rows(self, target: str) -> np.ndarray:
+        """Positions of the records about a target"""
+        code = self.table.dids.codes.get(target)
+        return _NO_ROWS if code is None else self._by_target.get(code)
+
+    @_locked
+    def ranked_rows(self, did: str, by: str = "target", after: Optional[int] = None, limit: int = 100) -> List[int]:
+        """Positions of the records about (or issued by) a DID, highest overall first
+
+        Ties keep append order. after is a position from an earlier page;
+        the page continues right after it.
+        """
+        code = self.table.dids.codes.get(did)
+        if code is None:
+            return []
+        return self._did_index(by).page(code, self._rank_of, after, limit)
+
+    @_locked
+    def atom_count(self, did: str, by: str = "target") -> int:
+        """Number of records about (or issued by) a DID"""
+        code = self.table.dids.codes.get(did)
+        return 0 if code is None else self._did_index(by).count(code)
+
+    def _did_index(self, by: str) -> PositionIndex:
+        if by == "target":
+            return self._by_target
+        if by == "issuer":
+            return self._by_issuer
+        raise ValueError(f"by must be 'target' or 'issuer', not {by!r}")
+
+    def _rank_of(self, row: int) -> float:
+        overall = float(self.table.overall[row])
+        return -overall if overall == overall else 0.0
+
+    @_locked
+    def mode_counts(self) -> Dict[str, int]:
+        """Number of records per mode (LOCAL, DKG_TESTNET)"""
+        modes = self.table.mode.values
+        counts = np.bincount(modes[modes >= 0], minlength=len(self.table.texts))
+        return {self.table.texts.values[code]: int(counts[code]) for code in np.flatnonzero(counts)}
+
+    @_locked
+    def target_totals(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Targets with atoms, and per target the atom count and summed overall (from the columns)"""
+        target = self.table.target.values
+        valid = target >= 0
+        overall = np.nan_to_num(self.table.overall.values[valid])
+        counts = np.bincount(target[valid], minlength=len(self.table.dids))
+        sums = np.bincount(target[valid], weights=overall, minlength=len(self.table.dids))
+        used = np.flatnonzero(counts)
+        return [self.table.dids.values[code] for code in used.tolist()], counts[used], sums[used]
+
+    @_locked
+    def get_stats(self) -> Dict:
+        return {"atoms": len(self.table), "segments": len(self._segments)}
+
+    # -- Graph ----------------------------------------------------------------
+
+    @_locked
+    def trusted_by(self, issuer: str) -> Set[str]:
+        """Targets an issuer has published atoms about"""
+        code = self.table.dids.codes.get(issuer)
+        return set() if code is None else self._decode(self._neighbor_codes(code, "out"))
+
+    @_locked
+    def trusters_of(self, target: str) -> Set[str]:
+        """Issuers that have published atoms about a target"""
+        code = self.table.dids.codes.get(target)
+        return set() if code is None else self._decode(self._neighbor_codes(code, "in"))
+
+    @_locked
+    def neighborhood(self, did: str, hops: int = 2, direction: str = "out") -> Dict[str, int]:
+        """Breadth-first k-hop neighborhood, maps each reached DID to its hop distance"""
+        if direction not in NEIGHBORHOOD_DIRECTIONS:
+            raise ValueError(f"direction must be one of {NEIGHBORHOOD_DIRECTIONS}")
+        start = self.table.dids.codes.get(did)
+        if start is None:
+            return {}
+
+        distances = {start: 0}
+        frontier = deque([start])
+        while frontier:
+            node = frontier.popleft()
+            if distances[node] >= hops:
+                continue
+            for neighbor in self._neighbor_codes(node, direction).tolist():
+                if neighbor not in distances:
+                    distances[neighbor] = distances[node] + 1
+                    frontier.append(neighbor)
+
+        del distances[start]
+        return {self.table.dids.values[code]: hop for code, hop in distances.items()}
+
+    @_locked
+    def mutual_trust(self, did: str) -> List[str]:
+        """DIDs that both trust and are trusted by did"""
+        outgoing, incoming = self.trusted_by(did), self.trusters_of(did)
+        if len(incoming) < len(outgoing):
+            outgoing, incoming = incoming, outgoing
+        return sorted(node for node in outgoing if node in incoming and node != did)
+
+    def _neighbor_codes(self, code: int, direction: str) -> np.ndarray:
+        """Distinct DID codes one trust edge away (edges need both an issuer and a target)"""
+        parts = []
+        if direction in ("out", "both"):
+            rows = self._by_issuer.get(code)
+            parts.append(self.table.target[rows])
+        if direction in ("in", "both"):
+            rows = self._by_target.get(code)
+            parts.append(self.table.issuer[rows])
+        codes = np.unique(np.concatenate(parts))
+        return codes[codes >= 0]
+
+    def _decode(self, codes: np.ndarray) -> Set[str]:
+        values = self.table.dids.values
+        return {values[code] for code in codes.tolist()}
+
+    # -- Indexes --------------------------------------------------------------
+
+    def _find(self, cid: str) -> Optional[int]:
+        key = _prefix_key(cid)
+        if key is not None:
+            row = self._content_ids.get(key)
+            if row is not None and self.table.content_id(row) == cid:
+                return row
+        return self._content_spill.get(cid)
+
+    def _index_content(self, cid: str, row: int):
+        key = _prefix_key(cid)
+        if key is not None and key not in self._content_ids:
+            self._content_ids[key] = row
+        else:
+            self._content_spill[cid] = row
+
+    def _reindex(self):
+        """Build every index from the table in bulk"""
+        digest, standard = self.table.digest.values, self.table.standard.values
+
+        # One entry per distinct 64-bit prefix, first row wins
+        rows = np.flatnonzero(standard)
+        keys = np.ascontiguousarray(digest[rows, :8]).view(">u8").ravel()
+        unique, first = np.unique(keys, return_index=True)
+        first_rows = rows[first]
+        self._content_ids = dict(zip(unique.tolist(), first_rows.tolist()))
+        self._content_spill = {}
+
+        # Later rows under a known prefix are duplicates, or (rarely) a different ID
+        later = np.setdiff1d(rows, first_rows, assume_unique=True)
+        if len(later):
+            owners = first_rows[np.searchsorted(unique, np.ascontiguousarray(digest[later, :8]).view(">u8").ravel())]
+            for row in later[(digest[later] != digest[owners]).any(axis=1)].tolist():
+                self._content_spill.setdefault(self.table.content_id(row), row)
+
+        # Rows kept whole as JSON go through the regular path (an earlier row still wins)
+        for row in np.flatnonzero(~standard).tolist():
+            cid = self.table.content_id(row)
+            if cid is None:
+                continue
+            existing = self._find(cid)
+            if existing is None:
+                self._index_content(cid, row)
+            elif row < existing:
+                key = _prefix_key(cid)
+                if key is not None and self._content_ids.get(key) == existing:
+                    self._content_ids[key] = row
+                else:
+                    self._content_spill[cid] = row
+
+        self._range_index = None
+        self._reindex_dids()
+
+    def _reindex_dids(self):
+        rank = -np.nan_to_num(self.table.overall.values)
+        self._by_issuer.rebuild(self.table.issuer.values, len(self.table.dids), rank)
+        self._by_target.rebuild(self.table.target.values, len(self.table.dids), rank)
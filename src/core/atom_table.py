@@ -0,0 +1,639 @@
+"""Atom Table - Columnar in-memory storage of atom records, and its segment files
+
+Records shaped the way the publisher writes them are split into typed
+columns: DIDs and short repeated strings (content, mode, requiredStake)
+are interned to int32 codes, trust vectors and scores are float64 arrays,
+content IDs 32-byte digests and timestamps ASCII bytes. What doesn't fit
+a column (evidence, collection UALs, fields from other writers) is kept
+as a compact JSON remainder; records of any other shape are kept whole
+as JSON. record(i) always returns exactly what was appended.
+
+A segment file (.npz) holds a run of rows column by column, with the
+interned strings replaced by a per-segment vocabulary, so reading one
+back is array copies plus one dictionary lookup per distinct string.
+"""
+
+import json
+import re
+import struct
+import zipfile
+from bisect import bisect_right
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .content_hash import local_ka_id
+
+TRUST_DIMENSIONS = (
+    "honesty", "expertise", "bias", "safety", "speed", "alignment", "responsiveness", "stake_weight"
+)
+
+ATOM_CONTEXT = ["https://www.w3.org/2018/credentials/v1", "https://trustgraph.io/schemas/trust-atom-v7"]
+
+# TrustAtomV7.to_jsonld() keys in order; defaulted values are not stored
+_ATOM_KEYS = (
+    "@context", "@type", "issuer", "target", "trustVector", "overall", "content",
+    "evidenceKA", "expires", "replaces", "requiredStake", "x402", "issued"
+)
+_ATOM_DEFAULTS = {
+    "@context": ATOM_CONTEXT, "@type": "VerifiableTrustAtom",
+    "evidenceKA": [], "expires": None, "replaces": None, "x402": None
+}
+_RECORD_KEYS = ("kaId", "contentId", "trustAtom", "timestamp", "mode")
+_ATOM_KEY_SET, _RECORD_KEY_SET, _DIMENSION_SET = set(_ATOM_KEYS), set(_RECORD_KEYS), set(TRUST_DIMENSIONS)
+
+# Longest issued / timestamp value kept in a fixed-width column
+_STAMP_WIDTH = 32
+# Smaller batches of new rows keep their strings in SparseStrings' dict rather than a run
+_MIN_RUN = 256
+_HEX64 = re.compile(r"[0-9a-f]{64}")
+_NAN_VECTOR = [float("nan")] * len(TRUST_DIMENSIONS)
+
+
+class StringTable:
+    """Interned strings: each distinct value is stored once and referred to by an int code"""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def code(self, value: str) -> int:
+        """Code for value, interning it if new"""
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def encode(self, vocabulary: Iterable[str], codes: np.ndarray) -> np.ndarray:
+        """Translate codes into a segment vocabulary to codes in this table (-1 stays -1)"""
+        mapping = np.array([self.code(value) for value in vocabulary] + [-1], dtype=np.int32)
+        return mapping[codes]
+
+
+class Column:
+    """Append-only numpy array whose capacity doubles as it fills"""
+
+    def __init__(self, dtype, shape: tuple = (), fill=0):
+        self._data = np.full((16,) + shape, fill, dtype=dtype)
+        self._fill = fill
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def values(self) -> np.ndarray:
+        """The filled part (a view: copy before the column grows if you keep it)"""
+        return self._data[:self.size]
+
+    def reserve(self, size: int):
+        if size > len(self._data):
+            capacity = max(size, 2 * len(self._data))
+            grown = np.full((capacity,) + self._data.shape[1:], self._fill, dtype=self._data.dtype)
+            grown[:self.size] = self._data[:self.size]
+            self._data = grown
+
+    def grow(self, count: int = 1) -> int:
+        """Add count default rows, returns the first new row"""
+        start = self.size
+        self.reserve(start + count)
+        self.size += count
+        return start
+
+    def extend(self, values: np.ndarray):
+        start = self.grow(len(values))
+        self._data[start:self.size] = values
+
+    def __getitem__(self, index):
+        return self._data[:self.size][index]
+
+    def __setitem__(self, index, value):
+        self._data[:self.size][index] = value
+
+
+class SparseStrings:
+    """Optional string per row, most rows having none
+
+    Runs loaded in bulk stay packed (the rows that have a value, offsets
+    and one UTF-8 blob); strings set later go to a dict that overrides
+    them. Looking up a packed row is a binary search.
+    """
+
+    def __init__(self):
+        self._runs: List[tuple] = []        # (first row, rows, offsets, UTF-8 bytes or uint8 array)
+        self._firsts: List[int] = []
+        self._changed: Dict[int, Optional[str]] = {}
+
+    def add_run(self, first: int, rows: np.ndarray, offsets: np.ndarray, blob):
+        """Values for rows (ascending, all >= first and past every earlier run)"""
+        if len(rows):
+            self._runs.append((first, rows, offsets, blob))
+            self._firsts.append(first)
+
+    def set(self, row: int, value: Optional[str]):
+        self._changed[row] = value
+
+    def get(self, row: int) -> Optional[str]:
+        if row in self._changed:
+            return self._changed[row]
+        run = bisect_right(self._firsts, row) - 1
+        if run < 0:
+            return None
+        _, rows, offsets, blob = self._runs[run]
+        i = int(np.searchsorted(rows, row))
+        if i < len(rows) and rows[i] == row:
+            return str(blob[offsets[i]:offsets[i + 1]], "utf-8")
+        return None
+
+    def range(self, start: int, stop: int) -> Dict[int, str]:
+        """Row -> value for the rows in [start, stop) that have one"""
+        values = {}
+        first_run = max(bisect_right(self._firsts, start) - 1, 0)
+        for _, rows, offsets, blob in self._runs[first_run:bisect_right(self._firsts, stop - 1)]:
+            lo, hi = np.searchsorted(rows, [start, stop]).tolist()
+            bounds = offsets[lo:hi + 1].tolist()
+            for row, a, b in zip(rows[lo:hi].tolist(), bounds, bounds[1:]):
+                values[row] = str(blob[a:b], "utf-8")
+        if self._changed:
+            changed = (
+                ((row, self._changed[row]) for row in range(start, stop) if row in self._changed)
+                if stop - start < len(self._changed) else
+                ((row, value) for row, value in self._changed.items() if start <= row < stop)
+            )
+            for row, value in changed:
+                if value is None:
+                    values.pop(row, None)
+                else:
+                    values[row] = value
+        return values
+
+    @staticmethod
+    def pack(values: Dict[int, str], first: int = 0) -> tuple:
+        """(rows relative to first, offsets, blob) for storing values as one run"""
+        rows = sorted(values)
+        encoded = [values[row].encode() for row in rows]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        return np.array(rows, dtype=np.int64) - first, offsets, b"".join(encoded)
+
+
+_INDEX_FIELDS = ("issuer", "target", "overall", "content", "mode", "digest", "standard")
+# Interned columns and the StringTable attribute holding their values
+_VOCABULARIES = {"issuer": "dids", "target": "dids", "content": "texts", "stake": "texts", "mode": "texts"}
+
+
+class AtomTable:
+    """Atom records as columns; rows are addressed by their append position
+
+    Given a pager (start, stop -> records), the table keeps only the index
+    columns and kaIds, and asks the pager for whole records.
+    """
+
+    def __init__(self, pager: Optional[Callable[[int, int], List[Dict]]] = None):
+        self.dids = StringTable()
+        self.texts = StringTable()
+
+        self.issuer = Column(np.int32, fill=-1)
+        self.target = Column(np.int32, fill=-1)
+        self.vector = Column(np.float64, (len(TRUST_DIMENSIONS),), fill=np.nan)
+        self.overall = Column(np.float64, fill=np.nan)
+        self.content = Column(np.int32, fill=-1)
+        self.stake = Column(np.int32, fill=-1)
+        self.mode = Column(np.int32, fill=-1)
+        self.digest = Column(np.uint8, (32,))
+        self.issued = Column(f"S{_STAMP_WIDTH}", fill=b"")
+        self.timestamp = Column(f"S{_STAMP_WIDTH}", fill=b"")
+        # False for rows kept whole in extras (anything not shaped like a publisher record)
+        self.standard = Column(np.bool_, fill=False)
+
+        # kaId when it isn't the one derived from the content ID
+        self.ka_ids = SparseStrings()
+        # JSON remainder (standard rows) or the whole record (others)
+        self.extras = SparseStrings()
+
+        self._pager = pager
+        self._fields = _INDEX_FIELDS if pager else _INDEX_FIELDS + ("vector", "stake", "issued", "timestamp")
+        self._columns = tuple(getattr(self, name) for name in self._fields)
+
+    def __len__(self) -> int:
+        return self.standard.size
+
+    def reserve(self, rows: int):
+        """Make room for rows in total up front (saves regrowing while loading)"""
+        for column in self._columns:
+            column.reserve(rows)
+
+    # -- Rows -----------------------------------------------------------------
+
+    def append(self, record: Dict) -> int:
+        """Add a record (must have a contentId), returns its row"""
+        return self.extend_records([record])
+
+    def extend_records(self, records: Sequence[Dict]) -> int:
+        """Add records (each with a contentId) column by column, returns the first new row"""
+        start = len(self)
+        for column in self._columns:
+            column.grow(len(records))
+        if records:
+            self._store(start, [self._encode(record) for record in records], new=True)
+        return start
+
+    def update(self, row: int, fields: Dict) -> Dict:
+        """Replace top-level fields of a row's record, returns the new record"""
+        record = self.record(row)
+        record.update(fields)
+        self._store(row, [self._encode(record)])
+        return record
+
+    def record(self, row: int) -> Dict:
+        """The record as it was appended (a new dict on every call)"""
+        return self.records(row, row + 1)[0]
+
+    def records(self, start: int, stop: int) -> List[Dict]:
+        """Records of rows [start, stop), decoded a column slice at a time"""
+        if self._pager is not None:
+            return self._pager(start, stop)
+        dids, texts = self.dids.values, self.texts.values
+        return _decode_rows(
+            start,
+            self.standard[start:stop].tolist(),
+            _lookup(dids, self.issuer[start:stop]),
+            _lookup(dids, self.target[start:stop]),
+            self.vector[start:stop].tolist(),
+            self.overall[start:stop].tolist(),
+            _lookup(texts, self.content[start:stop]),
+            _lookup(texts, self.stake[start:stop]),
+            _lookup(texts, self.mode[start:stop]),
+            self.issued[start:stop].tolist(),
+            self.timestamp[start:stop].tolist(),
+            self.digest[start:stop].tobytes(),
+            self.ka_ids.range(start, stop),
+            self.extras.range(start, stop)
+        )
+
+    # -- Single fields (no record materialized for standard rows) -------------
+
+    def content_id(self, row: int) -> Optional[str]:
+        if self.standard[row]:
+            return self.digest[row].tobytes().hex()
+        return self.record(row).get("contentId")
+
+    def ka_id(self, row: int) -> Optional[str]:
+        if self.standard[row]:
+            ka_id = self.ka_ids.get(row)
+            return local_ka_id(self.digest[row].tobytes().hex()) if ka_id is None else ka_id
+        return self.record(row).get("kaId")
+
+    def fields(self, rows: np.ndarray, names: Sequence[str]) -> Dict[str, List]:
+        """Selected fields of many rows as lists, without building the records
+
+        names are record fields (kaId, contentId, mode, timestamp) or
+        trustAtom fields (issuer, target, overall, content, issued);
+        absent values are None.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        out: Dict[str, List] = {}
+        for name in names:
+            if name in ("issuer", "target"):
+                values = self.dids.values
+                out[name] = [values[c] if c >= 0 else None for c in getattr(self, name)[rows].tolist()]
+            elif name in ("content", "mode"):
+                values = self.texts.values
+                out[name] = [values[c] if c >= 0 else None for c in getattr(self, name)[rows].tolist()]
+            elif name == "overall":
+                out[name] = [None if v != v else v for v in self.overall[rows].tolist()]
+            elif name in ("issued", "timestamp"):
+                # Without body columns these come from the records below
+                out[name] = [v.decode() for v in getattr(self, name)[rows].tolist()] if self._pager is None else None
+            elif name == "contentId":
+                digests = self.digest[rows].tobytes()
+                out[name] = [digests[i:i + 32].hex() for i in range(0, len(digests), 32)]
+            elif name == "kaId":
+                digests = self.digest[rows].tobytes()
+                out[name] = [
+                    local_ka_id(digests[32 * i:32 * i + 32].hex()) if ka_id is None else ka_id
+                    for i, ka_id in enumerate(self.ka_ids.get(row) for row in rows.tolist())
+                ]
+            else:
+                raise ValueError(f"Unknown field: {name}")
+
+        # Rows kept as JSON (and paged-out fields) answer from the record itself
+        paged = [name for name in names if out[name] is None]
+        for name in paged:
+            out[name] = [None] * len(rows)
+        patch = range(len(rows)) if paged else np.flatnonzero(~self.standard[rows]).tolist()
+        for i in patch:
+            record = self.record(int(rows[i]))
+            atom = record.get("trustAtom") or {}
+            for name in (names if not self.standard[rows[i]] else paged):
+                out[name][i] = record.get(name) if name in _RECORD_KEYS else atom.get(name)
+        return out
+
+    # -- Encoding -------------------------------------------------------------
+
+    def _encode(self, record: Dict) -> tuple:
+        """Column values of one record"""
+        atom = record.get("trustAtom")
+        atom = atom if isinstance(atom, dict) else {}
+
+        # Index columns are filled for every row that has the values
+        issuer, target, overall = atom.get("issuer"), atom.get("target"), atom.get("overall")
+        content, mode, cid = atom.get("content"), record.get("mode"), record.get("contentId")
+        index_values = (
+            self.dids.code(issuer) if isinstance(issuer, str) and issuer else -1,
+            self.dids.code(target) if isinstance(target, str) and target else -1,
+            overall if isinstance(overall, float) else np.nan,
+            self.texts.code(content) if isinstance(content, str) else -1,
+            self.texts.code(mode) if isinstance(mode, str) else -1,
+            bytes.fromhex(cid) if isinstance(cid, str) and _HEX64.fullmatch(cid) else bytes(32)
+        )
+
+        remainder = _split_standard(record, atom)
+        if remainder is None:
+            json_record = json.dumps(record, separators=(",", ":"), ensure_ascii=False)
+            return index_values + (False, _NAN_VECTOR, -1, b"", b"", None, json_record)
+
+        vector = atom["trustVector"]
+        return index_values + (
+            True,
+            [vector[dim] for dim in TRUST_DIMENSIONS],
+            self.texts.code(atom["requiredStake"]),
+            atom["issued"].encode(),
+            record["timestamp"].encode(),
+            None if record["kaId"] == local_ka_id(cid) else record["kaId"],
+            json.dumps(remainder, separators=(",", ":"), ensure_ascii=False) if remainder else None
+        )
+
+    def _store(self, start: int, encoded: List[tuple], new: bool = False):
+        """Write encoded records into rows start, start + 1, ... (new: rows never written)"""
+        (issuer, target, overall, content, mode, digest,
+         standard, vector, stake, issued, timestamp, ka_ids, extras) = zip(*encoded)
+        stop = start + len(encoded)
+        self.issuer[start:stop] = issuer
+        self.target[start:stop] = target
+        self.overall[start:stop] = overall
+        self.content[start:stop] = content
+        self.mode[start:stop] = mode
+        self.digest[start:stop] = np.frombuffer(b"".join(digest), dtype=np.uint8).reshape(-1, 32)
+        self.standard[start:stop] = standard
+        if self._pager is None:
+            self.vector[start:stop] = vector
+            self.stake[start:stop] = stake
+            self.issued[start:stop] = issued
+            self.timestamp[start:stop] = timestamp
+        for strings, values in self._strings(ka_ids, extras):
+            if new and stop - start >= _MIN_RUN:
+                present = {row: value for row, value in enumerate(values, start) if value is not None}
+                strings.add_run(start, *SparseStrings.pack(present))
+            else:
+                for row, value in enumerate(values, start):
+                    if value is not None or not new:
+                        strings.set(row, value)
+
+    def _strings(self, ka_ids, extras) -> tuple:
+        """(SparseStrings, values) pairs the table keeps"""
+        if self._pager is not None:
+            return ((self.ka_ids, ka_ids),)
+        return (self.ka_ids, ka_ids), (self.extras, extras)
+
+    # -- Segments -------------------------------------------------------------
+
+    def segment(self, start: int, stop: int) -> Dict[str, np.ndarray]:
+        """Rows [start, stop) as segment columns"""
+        columns = {}
+        for name, vocabulary in _VOCABULARIES.items():
+            table = getattr(self, vocabulary)
+            codes = getattr(self, name)[start:stop]
+            used, local = np.unique(codes, return_inverse=True)
+            # -1 (absent) sorts first; it maps to the vocabulary's trailing -1 on load
+            if len(used) and used[0] < 0:
+                used, local = used[1:], np.where(codes < 0, len(used) - 1, local - 1)
+            columns[name] = local.astype(np.int32).reshape(-1)
+            columns[f"{name}Vocabulary"] = np.array([table.values[code] for code in used], dtype=str)
+        for name in ("vector", "overall", "digest", "issued", "timestamp", "standard"):
+            columns[name] = getattr(self, name)[start:stop]
+
+        # Sparse strings as one UTF-8 blob with offsets (a long value can't widen every row)
+        for name, strings in (("kaId", self.ka_ids), ("extra", self.extras)):
+            rows, offsets, blob = SparseStrings.pack(strings.range(start, stop), start)
+            columns[f"{name}Rows"], columns[f"{name}Offsets"] = rows, offsets
+            columns[f"{name}Blob"] = np.frombuffer(blob, dtype=np.uint8)
+        return columns
+
+    def extend(self, columns: Dict[str, np.ndarray]) -> int:
+        """Append the rows of one segment, returns the first new row"""
+        start = len(self)
+        for name in self._fields:
+            if name in _VOCABULARIES:
+                table = getattr(self, _VOCABULARIES[name])
+                getattr(self, name).extend(table.encode(columns[f"{name}Vocabulary"].tolist(), columns[name]))
+            else:
+                getattr(self, name).extend(columns[name])
+
+        for strings, name in self._strings("kaId", "extra"):
+            strings.add_run(start, columns[f"{name}Rows"] + start, np.array(columns[f"{name}Offsets"]),
+                            columns[f"{name}Blob"].tobytes())
+        return start
+
+
+class SegmentView:
+    """Records of one segment, decoded on demand from its columns (typically memory-mapped)"""
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self.columns = columns
+        self.ka_ids = SparseStrings()
+        self.extras = SparseStrings()
+        for name, strings in (("kaId", self.ka_ids), ("extra", self.extras)):
+            strings.add_run(0, columns[f"{name}Rows"], columns[f"{name}Offsets"], columns[f"{name}Blob"])
+
+    def __len__(self) -> int:
+        return len(self.columns["standard"])
+
+    def records(self, start: int, stop: int) -> List[Dict]:
+        """Records of the segment's rows [start, stop)"""
+        columns = self.columns
+
+        def strings(name):
+            return _lookup_vocabulary(columns[f"{name}Vocabulary"], columns[name][start:stop])
+
+        return _decode_rows(
+            start,
+            columns["standard"][start:stop].tolist(),
+            strings("issuer"),
+            strings("target"),
+            columns["vector"][start:stop].tolist(),
+            columns["overall"][start:stop].tolist(),
+            strings("content"),
+            strings("stake"),
+            strings("mode"),
+            columns["issued"][start:stop].tolist(),
+            columns["timestamp"][start:stop].tolist(),
+            columns["digest"][start:stop].tobytes(),
+            self.ka_ids.range(start, stop),
+            self.extras.range(start, stop)
+        )
+
+
+def _lookup(values: List[str], codes: np.ndarray) -> List[Optional[str]]:
+    return [values[code] if code >= 0 else None for code in codes.tolist()]
+
+
+def _lookup_vocabulary(vocabulary: np.ndarray, codes: np.ndarray) -> List[Optional[str]]:
+    """Segment codes to strings; code len(vocabulary) marks an absent value"""
+    present = codes < len(vocabulary)
+    if present.all():
+        return vocabulary[codes].tolist()
+    values: List[Optional[str]] = [None] * len(codes)
+    for i, value in zip(np.flatnonzero(present).tolist(), vocabulary[codes[present]].tolist()):
+        values[i] = value
+    return values
+
+
+def _decode_rows(
+    start: int,
+    standard: List[bool],
+    issuer: List[Optional[str]],
+    target: List[Optional[str]],
+    vector: List[List[float]],
+    overall: List[float],
+    content: List[Optional[str]],
+    stake: List[Optional[str]],
+    mode: List[Optional[str]],
+    issued: List[bytes],
+    timestamp: List[bytes],
+    digests: bytes,
+    ka_ids: Dict[int, str],
+    extras: Dict[int, str]
+) -> List[Dict]:
+    """Records from the column values of consecutive rows numbered from start"""
+    rows = zip(range(start, start + len(standard)), standard, issuer, target, vector, overall,
+               content, stake, mode, issued, timestamp)
+    records = []
+    for row, standard, issuer, target, vector, overall, content, stake, mode, issued, timestamp in rows:
+        if not standard:
+            records.append(json.loads(extras[row]))
+            continue
+        remainder = json.loads(extras[row]) if row in extras else {}
+        ka_id = ka_ids.get(row)
+        cid = digests[(row - start) * 32:(row - start + 1) * 32].hex()
+
+        atom = {
+            "@context": list(ATOM_CONTEXT),
+            "@type": _ATOM_DEFAULTS["@type"],
+            "issuer": issuer,
+            "target": target,
+            "trustVector": dict(zip(TRUST_DIMENSIONS, vector)),
+            "overall": overall,
+            "content": content,
+            "evidenceKA": [],
+            "expires": None,
+            "replaces": None,
+            "requiredStake": stake,
+            "x402": None,
+            "issued": issued.decode()
+        }
+        atom.update(remainder.pop("trustAtom", {}))
+        record = {
+            "kaId": local_ka_id(cid) if ka_id is None else ka_id,
+            "contentId": cid,
+            "trustAtom": atom,
+            "timestamp": timestamp.decode(),
+            "mode": mode
+        }
+        record.update(remainder)
+        records.append(record)
+    return records
+
+
+def _split_standard(record: Dict, atom: Dict) -> Optional[Dict]:
+    """Fields of a publisher-shaped record that don't fit the columns, or None for other shapes"""
+    if not (_RECORD_KEY_SET <= record.keys() and _ATOM_KEY_SET <= atom.keys()):
+        return None
+    cid, issuer, target, vector = record["contentId"], atom["issuer"], atom["target"], atom["trustVector"]
+    if not (type(cid) is str and _HEX64.fullmatch(cid) and type(record["kaId"]) is str
+            and type(record["mode"]) is str and type(atom["overall"]) is float):
+        return None
+    if not (type(issuer) is str and issuer and type(target) is str and target
+            and type(atom["content"]) is str and type(atom["requiredStake"]) is str):
+        return None
+    for stamp in (atom["issued"], record["timestamp"]):
+        if type(stamp) is not str or len(stamp) > _STAMP_WIDTH or not stamp.isascii() or stamp.endswith("\0"):
+            return None
+    if type(vector) is not dict or vector.keys() != _DIMENSION_SET or set(map(type, vector.values())) != {float}:
+        return None
+
+    remainder = {key: value for key, value in record.items() if key not in _RECORD_KEY_SET} if len(record) > 5 else {}
+    atom_rest = {
+        key: value for key, value in atom.items()
+        if key not in _ATOM_KEY_SET or (key in _ATOM_DEFAULTS and value != _ATOM_DEFAULTS[key])
+    }
+    if atom_rest:
+        remainder["trustAtom"] = atom_rest
+    return remainder
+
+
+def write_segment(path: str, columns: Dict[str, np.ndarray], compress: bool = False):
+    """Write segment columns to an .npz file"""
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED,
+                         allowZip64=True) as archive:
+        for name, column in columns.items():
+            with archive.open(name + ".npy", "w", force_zip64=True) as member:
+                np.lib.format.write_array(member, np.asanyarray(column), allow_pickle=False)
+
+
+def read_segment(path: str) -> Dict[str, np.ndarray]:
+    """Read every column of a segment file"""
+    with np.load(path, allow_pickle=False) as archive:
+        return {name: archive[name] for name in archive.files}
+
+
+def write_patches(path: str, rows: Sequence[int], records: Sequence[Dict]):
+    """Write replacement records for rows as a segment file with a rows column"""
+    table = AtomTable()
+    table.extend_records(records)
+    columns = table.segment(0, len(table))
+    columns["rows"] = np.array(rows, dtype=np.int64)
+    write_segment(path, columns)
+
+
+def read_patches(path: str) -> List[tuple]:
+    """(row, record) pairs from a patch file"""
+    columns = read_segment(path)
+    rows = columns.pop("rows").tolist()
+    table = AtomTable()
+    table.extend(columns)
+    return list(zip(rows, table.records(0, len(table))))
+
+
+def map_segment(path: str) -> Dict[str, np.ndarray]:
+    """Columns of a segment file as read-only memory maps (the OS pages them in on access)
+
+    Members written with compression can't be mapped and are read instead.
+    """
+    columns = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            name = info.filename[:-len(".npy")]
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    columns[name] = np.lib.format.read_array(member, allow_pickle=False)
+                continue
+            # Member data starts after its local header (30 bytes + name + extra field)
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack("<HH", f.read(4))
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            if int(np.prod(shape)) == 0:
+                columns[name] = np.empty(shape, dtype=dtype)
+            else:
+                columns[name] = np.memmap(path, dtype=dtype, mode="r", offset=f.tell(), shape=shape,
+                                          order="F" if fortran_order else "C")
+    return columns
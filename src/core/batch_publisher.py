@@ -0,0 +1,118 @@
+"""Batch Publisher - Buffers Trust Atoms and publishes them as DKG collections"""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+
+
+class BatchPublisher:
+    """Collects atoms and flushes them as one Knowledge Asset collection
+
+    A flush happens when batch_size atoms are pending, or when the oldest
+    pending atom has waited flush_interval seconds. submit() returns a
+    Future that resolves to the atom's kaId once its collection is stored.
+    """
+
+    def __init__(self, publisher, batch_size: int = 100, flush_interval: float = 5.0):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.publisher = publisher
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.collections_published = 0
+        self.atoms_published = 0
+
+        # (atom, future, enqueue time), oldest first
+        self._pending: List[Tuple[object, Future, float]] = []
+        self._oldest: Optional[float] = None
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._timer = threading.Thread(target=self._run_timer, name="batch-publisher", daemon=True)
+        self._timer.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, trust_atom) -> Future:
+        """Queue an atom for the next collection"""
+        future: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BatchPublisher is closed")
+            now = time.monotonic()
+            if not self._pending:
+                self._oldest = now
+                self._cond.notify()
+            self._pending.append((trust_atom, future, now))
+            full = len(self._pending) >= self.batch_size
+
+        if full:
+            self.flush()
+        return future
+
+    def flush(self) -> int:
+        """Publish everything pending now, returns the number of atoms sent"""
+        with self._flush_lock:
+            with self._cond:
+                batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+                # Atoms left over keep their place in line: the timer counts from the oldest one
+                self._oldest = self._pending[0][2] if self._pending else None
+            if not batch:
+                return 0
+
+            try:
+                results = self.publisher.publish_collection([atom for atom, _, _ in batch])
+            except Exception as error:
+                for _, future, _ in batch:
+                    future.set_exception(error)
+                return 0
+
+            for (_, future, _), result in zip(batch, results):
+                if result["success"]:
+                    future.set_result(result["kaId"])
+                else:
+                    future.set_exception(ValueError(result["error"]))
+
+            self.collections_published += 1
+            self.atoms_published += len(batch)
+            return len(batch)
+
+    def close(self):
+        """Flush remaining atoms and stop the timer thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._timer.join()
+        while self.flush():
+            pass
+
+    def get_stats(self) -> dict:
+        with self._cond:
+            pending = len(self._pending)
+        return {
+            "pending": pending,
+            "collectionsPublished": self.collections_published,
+            "atomsPublished": self.atoms_published,
+            "batchSize": self.batch_size,
+            "flushInterval": self.flush_interval
+        }
+
+    def _run_timer(self):
+        """Flush when the oldest pending atom has waited flush_interval seconds"""
+        while True:
+            with self._cond:
+                while not self._closed and self._oldest is None:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                wait = self._oldest + self.flush_interval - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+            self.flush()
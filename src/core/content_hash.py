@@ -0,0 +1,54 @@
+"""Content Hashing - Deterministic content-addressed IDs for Trust Atoms"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Sequence
+
+
+# Fields that change between otherwise identical atoms (issue time) or are derived
+VOLATILE_FIELDS = frozenset({"issued", "overall"})
+
+# Below this many payloads thread dispatch costs more than it saves
+PARALLEL_THRESHOLD = 2048
+
+
+def canonical_atom_bytes(atom_jsonld: Dict) -> bytes:
+    """Canonical encoding of an atom's JSON-LD, without volatile fields"""
+    stable = {k: v for k, v in atom_jsonld.items() if k not in VOLATILE_FIELDS}
+    return json.dumps(stable, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def content_id(payload: bytes) -> str:
+    """sha256 hex digest of a canonical payload"""
+    return hashlib.sha256(payload).hexdigest()
+
+
+def atom_content_id(atom_jsonld: Dict) -> str:
+    """Content ID of an atom's JSON-LD"""
+    return content_id(canonical_atom_bytes(atom_jsonld))
+
+
+def local_ka_id(cid: str) -> str:
+    """Local Knowledge Asset ID derived from a content ID"""
+    return f"local:{cid[:16]}"
+
+
+def content_ids(payloads: Sequence[bytes], workers: int = 0) -> List[str]:
+    """Hash many payloads, in a thread pool for large batches (hashlib releases the GIL)"""
+    if len(payloads) < PARALLEL_THRESHOLD or workers == 1:
+        return [content_id(p) for p in payloads]
+
+    workers = workers or min(8, os.cpu_count() or 1)
+    chunk = (len(payloads) + workers - 1) // workers
+    chunks = [payloads[i:i + chunk] for i in range(0, len(payloads), chunk)]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        hashed = pool.map(lambda part: [content_id(p) for p in part], chunks)
+    return [cid for part in hashed for cid in part]
+
+
+def atom_content_ids(atoms_jsonld: Sequence[Dict], workers: int = 0) -> List[str]:
+    """Content IDs for a batch of atom JSON-LD documents"""
+    return content_ids([canonical_atom_bytes(a) for a in atoms_jsonld], workers)
@@ -0,0 +1,319 @@
+"""Delta Sync - Reconcile local atom stores by exchanging only the atoms one side lacks
+
+Each store keeps a RangeHashIndex: for every hex prefix of the content IDs
+(down to index depth) the count and the sum of the IDs under it. Two stores
+compare root summaries, then descend only into prefixes whose summaries
+differ, one round trip per level, so the work grows with the size of the
+difference rather than with the stores. Peers that have synced before skip
+the walk entirely and pull by sequence number (a record's position in the
+append-only store).
+"""
+
+import hashlib
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .content_hash import atom_content_id
+from .trust_atom import TrustAtomV7
+
+HEX_DIGITS = "0123456789abcdef"
+
+_MOD = 1 << 256
+
+_SHA256_HEX = re.compile(r"^[0-9a-f]{64}$")
+
+# (atom count, hex digest) for one prefix
+Summary = Tuple[int, str]
+
+# Decides whether a verified incoming atom may be stored: admit(atom, record) -> bool
+Admit = Callable[[TrustAtomV7, Dict], bool]
+
+
+def index_key(cid: str) -> str:
+    """Where a content ID sits in the index: itself for sha256 hex IDs, else its sha256
+
+    Legacy IDs (anything but 64 lowercase hex digits) are placed by their
+    hash, so they sync like any other ID instead of breaking the sums.
+    """
+    return cid if _SHA256_HEX.match(cid) else hashlib.sha256(cid.encode()).hexdigest()
+
+
+class RangeHashIndex:
+    """Incremental per-prefix (count, sum) summaries over content IDs (see index_key)"""
+
+    def __init__(self, depth: int = 4):
+        self.depth = depth
+        self._nodes: Dict[str, List[int]] = {}
+        self._leaves: Dict[str, set] = {}
+
+    def __len__(self) -> int:
+        node = self._nodes.get("")
+        return node[0] if node else 0
+
+    def __contains__(self, cid: str) -> bool:
+        return cid in self._leaves.get(index_key(cid)[:self.depth], ())
+
+    def add(self, cid: str) -> bool:
+        """Index a content ID (False if it was already indexed)"""
+        key = index_key(cid)
+        leaf = self._leaves.setdefault(key[:self.depth], set())
+        if cid in leaf:
+            return False
+        leaf.add(cid)
+        value = int(key, 16)
+        for length in range(self.depth + 1):
+            node = self._nodes.get(key[:length])
+            if node is None:
+                self._nodes[key[:length]] = [1, value]
+            else:
+                node[0] += 1
+                node[1] = (node[1] + value) % _MOD
+        return True
+
+    def summary(self, prefix: str = "") -> Summary:
+        if len(prefix) <= self.depth:
+            count, total = self._nodes.get(prefix, (0, 0))
+        else:
+            ids = self.ids(prefix)
+            count, total = len(ids), sum(int(index_key(cid), 16) for cid in ids) % _MOD
+        return count, f"{total:064x}"
+
+    def children(self, prefix: str) -> Dict[str, Summary]:
+        """Summaries of the non-empty one-digit extensions of prefix"""
+        if len(prefix) < self.depth:
+            result = {}
+            for digit in HEX_DIGITS:
+                node = self._nodes.get(prefix + digit)
+                if node is not None:
+                    result[prefix + digit] = (node[0], f"{node[1]:064x}")
+            return result
+
+        totals: Dict[str, List[int]] = {}
+        for cid in self.ids(prefix):
+            key = index_key(cid)
+            child = key[:len(prefix) + 1]
+            if len(child) > len(prefix):
+                node = totals.setdefault(child, [0, 0])
+                node[0] += 1
+                node[1] = (node[1] + int(key, 16)) % _MOD
+        return {child: (count, f"{total:064x}") for child, (count, total) in totals.items()}
+
+    def ids(self, prefix: str) -> List[str]:
+        """Content IDs whose index key starts with prefix (sorted)"""
+        if len(prefix) >= self.depth:
+            return sorted(cid for cid in self._leaves.get(prefix[:self.depth], ()) if index_key(cid).startswith(prefix))
+        return sorted(
+            cid
+            for leaf, members in self._leaves.items() if leaf.startswith(prefix)
+            for cid in members
+        )
+
+
+class StoreReplica:
+    """The sync protocol served by one local store (in-process peer, or behind HTTP)
+
+    add_record is called with each new record; it defaults to store.append
+    but the publisher passes its own hook so caches see the new atoms.
+    admit, if given, can refuse verified incoming atoms (e.g. the anomaly screen).
+    """
+
+    def __init__(self, store, add_record=None, admit: Optional[Admit] = None):
+        self.store = store
+        self.add_record = add_record or store.append
+        self.admit = admit
+        self.rejected = 0
+
+    def info(self) -> Dict:
+        with self.store.lock:
+            count, digest = self.store.range_index.summary("")
+            return {"storeId": self.store.store_id, "seq": len(self.store), "count": count, "digest": digest}
+
+    def children(self, prefixes: Sequence[str]) -> Dict[str, Dict[str, Summary]]:
+        with self.store.lock:
+            return {prefix: self.store.range_index.children(prefix) for prefix in prefixes}
+
+    def ids(self, prefixes: Sequence[str]) -> Dict[str, List[str]]:
+        with self.store.lock:
+            return {prefix: self.store.range_index.ids(prefix) for prefix in prefixes}
+
+    def records(self, content_ids: Sequence[str]) -> List[Dict]:
+        found = (self.store.get_by_content_id(cid) for cid in content_ids)
+        return [record for record in found if record is not None]
+
+    def changes(self, since: int, limit: int = 1000) -> Dict:
+        """Records appended after sequence number since"""
+        records = self.store.atoms[since:since + limit]
+        return {"records": records, "next": since + len(records), "seq": len(self.store)}
+
+    def accept(self, records: Iterable[Dict], admit: Optional[Admit] = None) -> int:
+        """Store records whose content this store doesn't have yet
+
+        Records are taken on their content, not the peer's word: the contentId
+        must be the hash of the trustAtom and the atom must be valid. admit
+        (for this call) and then self.admit can refuse the rest; refused and
+        invalid records are counted in rejected.
+        """
+        accepted = 0
+        for record in records:
+            atom = _verified_atom(record)
+            if atom is None:
+                self.rejected += 1
+                continue
+            if record["contentId"] in self.store:
+                continue
+            if (admit is not None and not admit(atom, record)) or (self.admit is not None and not self.admit(atom, record)):
+                self.rejected += 1
+                continue
+            self.add_record(dict(record))
+            accepted += 1
+        return accepted
+
+
+def _verified_atom(record) -> Optional[TrustAtomV7]:
+    """The record's Trust Atom if its contentId matches its content and it is valid"""
+    jsonld = record.get("trustAtom") if isinstance(record, dict) else None
+    if not isinstance(jsonld, dict):
+        return None
+    try:
+        if record.get("contentId") != atom_content_id(jsonld):
+            return None
+        atom = TrustAtomV7.from_jsonld(jsonld)
+    except (KeyError, TypeError, ValueError):
+        return None
+    return atom if atom.is_valid() else None
+
+
+def diff_replicas(local: StoreReplica, remote, leaf_size: int = 64) -> Dict:
+    """Content IDs each side is missing, found by walking differing prefixes
+
+    remote is anything with the StoreReplica interface (e.g. HTTPSyncPeer).
+    """
+    index = local.store.range_index
+    missing_local: List[str] = []
+    missing_remote: List[str] = []
+    round_trips = 1
+
+    info = remote.info()
+    if (info["count"], info["digest"]) == index.summary(""):
+        return {"missingLocal": [], "missingRemote": [], "roundTrips": round_trips}
+
+    frontier = [""]
+    while frontier:
+        remote_children = remote.children(frontier)
+        round_trips += 1
+        descend, leaves = [], []
+        for prefix in frontier:
+            ours, theirs = index.children(prefix), remote_children.get(prefix, {})
+            for child in sorted(set(ours) | set(theirs)):
+                mine, other = ours.get(child), theirs.get(child)
+                if mine is not None and other is not None and tuple(mine) == tuple(other):
+                    continue
+                if other is None:
+                    missing_remote.extend(index.ids(child))
+                elif mine is None or min(mine[0], other[0]) <= leaf_size or len(child) >= 64:
+                    leaves.append(child)
+                else:
+                    descend.append(child)
+
+        if leaves:
+            remote_ids = remote.ids(leaves)
+            round_trips += 1
+            for prefix in leaves:
+                ours, theirs = set(index.ids(prefix)), set(remote_ids.get(prefix, ()))
+                missing_local.extend(sorted(theirs - ours))
+                missing_remote.extend(sorted(ours - theirs))
+        frontier = descend
+
+    return {"missingLocal": missing_local, "missingRemote": missing_remote, "roundTrips": round_trips}
+
+
+class DeltaSync:
+    """Two-way sync of a local store with peers, remembering each peer's sequence cursor"""
+
+    def __init__(self, local: StoreReplica, batch_size: int = 500, leaf_size: int = 64):
+        self.local = local
+        self.batch_size = batch_size
+        self.leaf_size = leaf_size
+        # peer storeId -> (their seq we've pulled up to, our seq they've been sent up to)
+        self.cursors: Dict[str, Tuple[int, int]] = {}
+
+    def sync(self, remote, push: bool = True) -> Dict:
+        """Pull atoms we lack from remote (and push ours), returns what moved"""
+        info = remote.info()
+        pulled = pushed = 0
+        round_trips = 1
+        their_seq, our_seq = self.cursors.get(info["storeId"], (None, None))
+
+        if their_seq is not None and their_seq <= info["seq"]:
+            # Known peer: just the records appended on either side since last time
+            mine = self.local.store.atoms[our_seq:]
+            while their_seq < info["seq"]:
+                page = remote.changes(their_seq, self.batch_size)
+                round_trips += 1
+                if not page["records"]:
+                    break
+                pulled += self.local.accept(page["records"])
+                their_seq = page["next"]
+            if push:
+                for start in range(0, len(mine), self.batch_size):
+                    pushed += remote.accept(mine[start:start + self.batch_size])
+                    round_trips += 1
+            mode = "sequence"
+        else:
+            mode = "merkle"
+
+        # Cursor shortcuts miss atoms that only reached one side indirectly - verify the roots
+        diff = diff_replicas(self.local, remote, self.leaf_size)
+        round_trips += diff["roundTrips"]
+        if diff["missingLocal"] or (push and diff["missingRemote"]):
+            if mode == "sequence":
+                mode = "sequence+merkle"
+            for start in range(0, len(diff["missingLocal"]), self.batch_size):
+                pulled += self.local.accept(remote.records(diff["missingLocal"][start:start + self.batch_size]))
+                round_trips += 1
+            if push:
+                for start in range(0, len(diff["missingRemote"]), self.batch_size):
+                    pushed += remote.accept(self.local.records(diff["missingRemote"][start:start + self.batch_size]))
+                    round_trips += 1
+
+        after = remote.info()
+        round_trips += 1
+        self.cursors[after["storeId"]] = (after["seq"], len(self.local.store))
+        return {"mode": mode, "pulled": pulled, "pushed": pushed, "roundTrips": round_trips}
+
+
+class HTTPSyncPeer:
+    """StoreReplica interface over a remote MCP server's /sync endpoints"""
+
+    def __init__(self, base_url: str, session=None, timeout: float = 30.0, secret: Optional[str] = None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        if session is None:
+            import requests
+            session = requests.Session()
+        if secret:
+            session.headers["X-Sync-Secret"] = secret
+        self.session = session
+
+    def _post(self, path: str, body: Optional[Dict] = None):
+        response = self.session.post(f"{self.base_url}/sync/{path}", json=body or {}, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def info(self) -> Dict:
+        return self._post("info")
+
+    def children(self, prefixes: Sequence[str]) -> Dict[str, Dict[str, Summary]]:
+        return self._post("children", {"prefixes": list(prefixes)})
+
+    def ids(self, prefixes: Sequence[str]) -> Dict[str, List[str]]:
+        return self._post("ids", {"prefixes": list(prefixes)})
+
+    def records(self, content_ids: Sequence[str]) -> List[Dict]:
+        return self._post("records", {"contentIds": list(content_ids)})["records"]
+
+    def changes(self, since: int, limit: int = 1000) -> Dict:
+        return self._post("changes", {"since": since, "limit": limit})
+
+    def accept(self, records: Iterable[Dict]) -> int:
+        return self._post("accept", {"records": list(records)})["accepted"]
@@ -0,0 +1,193 @@
+"""DKG Client Manager - One pooled DKG client per process"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+DEFAULT_NODE_URL = "http://v8-testnet-node.origintrail.io:8900"
+DEFAULT_BLOCKCHAIN_ID = "otp:20430"
+
+
+def _node_url_from_env() -> str:
+    # PUBLIC TESTNET NODE by default; prefer env overrides
+    env_host = os.getenv("DKG_NODE_HOSTNAME")
+    env_port = os.getenv("DKG_NODE_PORT")
+    return env_host or (f"http://localhost:{env_port}" if env_port else DEFAULT_NODE_URL)
+
+
+def _pooled_node_provider(node_url: str, session):
+    """NodeHTTPProvider that sends every request through a shared keep-alive session"""
+    from dkg.dataclasses import HTTPRequestMethod, NodeResponseDict
+    from dkg.exceptions import HTTPRequestMethodNotSupported, NodeRequestError
+    from dkg.providers import NodeHTTPProvider
+    from requests.exceptions import RequestException
+
+    class PooledNodeHTTPProvider(NodeHTTPProvider):
+        def make_request(self, method, path, params={}, data={}):
+            url = f"{self.url}/{path}"
+            try:
+                if method == HTTPRequestMethod.GET:
+                    response = session.get(url, params=params, headers=self.headers)
+                elif method == HTTPRequestMethod.POST:
+                    response = session.post(url, json=data, headers=self.headers)
+                else:
+                    raise HTTPRequestMethodNotSupported(f"{method.name} method isn't supported")
+                response.raise_for_status()
+                try:
+                    return NodeResponseDict(response.json())
+                except ValueError as err:
+                    raise NodeRequestError(f"JSON decoding failed: {err}")
+            except RequestException as err:
+                raise NodeRequestError(f"Request failed: {err}")
+
+    return PooledNodeHTTPProvider(endpoint_uri=node_url, api_version="v1")
+
+
+class DKGClientManager:
+    """Builds the DKG client once and shares it, its HTTP pool and node info
+
+    Node HTTP calls go through one requests.Session (keep-alive, pool of
+    pool_size connections), the blockchain provider is created once, and
+    the node `info` response is cached for info_ttl seconds so health
+    checks don't add a round trip to every publish or query.
+    """
+
+    def __init__(
+        self,
+        node_url: Optional[str] = None,
+        blockchain_id: Optional[str] = None,
+        pool_size: int = 10,
+        info_ttl: float = 60.0,
+        client_factory: Optional[Callable[[], object]] = None
+    ):
+        self.node_url = node_url or _node_url_from_env()
+        self.blockchain_id = blockchain_id or os.getenv("DKG_BLOCKCHAIN_ID", DEFAULT_BLOCKCHAIN_ID)
+        self.pool_size = pool_size
+        self.info_ttl = info_ttl
+        self._client_factory = client_factory or self._build_sdk_client
+
+        self._client = None
+        self._session = None
+        self._lock = threading.Lock()
+        self._info: Optional[Dict] = None
+        self._info_at = 0.0
+        self._healthy: Optional[bool] = None
+        self._last_error: Optional[str] = None
+        self._last_latency_ms: Optional[float] = None
+        self.clients_built = 0
+
+    def client(self):
+        """Shared DKG client (built on first call, thread-safe)"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._client_factory()
+                    self.clients_built += 1
+        return self._client
+
+    def session(self):
+        """Shared keep-alive HTTP session with a connection pool"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
+    def node_info(self, refresh: bool = False) -> Dict:
+        """Node `info` response, cached for info_ttl seconds"""
+        now = time.monotonic()
+        if refresh or self._info is None or now - self._info_at > self.info_ttl:
+            start = time.perf_counter()
+            try:
+                info = self.client().node.info()
+            except Exception as error:
+                self._healthy = False
+                self._last_error = str(error)
+                raise
+            self._last_latency_ms = (time.perf_counter() - start) * 1000
+            self._info, self._info_at = info, now
+            self._healthy, self._last_error = True, None
+        return self._info
+
+    def health_check(self, max_age: Optional[float] = None) -> bool:
+        """Whether the node answered `info` within the last max_age seconds (probes if stale)"""
+        max_age = self.info_ttl if max_age is None else max_age
+        if self._healthy and time.monotonic() - self._info_at <= max_age:
+            return True
+        try:
+            self.node_info(refresh=True)
+            return True
+        except Exception:
+            return False
+
+    def get_stats(self) -> Dict:
+        """Cached health state; never touches the network"""
+        return {
+            "nodeUrl": self.node_url,
+            "blockchainId": self.blockchain_id,
+            "poolSize": self.pool_size,
+            "clientBuilt": self._client is not None,
+            "healthy": self._healthy,
+            "lastError": self._last_error,
+            "lastInfoLatencyMs": self._last_latency_ms,
+            "infoAgeSeconds": round(time.monotonic() - self._info_at, 1) if self._info is not None else None
+        }
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+            self._client = None
+            self._info = None
+            self._healthy = None
+
+    def _build_sdk_client(self):
+        """Build the DKG v8 SDK client with pooled node HTTP and one blockchain provider"""
+        from dkg import DKG
+        from dkg.providers import BlockchainProvider
+
+        print("🔧 Initializing DKG v8 SDK...")
+        print(f"   Node: {self.node_url}")
+        print(f"   Blockchain: {self.blockchain_id}")
+
+        node_provider = _pooled_node_provider(self.node_url, self.session())
+        # blockchain_id is the ONLY required parameter; SDK loads PRIVATE_KEY from .env
+        blockchain_provider = BlockchainProvider(blockchain_id=self.blockchain_id)
+
+        client = DKG(node_provider=node_provider, blockchain_provider=blockchain_provider)
+        print("✅ DKG SDK initialized - REAL publishing enabled")
+        return client
+
+
+_manager: Optional[DKGClientManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_client_manager() -> DKGClientManager:
+    """Process-wide DKGClientManager configured from the environment"""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = DKGClientManager(
+                    pool_size=int(os.getenv("DKG_HTTP_POOL_SIZE", "10")),
+                    info_ttl=float(os.getenv("DKG_NODE_INFO_TTL", "60"))
+                )
+    return _manager
+
+
+def set_client_manager(manager: Optional[DKGClientManager]):
+    """Replace (or clear) the process-wide manager, e.g. in tests"""
+    global _manager
+    with _manager_lock:
+        if _manager is not None and _manager is not manager:
+            _manager.close()
+        _manager = manager
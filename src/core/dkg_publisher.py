@@ -1,18 +1,87 @@
 """DKG Publisher - WORKING v8.1.0 for Hackathon"""
 
+import math
 import os
-import json
-from typing import List, Dict
+from bisect import bisect_right
+import numpy as np
+from typing import List, Dict, Optional, Sequence
 from datetime import datetime
-from dotenv import load_dotenv
+from .atom_store import AtomStore
+from .content_hash import atom_content_id, atom_content_ids, local_ka_id
+from .outbox import PublishOutbox, OutboxDrainer
+from .trust_atom import TrustAtomV7
+from .dkg_client import DKGClientManager, get_client_manager
+from .dkg_query import target_atoms_query, rows_to_results
+from .query_cache import ReadThroughCache
+from .anomaly import AnomalyDetector, AnomalyRejected
+from .delta_sync import DeltaSync, StoreReplica
+from .single_flight import SingleFlight
+from .tiered_store import TieredAtomStore
 
-load_dotenv()
+# Options passed to every dkg.asset.create call
+DKG_PUBLISH_OPTIONS = {
+    "epochs_num": 2,
+    "minimum_number_of_finalization_confirmations": 3,
+    "minimum_number_of_node_replications": 1
+}
+
+# Atom listing result fields and the store fields they are read from
+ATOM_RESULT_FIELDS = {
+    "atom": "kaId",
+    "contentId": "contentId",
+    "issuer": "issuer",
+    "target": "target",
+    "overall": "overall",
+    "content": "content",
+    "mode": "mode",
+    "timestamp": "timestamp",
+    "issued": "issued"
+}
+TARGET_ATOM_FIELDS = ("atom", "issuer", "overall", "content")
+ISSUER_ATOM_FIELDS = ("atom", "target", "overall", "content")
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Best atoms included with an aggregate reputation
+REPUTATION_TOP_ATOMS = 10
+
+_env_loaded = False
+
+
+def reputation_confidence(atom_count: int) -> float:
+    """Confidence increases with more atoms (logarithmic, 1.0 at 99+ atoms)"""
+    return min(1.0, math.log10(atom_count + 1) / 2)
+
+
+def _load_env():
+    """Load .env once per process (deferred so importing this module stays cheap)"""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
 
 
 class DKGPublisher:
-    """Publishes Trust Atoms to OriginTrail DKG v8 Testnet"""
+    """Publishes Trust Atoms to OriginTrail DKG v8 Testnet
     
-    def __init__(self):
+    The DKG SDK (and its web3 stack) is only imported on the first real
+    DKG call, and the local store is only read on first access.
+    """
+    
+    def __init__(
+        self,
+        storage_file: str = "local_atoms.json",
+        dkg=None,
+        outbox_file: Optional[str] = None,
+        client_manager: Optional[DKGClientManager] = None,
+        query_cache_ttl: float = 30.0,
+        negative_cache_ttl: float = 5.0,
+        coalesce_reputation: bool = True,
+        anomaly_detector: Optional[AnomalyDetector] = None,
+        hot_atoms: Optional[int] = None
+    ):
+        _load_env()
+        
         # Check if DKG credentials are configured
         private_key = os.getenv("WALLET_PRIVATE_KEY") or os.getenv("PRIVATE_KEY")
         # Ensure SDK-compatible env var is present
@@ -22,206 +91,740 @@ class DKGPublisher:
         if public_key and not os.getenv("PUBLIC_KEY"):
             os.environ["PUBLIC_KEY"] = public_key
         
-        if private_key:
-            try:
-                from dkg import DKG
-                from dkg.providers import NodeHTTPProvider, BlockchainProvider
-                
-                # PUBLIC TESTNET NODE by default; prefer env overrides
-                env_host = os.getenv("DKG_NODE_HOSTNAME")
-                env_port = os.getenv("DKG_NODE_PORT")
-                node_url = env_host or (f"http://localhost:{env_port}" if env_port else "http://v8-testnet-node.origintrail.io:8900")
-
-                print("🔧 Initializing DKG v8 SDK...")
-                print(f"   Node: {node_url}")
-                print(f"   Blockchain: {os.getenv('DKG_BLOCKCHAIN_ID', 'otp:20430')}")
-                
-                # Create providers - blockchain_id is the ONLY required parameter
-                node_provider = NodeHTTPProvider(endpoint_uri=node_url, api_version="v1")
-                blockchain_provider = BlockchainProvider(
-                    blockchain_id=os.getenv("DKG_BLOCKCHAIN_ID", "otp:20430")  # NeuroWeb testnet - environment is auto-derived
-                )
-                
-                # SDK will automatically load PRIVATE_KEY from .env
-                # No need to call set_account manually
-                
-                # Initialize DKG
-                self.dkg = DKG(
-                    node_provider=node_provider,
-                    blockchain_provider=blockchain_provider
-                )
-                
-                self.dkg_configured = True
-                print("✅ DKG SDK initialized - REAL publishing enabled")
-                
-            except Exception as e:
-                print(f"⚠️  DKG SDK error: {e}")
-                print("   Falling back to local storage mode")
-                self.dkg_configured = False
+        # Injected client (e.g. FakeDKG for tests and offline demos), otherwise the
+        # process-wide pooled client from the DKGClientManager, built on first use
+        self._dkg = dkg
+        self._client_manager = client_manager
+        if dkg is not None or client_manager is not None or private_key:
+            self.dkg_configured = True
         else:
             print("⚠️  WALLET_PRIVATE_KEY not configured")
             print("   Using local storage mode")
             self.dkg_configured = False
         
-        self.published_atoms = []
-        self.local_storage_file = "local_atoms.json"
+        self.local_storage_file = storage_file
+        self._store: Optional[AtomStore] = None
+        # With hot_atoms (and a segment directory as storage) atom bodies stay on disk
+        if hot_atoms and storage_file.endswith(".json"):
+            raise ValueError(f"hot_atoms needs a segment directory as storage, not a .json file: {storage_file}")
+        self.hot_atoms = hot_atoms
         
-        # Load existing local atoms
-        if os.path.exists(self.local_storage_file):
-            try:
-                with open(self.local_storage_file, 'r') as f:
-                    data = json.load(f)
-                    self.published_atoms = data.get("atoms", [])
-                print(f"📂 Loaded {len(self.published_atoms)} existing atoms from local storage")
-            except:
-                pass
-    
-    def publish_trust_atom(self, trust_atom) -> str:
-        """Publish single Trust Atom to DKG or local storage"""
+        # DKG reads go through a read-through cache; concurrent misses share one upstream query
+        self.query_cache = ReadThroughCache(
+            self._query_dkg_and_local,
+            ttl=query_cache_ttl,
+            negative_ttl=negative_cache_ttl
+        )
+        
+        # Concurrent reputation lookups for the same target share one aggregation
+        self.reputation_flight = SingleFlight() if coalesce_reputation else None
+        
+        # Optional write-ahead outbox: failed DKG publishes are retried instead of staying local
+        self.outbox: Optional[PublishOutbox] = None
+        self._drainer: Optional[OutboxDrainer] = None
+        
+        # Background PageRank scores, started on demand (start_rank_refresher)
+        self.rank_refresher = None
+        
+        self._delta_sync: Optional[DeltaSync] = None
+        
+        # Streaming burst detection on new atoms; may throttle or quarantine them
+        self.anomaly_detector = anomaly_detector
+        if outbox_file:
+            self.open_outbox(outbox_file)
+    
+    def open_outbox(self, outbox_file: str) -> PublishOutbox:
+        """Log DKG publishes to a write-ahead outbox (recovering the pending ones it holds)"""
+        if self.outbox is None:
+            self.outbox = PublishOutbox(outbox_file)
+            if len(self.outbox):
+                print(f"📬 Recovered {len(self.outbox)} pending publishes from outbox")
+        return self.outbox
+    
+    @property
+    def client_manager(self) -> Optional[DKGClientManager]:
+        """Shared client manager (None when a client was injected)"""
+        if self._client_manager is None and self._dkg is None:
+            self._client_manager = get_client_manager()
+        return self._client_manager
+    
+    @property
+    def dkg(self):
+        """DKG client, initializing the shared SDK client on first use"""
+        if self._dkg is not None:
+            return self._dkg
+        if not self.dkg_configured:
+            raise RuntimeError("DKG not configured - using local storage mode")
+        try:
+            return self.client_manager.client()
+        except Exception as e:
+            print(f"⚠️  DKG SDK error: {e}")
+            print("   Falling back to local storage mode")
+            self.dkg_configured = False
+            raise
+    
+    @property
+    def store(self) -> AtomStore:
+        """Local atom store, loaded from disk on first access"""
+        if self._store is None:
+            if self.hot_atoms:
+                self._store = TieredAtomStore(self.local_storage_file, hot_records=self.hot_atoms)
+            else:
+                self._store = AtomStore(self.local_storage_file)
+            
+            # Load existing local atoms
+            if os.path.exists(self.local_storage_file):
+                try:
+                    self._store.load()
+                    print(f"📂 Loaded {len(self._store)} existing atoms from local storage")
+                except:
+                    pass
+        return self._store
+    
+    @property
+    def published_atoms(self) -> List[Dict]:
+        """All published atom records (oldest first)"""
+        return self.store.atoms
+    
+    def publish_trust_atom(self, trust_atom, content_id: Optional[str] = None, screen: bool = True) -> str:
+        """Publish single Trust Atom to DKG or local storage
+        
+        Raises AnomalyRejected if the anomaly detector throttles or
+        quarantines the atom (screen=False skips the detector).
+        """
         if not trust_atom.is_valid():
             raise ValueError("Invalid Trust Atom - cannot publish")
         
+        jsonld = trust_atom.to_jsonld()
+        content_id = content_id or atom_content_id(jsonld)
+        
+        # Identical atom already stored - don't pay for it twice
+        existing = self.store.get_by_content_id(content_id)
+        if existing is not None:
+            print(f"⏭️  Duplicate atom, already stored as {existing['kaId']}")
+            return existing["kaId"]
+        
+        if screen:
+            self.screen_atom(trust_atom, jsonld, content_id)
+        
         asset = trust_atom.to_dkg_asset()
         
         print(f"Publishing: {trust_atom.issuer[:20]}... → {trust_atom.target[:20]}...")
         
         if self.dkg_configured:
-            # REAL DKG v8 publishing
+            # REAL DKG v8 publishing (logged to the outbox first so a crash can't lose it)
+            if self.outbox is not None:
+                self.outbox.enqueue(content_id, jsonld)
+                self.outbox.mark_in_flight(content_id)
             try:
                 # Publish to DKG testnet - correct format per SDK docs
                 result = self.dkg.asset.create(
                     content=asset,  # Contains both 'public' and 'private' keys
-                    options={
-                        "epochs_num": 2,
-                        "minimum_number_of_finalization_confirmations": 3,
-                        "minimum_number_of_node_replications": 1
-                    }
+                    options=DKG_PUBLISH_OPTIONS
                 )
                 
                 # Get UAL from result
                 ual = result.get("UAL") or result.get("assertionId")
                 print(f"✅ REAL DKG PUBLISH SUCCESS! UAL: {ual}")
                 
-                self.published_atoms.append({
+                self._store_record({
                     "kaId": ual,
-                    "trustAtom": trust_atom.to_jsonld(),
+                    "contentId": content_id,
+                    "trustAtom": jsonld,
                     "timestamp": datetime.utcnow().isoformat(),
                     "mode": "DKG_TESTNET"
                 })
+                self._save_local_atoms()
+                if self.outbox is not None:
+                    self.outbox.mark_confirmed(content_id, ual)
                 
                 return ual
                 
             except Exception as error:
                 print(f"❌ DKG publish failed: {error}")
                 print("   Falling back to local storage")
-                return self._publish_local(trust_atom, asset)
+                local_id = self._publish_local(jsonld, content_id)
+                if self.outbox is not None:
+                    self.outbox.mark_failed(content_id, str(error))
+                    print("   Queued in outbox for retry")
+                return local_id
         else:
             # Local storage mode
-            return self._publish_local(trust_atom, asset)
+            return self._publish_local(jsonld, content_id)
+    
+    def screen_atom(self, trust_atom, jsonld: Dict, content_id: str):
+        """Count a new atom in the anomaly detector; raises AnomalyRejected unless it may be stored"""
+        if self.anomaly_detector is None:
+            return
+        verdict = self.anomaly_detector.observe(trust_atom.issuer, trust_atom.target)
+        if not verdict["anomalous"]:
+            return
+        print(f"🚨 Anomalous atom {trust_atom.issuer[:20]}... → {trust_atom.target[:20]}...: {', '.join(verdict['reasons'])}")
+        if verdict["action"] == "quarantine" and not self.anomaly_detector.hold(content_id, jsonld, verdict):
+            # Nowhere to hold it for review: refuse it like a throttled atom
+            verdict = dict(verdict, action="throttle", quarantineFull=True)
+        if verdict["action"] in ("throttle", "quarantine"):
+            raise AnomalyRejected(verdict, self.anomaly_detector.retry_after(), content_id)
+    
+    def release_quarantined(self, content_id: str) -> Optional[str]:
+        """Publish an atom held in quarantine after review, returns its KA ID"""
+        if self.anomaly_detector is None:
+            return None
+        entry = self.anomaly_detector.quarantine.get(content_id)
+        if entry is None:
+            return None
+        # Stored first, released after: a crash in between leaves it held, not lost
+        ka_id = self.publish_trust_atom(TrustAtomV7.from_jsonld(entry["atom"]), content_id, screen=False)
+        self.anomaly_detector.release(content_id)
+        return ka_id
+    
+    def discard_quarantined(self, content_id: str) -> bool:
+        """Drop an atom held in quarantine after review"""
+        if self.anomaly_detector is None:
+            return False
+        return self.anomaly_detector.release(content_id) is not None
     
-    def _publish_local(self, trust_atom, asset) -> str:
+    def _publish_local(self, jsonld: Dict, content_id: str, save: bool = True) -> str:
         """Publish to local storage (fallback)"""
-        import hashlib
-        
-        # Generate local ID
-        content = json.dumps(asset, sort_keys=True)
-        local_id = f"local:{hashlib.sha256(content.encode()).hexdigest()[:16]}"
+        # Local ID is content-addressed, so identical atoms always map to the same ID
+        local_id = local_ka_id(content_id)
         
         print(f"💾 Saved locally: {local_id}")
         
-        self.published_atoms.append({
+        self._store_record({
             "kaId": local_id,
-            "trustAtom": trust_atom.to_jsonld(),
+            "contentId": content_id,
+            "trustAtom": jsonld,
             "timestamp": datetime.utcnow().isoformat(),
             "mode": "LOCAL"
         })
         
         # Save to file
-        self._save_local_atoms()
+        if save:
+            self._save_local_atoms()
         
         return local_id
     
+    def _store_record(self, record: Dict) -> int:
+        """Append a record and drop the cached query result for its target
+        
+        If another thread stored the same atom first, its position is returned instead.
+        """
+        with self.store.lock:
+            position = self.store.position(record["contentId"]) if record.get("contentId") else None
+            if position is not None:
+                return position
+            position = self.store.append(record)
+        self.query_cache.invalidate(record["trustAtom"].get("target"))
+        if self.rank_refresher is not None:
+            self.rank_refresher.notify()
+        return position
+    
     def _save_local_atoms(self):
         """Save atoms to local JSON file"""
-        with open(self.local_storage_file, 'w') as f:
-            json.dump({
-                "total": len(self.published_atoms),
-                "atoms": self.published_atoms
-            }, f, indent=2)
-    
-    def publish_batch(self, trust_atoms: List) -> List[Dict]:
-        """Publish multiple Trust Atoms"""
+        self.store.save()
+    
+    def publish_batch(self, trust_atoms: List, collection_size: int = 0) -> List[Dict]:
+        """Publish multiple Trust Atoms (hashed in one batch, duplicates skipped)
+        
+        With collection_size > 0 atoms are packed into Knowledge Asset
+        collections of that size, one dkg.asset.create per collection.
+        """
+        if collection_size > 0:
+            results = []
+            for i in range(0, len(trust_atoms), collection_size):
+                results.extend(self.publish_collection(trust_atoms[i:i + collection_size]))
+            return results
+        
         results = []
         
-        for atom in trust_atoms:
+        jsonlds = [atom.to_jsonld() for atom in trust_atoms]
+        content_ids = atom_content_ids(jsonlds)
+        
+        seen: Dict[str, str] = {}
+        pending_save = False
+        for atom, jsonld, content_id in zip(trust_atoms, jsonlds, content_ids):
+            existing = seen.get(content_id) or self.store.get_by_content_id(content_id)
+            if existing is not None:
+                ka_id = existing if isinstance(existing, str) else existing["kaId"]
+                results.append({"success": True, "kaId": ka_id, "atom": atom, "duplicate": True})
+                continue
+            
             try:
-                ka_id = self.publish_trust_atom(atom)
+                if self.dkg_configured:
+                    ka_id = self.publish_trust_atom(atom, content_id)
+                else:
+                    # Local mode: write the file once for the whole batch
+                    if not atom.is_valid():
+                        raise ValueError("Invalid Trust Atom - cannot publish")
+                    self.screen_atom(atom, jsonld, content_id)
+                    ka_id = self._publish_local(jsonld, content_id, save=False)
+                    pending_save = True
+                seen[content_id] = ka_id
                 results.append({"success": True, "kaId": ka_id, "atom": atom})
+            except AnomalyRejected as rejected:
+                results.append({"success": False, "error": str(rejected), "atom": atom, "anomaly": rejected.verdict})
             except Exception as e:
                 results.append({"success": False, "error": str(e), "atom": atom})
         
+        if pending_save:
+            self._save_local_atoms()
+        
+        return results
+    
+    def publish_collection(self, trust_atoms: List) -> List[Dict]:
+        """Publish Trust Atoms as one Knowledge Asset collection (JSON-LD @graph)
+        
+        Each atom is recorded locally under a sub-ID "<collection UAL>#<content id>".
+        Falls back to local storage for the whole collection if the DKG call fails.
+        """
+        results: List[Optional[Dict]] = [None] * len(trust_atoms)
+        jsonlds = [atom.to_jsonld() for atom in trust_atoms]
+        content_ids = atom_content_ids(jsonlds)
+        
+        # Drop invalid atoms, duplicates (against the store and within the batch) and anomalous atoms
+        members = []
+        first_index: Dict[str, int] = {}
+        repeats = []
+        for i, (atom, content_id) in enumerate(zip(trust_atoms, content_ids)):
+            existing = self.store.get_by_content_id(content_id)
+            if existing is not None:
+                results[i] = {"success": True, "kaId": existing["kaId"], "atom": atom, "duplicate": True}
+            elif content_id in first_index:
+                repeats.append(i)
+            elif not atom.is_valid():
+                results[i] = {"success": False, "error": "Invalid Trust Atom - cannot publish", "atom": atom}
+            else:
+                try:
+                    self.screen_atom(atom, jsonlds[i], content_id)
+                except AnomalyRejected as rejected:
+                    results[i] = {"success": False, "error": str(rejected), "atom": atom, "anomaly": rejected.verdict}
+                    continue
+                first_index[content_id] = i
+                members.append(i)
+        
+        if members:
+            ka_ids = self._publish_collection_members(
+                [trust_atoms[i] for i in members],
+                [jsonlds[i] for i in members],
+                [content_ids[i] for i in members]
+            )
+            for i, ka_id in zip(members, ka_ids):
+                results[i] = {"success": True, "kaId": ka_id, "atom": trust_atoms[i]}
+        
+        for i in repeats:
+            original = results[first_index[content_ids[i]]]
+            results[i] = {"success": True, "kaId": original["kaId"], "atom": trust_atoms[i], "duplicate": True}
+        
         return results
     
+    def _publish_collection_members(self, trust_atoms: List, jsonlds: List[Dict], content_ids: List[str]) -> List[str]:
+        """Publish unique, valid atoms as one collection, returns per-atom IDs"""
+        print(f"Publishing collection of {len(trust_atoms)} atoms...")
+        
+        if self.dkg_configured:
+            try:
+                assets = [atom.to_dkg_asset() for atom in trust_atoms]
+                collection = {
+                    "public": {
+                        "@context": "http://schema.org/",
+                        "@graph": [asset["public"] for asset in assets]
+                    },
+                    "private": {
+                        "@context": "http://schema.org/",
+                        "@graph": [asset["private"] for asset in assets]
+                    }
+                }
+                if self.outbox is not None:
+                    for jsonld, content_id in zip(jsonlds, content_ids):
+                        self.outbox.enqueue(content_id, jsonld)
+                        self.outbox.mark_in_flight(content_id)
+                
+                result = self.dkg.asset.create(content=collection, options=DKG_PUBLISH_OPTIONS)
+                
+                ual = result.get("UAL") or result.get("assertionId")
+                print(f"✅ REAL DKG COLLECTION PUBLISH SUCCESS! UAL: {ual}")
+                
+                timestamp = datetime.utcnow().isoformat()
+                ka_ids = []
+                for jsonld, content_id in zip(jsonlds, content_ids):
+                    ka_id = f"{ual}#{content_id[:16]}"
+                    self._store_record({
+                        "kaId": ka_id,
+                        "collection": ual,
+                        "contentId": content_id,
+                        "trustAtom": jsonld,
+                        "timestamp": timestamp,
+                        "mode": "DKG_TESTNET"
+                    })
+                    ka_ids.append(ka_id)
+                self._save_local_atoms()
+                if self.outbox is not None:
+                    for content_id, ka_id in zip(content_ids, ka_ids):
+                        self.outbox.mark_confirmed(content_id, ka_id)
+                return ka_ids
+            
+            except Exception as error:
+                print(f"❌ DKG collection publish failed: {error}")
+                print("   Falling back to local storage")
+                if self.outbox is not None:
+                    for content_id in content_ids:
+                        self.outbox.mark_failed(content_id, str(error))
+        
+        ka_ids = [
+            self._publish_local(jsonld, content_id, save=False)
+            for jsonld, content_id in zip(jsonlds, content_ids)
+        ]
+        self._save_local_atoms()
+        return ka_ids
+    
+    def promote_local_atoms(self) -> int:
+        """Queue every local-only atom in the outbox so the drainer publishes it to the DKG"""
+        if self.outbox is None:
+            raise RuntimeError("Outbox not enabled - pass outbox_file to DKGPublisher")
+        
+        with self.store.lock:
+            code = self.store.table.texts.codes.get("LOCAL")
+            rows = [] if code is None else np.flatnonzero(self.store.table.mode.values == code).tolist()
+            records = [self.store.table.record(row) for row in rows]
+        
+        queued = 0
+        for record in records:
+            content_id = record["contentId"]
+            if content_id not in self.outbox:
+                self.outbox.enqueue(content_id, record["trustAtom"])
+                queued += 1
+        return queued
+    
+    def start_outbox_drainer(self, interval: float = 5.0) -> OutboxDrainer:
+        """Retry queued publishes in the background while the DKG node is reachable
+        
+        Local-only atoms (stored while the DKG was down or before the outbox
+        existed) are queued first, so they reach the DKG once it is back.
+        """
+        if self.outbox is None:
+            raise RuntimeError("Outbox not enabled - pass outbox_file to DKGPublisher")
+        queued = self.promote_local_atoms()
+        if queued:
+            print(f"📬 Queued {queued} local atoms for the DKG")
+        if self._drainer is None:
+            self._drainer = OutboxDrainer(
+                self.outbox,
+                self._publish_outbox_entry,
+                is_reachable=self.is_dkg_reachable,
+                interval=interval
+            )
+        self._drainer.start()
+        return self._drainer
+    
+    def stop_outbox_drainer(self):
+        if self._drainer is not None:
+            self._drainer.stop()
+    
+    def start_rank_refresher(
+        self,
+        interval: float = 300.0,
+        refresh_after: int = 100,
+        stake_ledger=None,
+        sybil_strength: float = 0.0
+    ):
+        """Keep PageRank scores over stored atoms fresh in the background
+        
+        With a StakeLedger, issuers are weighted by their current stake and
+        slashes re-rank without rebuilding the graph. sybil_strength > 0
+        damps trust flowing out of suspected Sybil clusters.
+        """
+        from ..algorithms.rank_refresher import PageRankRefresher
+        
+        if self.rank_refresher is None:
+            self.rank_refresher = PageRankRefresher(
+                lambda: self.published_atoms,
+                interval=interval,
+                refresh_after=refresh_after,
+                stake_ledger=stake_ledger,
+                sybil_strength=sybil_strength
+            )
+        self.rank_refresher.start()
+        return self.rank_refresher
+    
+    def stop_rank_refresher(self):
+        if self.rank_refresher is not None:
+            self.rank_refresher.stop()
+    
+    def graph_score(self, target_id: str) -> Optional[float]:
+        """Precomputed PageRank score of target (None before the first refresh or if unknown)"""
+        if self.rank_refresher is None:
+            return None
+        return self.rank_refresher.score(target_id)
+    
+    @property
+    def sync_replica(self) -> StoreReplica:
+        """This publisher's store as a delta sync peer (new atoms go through _store_record)"""
+        if self._delta_sync is None:
+            self._delta_sync = DeltaSync(StoreReplica(self.store, add_record=self._store_record, admit=self._admit_synced))
+        return self._delta_sync.local
+    
+    def _admit_synced(self, atom: TrustAtomV7, record: Dict) -> bool:
+        """Anomaly screen for atoms arriving from a sync peer"""
+        try:
+            self.screen_atom(atom, record["trustAtom"], record["contentId"])
+        except AnomalyRejected:
+            return False
+        return True
+    
+    def sync_with(self, peer, push: bool = True) -> Dict:
+        """Exchange missing atoms with another store (StoreReplica or HTTPSyncPeer)"""
+        self.sync_replica
+        result = self._delta_sync.sync(peer, push=push)
+        if result["pulled"]:
+            self._save_local_atoms()
+        return result
+    
+    def is_dkg_reachable(self) -> bool:
+        """Cheap liveness probe against the DKG node (cached node info when shared)"""
+        if not self.dkg_configured:
+            return False
+        if self.client_manager is not None:
+            return self.client_manager.health_check()
+        try:
+            self.dkg.node.info()
+            return True
+        except Exception:
+            return False
+    
+    def _publish_outbox_entry(self, entry: Dict) -> str:
+        """Publish one outbox entry; promotes its local record to the DKG UAL"""
+        content_id = entry["key"]
+        record = self.store.get_by_content_id(content_id)
+        
+        # Idempotency: already confirmed before a crash, only the outbox didn't know
+        if record is not None and record.get("mode") == "DKG_TESTNET":
+            return record["kaId"]
+        
+        atom = TrustAtomV7.from_jsonld(entry["payload"])
+        result = self.dkg.asset.create(content=atom.to_dkg_asset(), options=DKG_PUBLISH_OPTIONS)
+        ual = result.get("UAL") or result.get("assertionId")
+        print(f"✅ Outbox publish promoted to DKG: {ual}")
+        
+        # Runs on the drainer thread: re-read and write under the store lock, the
+        # record may have been stored (or promoted) by a request while we published
+        with self.store.lock:
+            record = self.store.get_by_content_id(content_id)
+            if record is None:
+                self._store_record({
+                    "kaId": ual,
+                    "contentId": content_id,
+                    "trustAtom": entry["payload"],
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "mode": "DKG_TESTNET"
+                })
+            elif record.get("mode") != "DKG_TESTNET":
+                self.store.update(content_id, kaId=ual, localId=record["kaId"], mode="DKG_TESTNET")
+                self.query_cache.invalidate(record["trustAtom"].get("target"))
+            self._save_local_atoms()
+        return ual
+    
     def query_trust_atoms(self, target_id: str) -> List[Dict]:
         """Query Trust Atoms for a target"""
         if self.dkg_configured:
-            # REAL DKG query (TODO: implement when SDK supports it)
-            return self._query_local(target_id)
+            # REAL DKG query merged with local atoms, served from the read-through cache
+            try:
+                return self.query_cache.get(target_id)
+            except Exception as error:
+                print(f"⚠️  DKG query failed: {error} - answering from local storage")
+                return self._query_local(target_id)
         else:
             # Local query
             return self._query_local(target_id)
     
+    def _query_dkg_and_local(self, target_id: str) -> List[Dict]:
+        """Cache loader: atoms about target on the DKG plus local-only ones, best first"""
+        results = self._query_local(target_id)
+        
+        query = target_atoms_query(target_id)
+        if query is None:
+            return results
+        
+        # Local records win; remote rows are only added for atoms we don't hold
+        with self.store.lock:
+            known = set(self.store.table.fields(self.store.target_rows(target_id), ["contentId"])["contentId"])
+        rows = self.dkg.graph.query(query, {"repository": "dkg"})
+        for remote in rows_to_results(rows):
+            if remote["contentId"] is None or remote["contentId"] not in known:
+                known.add(remote["contentId"])
+                results.append(remote)
+        
+        return sorted(results, key=lambda x: x.get("overall", 0), reverse=True)
+    
     def _query_local(self, target_id: str) -> List[Dict]:
         """Query local storage"""
-        results = []
-        for atom_data in self.published_atoms:
-            atom = atom_data.get("trustAtom", {})
-            if atom.get("target") == target_id:
-                results.append({
-                    "atom": atom_data.get("kaId"),
-                    "issuer": atom.get("issuer"),
-                    "overall": atom.get("overall"),
-                    "content": atom.get("content")
-                })
+        rows = self.store.ranked_rows(target_id, "target", limit=self.store.atom_count(target_id, "target"))
+        return self._atom_results(rows, TARGET_ATOM_FIELDS, target=target_id)
+    
+    def query_by_issuer(self, issuer_id: str) -> List[Dict]:
+        """Query Trust Atoms published by an issuer"""
+        rows = self.store.ranked_rows(issuer_id, "issuer", limit=self.store.atom_count(issuer_id, "issuer"))
+        return self._atom_results(rows, ISSUER_ATOM_FIELDS)
+    
+    def list_trust_atoms(
+        self,
+        target_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Dict:
+        """One page of the locally stored atoms about a target, highest overall first
         
-        return sorted(results, key=lambda x: x.get("overall", 0), reverse=True)
+        Pass the returned nextCursor to get the following page. fields picks
+        the result fields (ATOM_RESULT_FIELDS); limit is capped at MAX_PAGE_SIZE.
+        """
+        return self._list_atoms("target", target_id, limit, cursor, fields or TARGET_ATOM_FIELDS)
+    
+    def list_atoms_by_issuer(
+        self,
+        issuer_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Dict:
+        """One page of the atoms an issuer published, highest overall first (see list_trust_atoms)"""
+        return self._list_atoms("issuer", issuer_id, limit, cursor, fields or ISSUER_ATOM_FIELDS)
+    
+    def _list_atoms(self, by: str, did: str, limit: int, cursor: Optional[str], fields: Sequence[str]) -> Dict:
+        unknown = [name for name in fields if name not in ATOM_RESULT_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        
+        # The cursor is the position of the last atom on the previous page
+        after = None
+        if cursor is not None:
+            if not cursor.isdigit() or int(cursor) >= len(self.store):
+                raise ValueError(f"Invalid cursor: {cursor!r}")
+            after = int(cursor)
+        
+        # One row past the page tells whether there is a next one
+        rows = self.store.ranked_rows(did, by, after, limit + 1)
+        return {
+            by: did,
+            "atomCount": self.store.atom_count(did, by),
+            "atoms": self._atom_results(rows[:limit], fields, target=did if by == "target" else None),
+            "nextCursor": str(rows[limit - 1]) if len(rows) > limit else None
+        }
+    
+    def _atom_results(self, rows: List[int], fields: Sequence[str], target: Optional[str] = None) -> List[Dict]:
+        """Result dicts with the given fields for store rows, read from the index columns
+        
+        Rows about one target (given) go through the store's target query,
+        so a tiered store answers body fields from its target cache.
+        """
+        names = [ATOM_RESULT_FIELDS[name] for name in fields]
+        with self.store.lock:
+            values = self.store.target_fields(target, rows, names) if target is not None else self.store.table.fields(rows, names)
+        columns = [values[ATOM_RESULT_FIELDS[name]] for name in fields]
+        return [dict(zip(fields, row)) for row in zip(*columns)]
+    
+    def get_trust_neighborhood(self, did: str, hops: int = 2, direction: str = "out") -> Dict:
+        """Get DIDs reachable within k trust hops, grouped by distance"""
+        distances = self.store.neighborhood(did, hops, direction)
+        
+        by_hop: Dict[int, List[str]] = {}
+        for node, hop in distances.items():
+            by_hop.setdefault(hop, []).append(node)
+        
+        return {
+            "did": did,
+            "hops": hops,
+            "direction": direction,
+            "nodeCount": len(distances),
+            "neighborhood": {str(hop): sorted(nodes) for hop, nodes in sorted(by_hop.items())}
+        }
+    
+    def get_mutual_trust(self, did: str, limit: Optional[int] = None, cursor: Optional[str] = None) -> Dict:
+        """Get DIDs with trust atoms in both directions
+        
+        With a limit (capped at MAX_PAGE_SIZE) one page of DIDs in sorted
+        order is returned; cursor is the nextCursor of the previous page.
+        """
+        mutual = self.store.mutual_trust(did)
+        result = {"did": did, "mutualCount": len(mutual)}
+        if limit is None:
+            result["mutual"] = mutual
+            return result
+        start = bisect_right(mutual, cursor) if cursor is not None else 0
+        page = mutual[start:start + max(1, min(limit, MAX_PAGE_SIZE))]
+        result["mutual"] = page
+        result["nextCursor"] = page[-1] if page and start + len(page) < len(mutual) else None
+        return result
     
     def get_aggregate_reputation(self, target_id: str) -> Dict:
-        """Get aggregated reputation for target"""
-        atoms = self.query_trust_atoms(target_id)
+        """Get aggregated reputation for target
         
-        if not atoms:
+        Concurrent callers for the same target share one computation (and
+        the same result dict - treat it as read-only).
+        """
+        if self.reputation_flight is None:
+            return self._aggregate_reputation(target_id)
+        return self.reputation_flight.do(target_id, lambda: self._aggregate_reputation(target_id))
+    
+    def _aggregate_reputation(self, target_id: str) -> Dict:
+        if self.dkg_configured:
+            atoms = self.query_trust_atoms(target_id)
+            count = len(atoms)
+            average = sum(float(a["overall"]) for a in atoms) / count if count else 0.0
+            top = atoms[:REPUTATION_TOP_ATOMS]
+        else:
+            # Count and mean straight from the overall column; only the top atoms are read
+            with self.store.lock:
+                rows = self.store.target_rows(target_id)
+                count = len(rows)
+                average = float(np.nan_to_num(self.store.table.overall[rows]).mean()) if count else 0.0
+            top = self.list_trust_atoms(target_id, limit=REPUTATION_TOP_ATOMS)["atoms"]
+        
+        if not count:
             return {
                 "target": target_id,
                 "atomCount": 0,
                 "averageOverall": 0.0,
-                "confidence": 0.0
+                "confidence": 0.0,
+                "graphScore": self.graph_score(target_id)
             }
         
-        overall_scores = [float(a["overall"]) for a in atoms]
-        average = sum(overall_scores) / len(overall_scores)
-        
-        # Confidence increases with more atoms (logarithmic)
-        import math
-        confidence = min(1.0, math.log10(len(atoms) + 1) / 2)
-        
         return {
             "target": target_id,
-            "atomCount": len(atoms),
+            "atomCount": count,
             "averageOverall": average,
-            "confidence": confidence,
-            "atoms": atoms[:10]
+            "confidence": reputation_confidence(count),
+            "graphScore": self.graph_score(target_id),
+            "atoms": top
         }
     
+    def get_coalescing_stats(self) -> Dict:
+        """Executed vs coalesced counts for reputation lookups and DKG reads"""
+        stats = {"queryCache": self.query_cache.get_stats()}
+        if self.reputation_flight is not None:
+            stats["reputation"] = self.reputation_flight.get_stats()
+        return stats
+    
     def get_stats(self) -> Dict:
         """Get publisher statistics"""
-        dkg_count = len([a for a in self.published_atoms if a.get("mode") == "DKG_TESTNET"])
-        local_count = len([a for a in self.published_atoms if a.get("mode") == "LOCAL"])
+        modes = self.store.mode_counts()
         
-        return {
-            "totalPublished": len(self.published_atoms),
-            "dkgPublished": dkg_count,
-            "localPublished": local_count,
+        stats = {
+            "totalPublished": len(self.store),
+            "dkgPublished": modes.get("DKG_TESTNET", 0),
+            "localPublished": modes.get("LOCAL", 0),
             "mode": "DKG_TESTNET" if self.dkg_configured else "LOCAL",
-            "atoms": self.published_atoms
+            "store": self.store.get_stats()
         }
+        if self.outbox is not None:
+            stats["outbox"] = self.outbox.get_stats()
+        if self.reputation_flight is not None:
+            stats["reputationFlight"] = self.reputation_flight.get_stats()
+        if self.rank_refresher is not None:
+            stats["pageRank"] = self.rank_refresher.get_stats()
+        if self.anomaly_detector is not None:
+            stats["anomalies"] = self.anomaly_detector.get_stats()
+        if self.dkg_configured and self.client_manager is not None:
+            stats["dkgClient"] = self.client_manager.get_stats()
+        return stats
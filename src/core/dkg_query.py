@@ -0,0 +1,64 @@
+"""DKG Query - SPARQL lookups of published Trust Atoms on a DKG node"""
+
+import re
+from typing import Dict, List, Optional
+
+
+ATOM_ID_PREFIX = "urn:trustgraph:atom:"
+
+# Characters that can't appear inside a SPARQL IRI reference
+_IRI_FORBIDDEN = re.compile(r'[\s<>"{}|^`\\]')
+
+_TARGET_QUERY = """PREFIX schema: <http://schema.org/>
+SELECT ?atom ?issuer ?overall ?content WHERE {{
+  ?atom a schema:CreativeWork ;
+        schema:about <{target}> ;
+        schema:author ?issuer ;
+        schema:aggregateRating ?rating .
+  ?rating schema:ratingValue ?overall .
+  OPTIONAL {{ ?atom schema:description ?content }}
+  FILTER(STRSTARTS(STR(?atom), "{prefix}"))
+}}
+LIMIT {limit}"""
+
+
+def target_atoms_query(target: str, limit: int = 1000) -> Optional[str]:
+    """SPARQL SELECT for atoms about target (None if target can't be used as an IRI)"""
+    if not target or ":" not in target or _IRI_FORBIDDEN.search(target):
+        return None
+    return _TARGET_QUERY.format(target=target, prefix=ATOM_ID_PREFIX, limit=limit)
+
+
+def parse_literal(value) -> Optional[str]:
+    """Plain string from an RDF term as returned by the node ('"0.9"^^<xsd:...>' -> '0.9')"""
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        value = value.get("value")
+    value = str(value)
+    if value.startswith('"'):
+        end = value.rfind('"')
+        return value[1:end] if end > 0 else value[1:]
+    if value.startswith("<") and value.endswith(">"):
+        return value[1:-1]
+    return value
+
+
+def rows_to_results(rows: List[Dict]) -> List[Dict]:
+    """SPARQL bindings -> the result format of DKGPublisher.query_trust_atoms"""
+    results = []
+    for row in rows or []:
+        atom_id = parse_literal(row.get("atom"))
+        try:
+            overall = float(parse_literal(row.get("overall")))
+        except (TypeError, ValueError):
+            continue
+        results.append({
+            "atom": atom_id,
+            "issuer": parse_literal(row.get("issuer")),
+            "overall": overall,
+            "content": parse_literal(row.get("content")) or "",
+            "contentId": atom_id[len(ATOM_ID_PREFIX):] if atom_id and atom_id.startswith(ATOM_ID_PREFIX) else None,
+            "source": "DKG"
+        })
+    return results
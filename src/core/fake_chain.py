@@ -0,0 +1,53 @@
+"""Fake Chain - In-process payment backend for tests and offline demos"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+
+class FakeChain:
+    """Stores token transfers by tx hash, answering like a real chain backend"""
+
+    def __init__(self, token: str = "USDC"):
+        self.token = token
+        self.transfers: Dict[str, Dict] = {}
+        self.lookup_calls = 0
+        self.lookup_delay = 0.0
+        self.available = True
+        self._lock = threading.Lock()
+
+    def add_transfer(
+        self,
+        tx_hash: str,
+        to: str,
+        amount: float,
+        confirmations: int = 12,
+        timestamp: Optional[float] = None
+    ) -> Dict:
+        """Record a confirmed payment as if it had been mined"""
+        transfer = {
+            "txHash": tx_hash,
+            "to": to,
+            "amount": amount,
+            "token": self.token,
+            "confirmations": confirmations,
+            "timestamp": time.time() if timestamp is None else timestamp
+        }
+        with self._lock:
+            self.transfers[tx_hash.lower()] = transfer
+        return transfer
+
+    def get_transfer(self, tx_hash: str, to: Optional[str] = None) -> Optional[Dict]:
+        """Transfer details for tx_hash (None if the chain doesn't know it)
+
+        The fake chain keeps one transfer per tx, so `to` has nothing to pick from.
+        """
+        with self._lock:
+            self.lookup_calls += 1
+        if not self.available:
+            raise ConnectionError("chain RPC unreachable")
+        if self.lookup_delay:
+            time.sleep(self.lookup_delay)
+        with self._lock:
+            transfer = self.transfers.get(tx_hash.lower())
+        return dict(transfer) if transfer else None
@@ -0,0 +1,109 @@
+"""Fake DKG - In-process stand-in for the dkg SDK client (tests and offline demos)"""
+
+import itertools
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class FakeDKGError(Exception):
+    """Raised by the fake node when it is marked unavailable"""
+
+
+class _FakeAssetModule:
+    def __init__(self, node: "FakeDKG"):
+        self._node = node
+
+    def create(self, content: Dict, options: Optional[Dict] = None) -> Dict:
+        """Store content and return a UAL, like dkg.asset.create"""
+        self._node._check_available("asset.create")
+        with self._node._lock:
+            token_id = next(self._node._token_ids)
+            ual = f"did:dkg:{self._node.blockchain_id}/{self._node.contract}/{token_id}"
+            self._node.assets[ual] = {"content": content, "options": options or {}}
+            self._node.create_calls += 1
+        return {"UAL": ual, "operation": {"publish": {"status": "COMPLETED"}}}
+
+    def get(self, ual: str, options: Optional[Dict] = None) -> Dict:
+        """Return stored content for a UAL, like dkg.asset.get"""
+        self._node._check_available("asset.get")
+        self._node.get_calls += 1
+        asset = self._node.assets.get(ual)
+        if asset is None:
+            raise FakeDKGError(f"Asset not found: {ual}")
+        return {"assertion": asset["content"], "operation": {"get": {"status": "COMPLETED"}}}
+
+
+class _FakeNodeModule:
+    def __init__(self, node: "FakeDKG"):
+        self._node = node
+
+    def info(self) -> Dict:
+        self._node._check_available("node.info")
+        self._node.info_calls += 1
+        return {"version": "8.0.0-fake"}
+
+
+class _FakeGraphModule:
+    """Answers the target-atoms SELECT from dkg_query by scanning stored assets"""
+
+    _ABOUT = re.compile(r"schema:about <([^>]*)>")
+
+    def __init__(self, node: "FakeDKG"):
+        self._node = node
+
+    def query(self, query: str, options: Optional[Dict] = None) -> List[Dict]:
+        self._node._check_available("graph.query")
+        with self._node._lock:
+            self._node.query_calls += 1
+        if self._node.query_delay:
+            time.sleep(self._node.query_delay)
+
+        match = self._ABOUT.search(query)
+        if match is None:
+            return []
+        rows = []
+        for node in self._node.published_nodes():
+            if node.get("about", {}).get("@id") != match.group(1):
+                continue
+            rows.append({
+                "atom": node["@id"],
+                "issuer": node["author"]["@id"],
+                "overall": f'"{node["aggregateRating"]["ratingValue"]}"',
+                "content": f'"{node.get("description", "")}"'
+            })
+        return rows
+
+
+class FakeDKG:
+    """Minimal fake of the dkg.DKG client surface used by DKGPublisher"""
+
+    def __init__(self, blockchain_id: str = "otp:20430", contract: str = "0xfake"):
+        self.blockchain_id = blockchain_id
+        self.contract = contract
+        self.available = True
+        self.assets: Dict[str, Dict] = {}
+        self.create_calls = 0
+        self.get_calls = 0
+        self.info_calls = 0
+        self.query_calls = 0
+        self.query_delay = 0.0
+        self._token_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+        self.asset = _FakeAssetModule(self)
+        self.node = _FakeNodeModule(self)
+        self.graph = _FakeGraphModule(self)
+
+    def published_nodes(self) -> List[Dict]:
+        """Every public JSON-LD node stored so far (collections are flattened)"""
+        nodes = []
+        for asset in self.assets.values():
+            public = asset["content"].get("public", {})
+            nodes.extend(public.get("@graph", [public]))
+        return nodes
+
+    def _check_available(self, operation: str):
+        if not self.available:
+            raise FakeDKGError(f"{operation}: node unreachable")
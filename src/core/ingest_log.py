@@ -0,0 +1,73 @@
+"""Ingest Log - Append-only handoff of new Trust Atoms from worker processes to the writer"""
+
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+
+class IngestLog:
+    """JSON-lines file shared by several processes
+
+    Workers append one line per atom under an exclusive flock; the single
+    writer process reads forward from a byte offset and truncates the file
+    once it has consumed everything, so it never grows without bound.
+    """
+
+    def __init__(self, log_file: str = "ingest.log", compact_bytes: int = 1 << 20):
+        self.log_file = log_file
+        self.compact_bytes = compact_bytes
+
+    def append(self, record: Dict):
+        """Queue one record for the writer (safe from any process)"""
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode()
+        with self._locked("ab") as log:
+            log.write(line)
+            log.flush()
+            os.fsync(log.fileno())
+
+    def read(self, offset: int = 0, limit: int = 1000) -> Tuple[List[Dict], int]:
+        """Complete records after offset, and the offset to resume from"""
+        if not os.path.exists(self.log_file):
+            return [], 0
+        records = []
+        with open(self.log_file, "rb") as log:
+            if offset > os.fstat(log.fileno()).st_size:
+                # File was truncated behind our back - start over
+                offset = 0
+            log.seek(offset)
+            for line in log:
+                if not line.endswith(b"\n") or len(records) >= limit:
+                    break
+                offset += len(line)
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+        return records, offset
+
+    def compact(self, offset: int) -> int:
+        """Truncate the log if everything up to offset was consumed; returns the new offset"""
+        if offset < self.compact_bytes:
+            return offset
+        with self._locked("ab") as log:
+            if os.fstat(log.fileno()).st_size != offset:
+                return offset
+            log.truncate(0)
+            return 0
+
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.log_file)
+        except OSError:
+            return 0
+
+    @contextmanager
+    def _locked(self, mode: str):
+        with open(self.log_file, mode) as log:
+            fcntl.flock(log.fileno(), fcntl.LOCK_EX)
+            try:
+                yield log
+            finally:
+                fcntl.flock(log.fileno(), fcntl.LOCK_UN)
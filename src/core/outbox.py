@@ -0,0 +1,262 @@
+"""Publish Outbox - Crash-safe write-ahead log of pending DKG publishes"""
+
+import json
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+OUTBOX_STATES = ("pending", "in_flight", "confirmed", "failed")
+
+# Entries in these states are done and dropped from memory and from the compacted log
+TERMINAL_STATES = ("confirmed", "failed")
+
+
+class PublishOutbox:
+    """Append-only log of publish state transitions, keyed by idempotency key
+
+    Every transition is one JSON line. Only live (pending / in-flight)
+    entries are kept in memory, and the log is rewritten with just those
+    entries once it grows well beyond them, so startup replay costs
+    O(pending) rather than O(everything ever published).
+    """
+
+    def __init__(
+        self,
+        log_file: str = "publish_outbox.log",
+        max_attempts: int = 8,
+        base_delay: float = 2.0,
+        max_delay: float = 300.0,
+        fsync: bool = True,
+        compact_min_lines: int = 1000
+    ):
+        self.log_file = log_file
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.fsync = fsync
+        self.compact_min_lines = compact_min_lines
+
+        self.entries: Dict[str, Dict] = {}
+        self.confirmed_count = 0
+        self.failed_count = 0
+        self._log_lines = 0
+        self._lock = threading.RLock()
+        self._log = None
+
+        self._recover()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def enqueue(self, key: str, payload: Dict) -> Dict:
+        """Record a publish that has not reached the DKG yet (no-op if already queued)"""
+        with self._lock:
+            if key in self.entries:
+                return self.entries[key]
+            entry = {
+                "key": key,
+                "state": "pending",
+                "attempts": 0,
+                "nextAttempt": 0.0,
+                "payload": payload
+            }
+            self.entries[key] = entry
+            self._append(entry)
+            return entry
+
+    def mark_in_flight(self, key: str):
+        """Record that a publish request is about to be sent"""
+        self._transition(key, state="in_flight")
+
+    def mark_confirmed(self, key: str, ual: str):
+        """Record a successful publish and forget the entry"""
+        with self._lock:
+            if self._transition(key, state="confirmed", ual=ual):
+                del self.entries[key]
+                self.confirmed_count += 1
+                self._maybe_compact()
+
+    def mark_failed(self, key: str, error: str, now: Optional[float] = None) -> str:
+        """Record a failed attempt, schedules a retry with backoff or gives up; returns the new state"""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return "failed"
+
+            attempts = entry["attempts"] + 1
+            if attempts >= self.max_attempts:
+                self._transition(key, state="failed", attempts=attempts, error=error)
+                del self.entries[key]
+                self.failed_count += 1
+                self._maybe_compact()
+                return "failed"
+
+            self._transition(
+                key,
+                state="pending",
+                attempts=attempts,
+                nextAttempt=(now or time.time()) + self._backoff(attempts),
+                error=error
+            )
+            return "pending"
+
+    def due(self, now: Optional[float] = None, limit: int = 100) -> List[Dict]:
+        """Pending entries whose backoff has elapsed, oldest retry time first"""
+        now = now or time.time()
+        with self._lock:
+            ready = [e for e in self.entries.values() if e["state"] == "pending" and e["nextAttempt"] <= now]
+        return sorted(ready, key=lambda e: e["nextAttempt"])[:limit]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            states = [e["state"] for e in self.entries.values()]
+            return {
+                "pending": states.count("pending"),
+                "inFlight": states.count("in_flight"),
+                "confirmed": self.confirmed_count,
+                "failed": self.failed_count,
+                "logLines": self._log_lines
+            }
+
+    def close(self):
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    def compact(self):
+        """Rewrite the log with only live entries (atomic replace)"""
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+            tmp_file = self.log_file + ".tmp"
+            with open(tmp_file, "w") as f:
+                for entry in self.entries.values():
+                    f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.log_file)
+            self._log_lines = len(self.entries)
+            self._log = open(self.log_file, "a")
+
+    def _recover(self):
+        """Replay the log; requests that were in flight during a crash become pending again"""
+        if os.path.exists(self.log_file):
+            with open(self.log_file, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break  # torn write at the tail of the log
+                    self._log_lines += 1
+                    self._apply(record)
+
+        for entry in self.entries.values():
+            if entry["state"] == "in_flight":
+                entry["state"] = "pending"
+                entry["nextAttempt"] = 0.0
+
+        self.compact()
+
+    def _apply(self, record: Dict):
+        key = record["key"]
+        if record["state"] in TERMINAL_STATES:
+            self.entries.pop(key, None)
+            if record["state"] == "confirmed":
+                self.confirmed_count += 1
+            else:
+                self.failed_count += 1
+        elif "payload" in record:
+            self.entries[key] = record
+        elif key in self.entries:
+            self.entries[key].update(record)
+
+    def _transition(self, key: str, **changes) -> bool:
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return False
+            entry.update(changes)
+            self._append({"key": key, **changes})
+            return True
+
+    def _append(self, record: Dict):
+        self._log.write(json.dumps(record) + "\n")
+        self._log.flush()
+        if self.fsync:
+            os.fsync(self._log.fileno())
+        self._log_lines += 1
+
+    def _maybe_compact(self):
+        if self._log_lines > max(self.compact_min_lines, 2 * len(self.entries)):
+            self.compact()
+
+    def _backoff(self, attempts: int) -> float:
+        """Exponential backoff with jitter"""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return delay * (0.5 + random.random() / 2)
+
+
+class OutboxDrainer:
+    """Background thread that retries due outbox entries while the node is reachable"""
+
+    def __init__(
+        self,
+        outbox: PublishOutbox,
+        publish_entry: Callable[[Dict], str],
+        is_reachable: Optional[Callable[[], bool]] = None,
+        interval: float = 5.0,
+        batch_limit: int = 100
+    ):
+        self.outbox = outbox
+        self.publish_entry = publish_entry
+        self.is_reachable = is_reachable or (lambda: True)
+        self.interval = interval
+        self.batch_limit = batch_limit
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def drain_once(self, now: Optional[float] = None) -> Dict:
+        """Retry every due entry once; skips the round entirely if the node is down"""
+        due = self.outbox.due(now, limit=self.batch_limit)
+        if not due:
+            return {"attempted": 0, "confirmed": 0}
+        if not self.is_reachable():
+            return {"attempted": 0, "confirmed": 0, "unreachable": True}
+
+        confirmed = 0
+        for entry in due:
+            self.outbox.mark_in_flight(entry["key"])
+            try:
+                ual = self.publish_entry(entry)
+            except Exception as error:
+                self.outbox.mark_failed(entry["key"], str(error))
+                continue
+            self.outbox.mark_confirmed(entry["key"], ual)
+            confirmed += 1
+        return {"attempted": len(due), "confirmed": confirmed}
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="outbox-drainer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.drain_once()
+            except Exception as error:
+                print(f"⚠️  Outbox drain error: {error}")
+            self._stop.wait(self.interval)
@@ -0,0 +1,386 @@
+"""x402 Payments - Verify payment proofs on-chain, cache them, spend prepaid query credits"""
+
+import fcntl
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+# keccak256("Transfer(address,address,uint256)")
+ERC20_TRANSFER_TOPIC = "ddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+
+_TX_HASH = re.compile(r"^0x[0-9a-fA-F]{64}$")
+
+
+class Web3ChainBackend:
+    """Reads ERC-20 payments to us from an EVM JSON-RPC node (web3 imported on first use)"""
+
+    def __init__(self, rpc_url: str, token_address: str, decimals: int = 6, timeout: float = 10.0):
+        self.rpc_url = rpc_url
+        self.token_address = token_address.lower()
+        self.decimals = decimals
+        self.timeout = timeout
+        self._w3 = None
+
+    @property
+    def w3(self):
+        if self._w3 is None:
+            from web3 import Web3
+            self._w3 = Web3(Web3.HTTPProvider(self.rpc_url, request_kwargs={"timeout": self.timeout}))
+        return self._w3
+
+    def get_transfer(self, tx_hash: str, to: Optional[str] = None) -> Optional[Dict]:
+        """Token Transfer to `to` in a successful tx (None if missing, failed or not a payment to `to`)
+
+        Without `to` the first token Transfer of the tx is returned.
+        """
+        from web3.exceptions import TransactionNotFound
+
+        try:
+            receipt = self.w3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            return None
+        if receipt["status"] != 1:
+            return None
+
+        for log in receipt["logs"]:
+            topics = [bytes(topic).hex() for topic in log["topics"]]
+            if log["address"].lower() != self.token_address or not topics or topics[0] != ERC20_TRANSFER_TOPIC:
+                continue
+            recipient = "0x" + topics[2][-40:]
+            if to is not None and recipient != to.lower():
+                continue
+            block = self.w3.eth.get_block(receipt["blockNumber"])
+            return {
+                "txHash": tx_hash,
+                "to": recipient,
+                "amount": int.from_bytes(bytes(log["data"]), "big") / 10 ** self.decimals,
+                "token": self.token_address,
+                "confirmations": self.w3.eth.block_number - receipt["blockNumber"] + 1,
+                "timestamp": block["timestamp"]
+            }
+        return None
+
+
+class CreditLedger:
+    """Queries spent per payment proof, in a JSON-lines file shared by worker processes
+
+    Each charge appends {"proof", "used", "paidAt"} under an exclusive flock
+    (on a side .lock file) after reading the lines other processes appended
+    since, so a proof's quota holds across workers and restarts. Past
+    compact_bytes the file is rewritten with one line per proof still
+    younger than max_age; older proofs are rejected as expired anyway.
+    """
+
+    def __init__(self, path: str, max_age: float = 24 * 3600.0, compact_bytes: int = 1 << 20):
+        self.path = path
+        self.max_age = max_age
+        self.compact_bytes = compact_bytes
+        # proof -> [used, paidAt], as of self._offset in the file with inode self._inode
+        self._used: Dict[str, List] = {}
+        self._offset = 0
+        self._inode: Optional[int] = None
+        self._compacted_size = 0
+        self._lock = threading.Lock()
+
+    def used(self, proof: str) -> int:
+        with self._locked():
+            self._catch_up()
+            return self._used.get(proof, (0,))[0]
+
+    def spend(self, proof: str, queries: int, credits: int, paid_at: float) -> Tuple[bool, int]:
+        """Record queries spent from the proof's credits: (ok, credits remaining)
+
+        Proofs older than max_age are refused: compaction forgets what they used.
+        """
+        if time.time() - paid_at > self.max_age:
+            return False, 0
+        with self._locked():
+            self._catch_up()
+            used = self._used.get(proof, (0,))[0]
+            if used + queries > credits:
+                return False, max(credits - used, 0)
+            self._append(proof, queries, paid_at)
+            if self._offset >= max(self.compact_bytes, 2 * self._compacted_size):
+                self._compact()
+            return True, credits - used - queries
+
+    @contextmanager
+    def _locked(self):
+        with self._lock, open(self.path + ".lock", "a") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def _catch_up(self):
+        # Called with the lock held
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._used, self._offset, self._inode = {}, 0, None
+            return
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            # Compacted (or replaced) by another process: re-read from the start
+            self._used, self._offset, self._inode = {}, 0, stat.st_ino
+        if stat.st_size == self._offset:
+            return
+
+        with open(self.path, "rb+") as log:
+            log.seek(self._offset)
+            for line in log:
+                if not line.endswith(b"\n"):
+                    break
+                self._offset += len(line)
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self._add(entry["proof"], entry["used"], entry["paidAt"])
+            if self._offset < stat.st_size:
+                # Torn line of a writer that died mid-append: drop it so the next line starts clean
+                log.truncate(self._offset)
+
+    def _append(self, proof: str, used: int, paid_at: float):
+        line = (json.dumps({"proof": proof, "used": used, "paidAt": paid_at}) + "\n").encode()
+        with open(self.path, "ab") as log:
+            log.write(line)
+            log.flush()
+            self._inode = os.fstat(log.fileno()).st_ino
+        self._offset += len(line)
+        self._add(proof, used, paid_at)
+
+    def _add(self, proof: str, used: int, paid_at: float):
+        entry = self._used.setdefault(proof, [0, paid_at])
+        entry[0] += used
+
+    def _compact(self):
+        cutoff = time.time() - self.max_age
+        self._used = {proof: entry for proof, entry in self._used.items() if entry[1] >= cutoff}
+        temp = self.path + ".tmp"
+        with open(temp, "wb") as log:
+            for proof, (used, paid_at) in self._used.items():
+                log.write((json.dumps({"proof": proof, "used": used, "paidAt": paid_at}) + "\n").encode())
+            log.flush()
+            os.fsync(log.fileno())
+            self._offset = log.tell()
+        os.replace(temp, self.path)
+        self._inode = os.stat(self.path).st_ino
+        self._compacted_size = self._offset
+
+
+class PaymentVerifier:
+    """Turns x402 payment proofs (tx hashes) into prepaid query credits
+
+    A proof is looked up on-chain once; the payment buys
+    floor(amount / price) queries, and the remaining quota is kept in an
+    LRU so later queries with the same proof cost a dict lookup. Chain
+    lookups run on a small thread pool (concurrent checks of one proof
+    share a lookup) and the request only waits up to wait_timeout for them.
+
+    With a CreditLedger the quota is spent in its shared file instead, so
+    other worker processes and restarts can't refill a proof.
+    """
+
+    def __init__(
+        self,
+        backend,
+        pay_to: str,
+        price: float = 0.001,
+        min_confirmations: int = 1,
+        max_proof_age: float = 24 * 3600.0,
+        max_entries: int = 10000,
+        invalid_ttl: float = 60.0,
+        wait_timeout: float = 2.0,
+        workers: int = 4,
+        strict_format: bool = True,
+        ledger: Optional[CreditLedger] = None
+    ):
+        self.backend = backend
+        self.pay_to = pay_to.lower()
+        self.price = price
+        self.min_confirmations = min_confirmations
+        self.max_proof_age = max_proof_age
+        self.max_entries = max_entries
+        self.invalid_ttl = invalid_ttl
+        self.wait_timeout = wait_timeout
+        self.strict_format = strict_format
+        self.ledger = ledger
+
+        # proof -> {"remaining", "paidAt", ...} for verified proofs, most recently used last
+        self._credits: "OrderedDict[str, Dict]" = OrderedDict()
+        # Quota of proofs evicted from the LRU, so re-verifying one can't refill it
+        self._spent: Dict[str, tuple] = {}
+        self._invalid: Dict[str, tuple] = {}
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="x402-verify")
+
+        self.cache_hits = 0
+        self.chain_lookups = 0
+        self.coalesced = 0
+        self.rejected = 0
+
+    def charge(self, proof: Optional[str], queries: int = 1) -> Dict:
+        """Spend queries credits of proof, verifying it on-chain first if needed
+
+        Returns {"ok", "status", "remaining", "error"} where status is one of
+        paid, pending (still verifying, retry shortly), exhausted or invalid.
+        """
+        if not proof:
+            return self._result("invalid", error="Missing payment proof")
+        if self.strict_format and not _TX_HASH.match(proof):
+            return self._result("invalid", error="Payment proof must be a transaction hash")
+
+        key = proof.lower()
+        spent = self._spend(key, queries)
+        if spent is not None:
+            return spent
+
+        future = self.verify_async(key)
+        try:
+            future.result(timeout=self.wait_timeout)
+        except FutureTimeout:
+            return self._result("pending", error="Payment verification in progress")
+        except Exception as error:
+            return self._result("pending", error=f"Chain lookup failed: {error}")
+
+        spent = self._spend(key, queries)
+        return spent if spent is not None else self._result("invalid", error="Payment not verified")
+
+    def verify_async(self, proof: str) -> Future:
+        """Start (or join) the on-chain check of proof without waiting for it"""
+        key = proof.lower()
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            future = self._pending[key] = self._executor.submit(self._verify, key)
+        return future
+
+    def remaining(self, proof: str) -> int:
+        with self._lock:
+            entry = self._credits.get(proof.lower())
+            return entry["remaining"] if entry else 0
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "cachedProofs": len(self._credits),
+                "evictedProofs": len(self._spent),
+                "invalidProofs": len(self._invalid),
+                "pendingVerifications": len(self._pending),
+                "cacheHits": self.cache_hits,
+                "chainLookups": self.chain_lookups,
+                "coalesced": self.coalesced,
+                "rejected": self.rejected
+            }
+
+    def _spend(self, key: str, queries: int) -> Optional[Dict]:
+        """Charge a known proof; None if it still has to be verified"""
+        now = time.time()
+        with self._lock:
+            entry = self._credits.get(key)
+            if entry is not None:
+                self.cache_hits += 1
+                if now - entry["paidAt"] > self.max_proof_age:
+                    # Expired while cached: the ledger may already have compacted its used count away
+                    del self._credits[key]
+                    self._invalid[key] = (now + self.invalid_ttl, "Payment proof expired")
+                    return self._result("invalid", error="Payment proof expired")
+                self._credits.move_to_end(key)
+                if self.ledger is None:
+                    if entry["remaining"] < queries:
+                        return self._exhausted(entry["remaining"])
+                    entry["remaining"] -= queries
+                    return self._result("paid", remaining=entry["remaining"])
+            else:
+                invalid = self._invalid.get(key)
+                if invalid is not None and invalid[0] > now:
+                    self.cache_hits += 1
+                    return self._result("invalid", error=invalid[1])
+                return None
+
+        ok, remaining = self.ledger.spend(key, queries, entry["credits"], entry["paidAt"])
+        with self._lock:
+            entry["remaining"] = remaining
+        return self._result("paid", remaining=remaining) if ok else self._exhausted(remaining)
+
+    def _verify(self, key: str):
+        try:
+            with self._lock:
+                self.chain_lookups += 1
+            transfer = self.backend.get_transfer(key, self.pay_to)
+            error = self._check(transfer)
+            used = self.ledger.used(key) if error is None and self.ledger is not None else None
+            now = time.time()
+            with self._lock:
+                if error is not None:
+                    self.rejected += 1
+                    self._invalid[key] = (now + self.invalid_ttl, error)
+                    self._evict(now)
+                    return
+                self._invalid.pop(key, None)
+                if key in self._credits:
+                    return
+                credits = int(transfer["amount"] / self.price + 1e-9)
+                evicted = self._spent.pop(key, None)
+                if used is not None:
+                    remaining = max(credits - used, 0)
+                else:
+                    remaining = evicted[0] if evicted else credits
+                self._credits[key] = {
+                    "remaining": remaining,
+                    "credits": credits,
+                    "paidAt": transfer["timestamp"]
+                }
+                self._evict(now)
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def _check(self, transfer: Optional[Dict]) -> Optional[str]:
+        """Reason the transfer doesn't pay for queries (None if it does)"""
+        if transfer is None:
+            return "Transaction not found or no token transfer to the payment address"
+        if transfer["to"].lower() != self.pay_to:
+            return "Payment sent to a different address"
+        if transfer["amount"] + 1e-12 < self.price:
+            return f"Payment below price ({self.price})"
+        if transfer["confirmations"] < self.min_confirmations:
+            return "Payment not confirmed yet"
+        if time.time() - transfer["timestamp"] > self.max_proof_age:
+            return "Payment proof expired"
+        return None
+
+    def _evict(self, now: float):
+        # Called with the lock held
+        while len(self._credits) > self.max_entries:
+            key, entry = self._credits.popitem(last=False)
+            self._spent[key] = (entry["remaining"], entry["paidAt"])
+        if len(self._spent) > self.max_entries:
+            # Proofs past max_proof_age are rejected anyway, so their quota can go
+            cutoff = now - self.max_proof_age
+            self._spent = {k: v for k, v in self._spent.items() if v[1] >= cutoff}
+        if len(self._invalid) > self.max_entries:
+            self._invalid = {k: v for k, v in self._invalid.items() if v[0] > now}
+
+    def _exhausted(self, remaining: int) -> Dict:
+        return self._result("exhausted", remaining=remaining, error="Prepaid credits used up")
+
+    @staticmethod
+    def _result(status: str, remaining: int = 0, error: Optional[str] = None) -> Dict:
+        result = {"ok": status == "paid", "status": status, "remaining": remaining}
+        if error:
+            result["error"] = error
+        return result
@@ -0,0 +1,108 @@
+"""Query Cache - Read-through TTL cache with negative caching and request coalescing"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .single_flight import SingleFlight
+
+
+class ReadThroughCache:
+    """Caches loader(key) results; empty results are cached for a shorter negative_ttl
+
+    Concurrent misses for the same key are coalesced so only one loader
+    call goes upstream. Loader exceptions are never cached. At most
+    max_entries keys are kept (least recently used evicted first).
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[Hashable], Any],
+        ttl: float = 30.0,
+        negative_ttl: float = 5.0,
+        max_entries: int = 10000
+    ):
+        self.loader = loader
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        # Bumped by invalidate() of everything; keys being loaded -> invalidated since
+        self._generation = 0
+        self._loading: Dict[Hashable, bool] = {}
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Cached value for key, loading it (once, for all concurrent callers) on a miss"""
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached[1]
+
+        with self._lock:
+            self.misses += 1
+        return self._flight.do(key, lambda: self._load(key))
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one key, or everything when key is None"""
+        with self._lock:
+            # Loads of this key (of any key, for None) started before now must not repopulate the cache
+            if key is None:
+                self._generation += 1
+                self._entries.clear()
+            else:
+                if key in self._loading:
+                    self._loading[key] = True
+                self._entries.pop(key, None)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "negativeHits": self.negative_hits,
+                "misses": self.misses,
+            }
+        stats["upstream"] = self._flight.get_stats()
+        return stats
+
+    def _lookup(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            if entry[1]:
+                self.hits += 1
+            else:
+                self.negative_hits += 1
+            return entry
+
+    def _load(self, key: Hashable) -> Any:
+        with self._lock:
+            generation = self._generation
+            self._loading[key] = False
+        try:
+            value = self.loader(key)
+        except Exception:
+            with self._lock:
+                self._loading.pop(key, None)
+            raise
+        expires = time.monotonic() + (self.ttl if value else self.negative_ttl)
+        with self._lock:
+            if self._loading.pop(key, False) or generation != self._generation:
+                return value
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
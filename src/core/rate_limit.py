@@ -0,0 +1,102 @@
+"""Rate Limiting - Per-key token buckets and a global concurrency limit for admission control"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Tuple
+
+
+class TokenBucketLimiter:
+    """Token bucket per key: rate tokens/second refill, up to burst tokens
+
+    Buckets live in an LRU map capped at max_keys; a key evicted for being
+    idle the longest would have refilled completely anyway unless it was
+    recently drained, so eviction errs on the side of admitting. Every
+    check is O(1).
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        max_keys: int = 100000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: "OrderedDict[Hashable, list]" = OrderedDict()   # key -> [tokens, updated]
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = 0
+        self.evicted = 0
+
+    def acquire(self, key: Hashable, cost: float = 1.0) -> Tuple[bool, float]:
+        """Take cost tokens from key's bucket; returns (allowed, seconds until it would be)"""
+        now = self.clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.burst, now]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+                    self.evicted += 1
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                self.allowed += 1
+                return True, 0.0
+            self.rejected += 1
+            return False, (cost - bucket[0]) / self.rate if self.rate > 0 else float("inf")
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "keys": len(self._buckets),
+                "allowed": self.allowed,
+                "rejected": self.rejected,
+                "evicted": self.evicted
+            }
+
+
+class ConcurrencyLimiter:
+    """Caps requests in flight; callers over the cap are shed instead of queued"""
+
+    def __init__(self, max_concurrent: int):
+        self.max_concurrent = max_concurrent
+        self.in_flight = 0
+        self.peak = 0
+        self.admitted = 0
+        self.shed = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.in_flight >= self.max_concurrent:
+                self.shed += 1
+                return False
+            self.in_flight += 1
+            self.admitted += 1
+            self.peak = max(self.peak, self.in_flight)
+            return True
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "maxConcurrent": self.max_concurrent,
+                "inFlight": self.in_flight,
+                "peak": self.peak,
+                "admitted": self.admitted,
+                "shed": self.shed
+            }
@@ -0,0 +1,317 @@
+"""Shared State - Memory-mapped reputation snapshot written by one process, read by many"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .ingest_log import IngestLog
+
+MAGIC = b"TGSTATE1"
+
+# magic, generation, node count, node id width (bytes), metadata length
+_HEADER = struct.Struct("<8sQQQQ")
+
+def _pad8(length: int) -> int:
+    return (8 - length % 8) % 8
+
+
+def write_state(
+    path: str,
+    generation: int,
+    nodes: Sequence[str],
+    columns: Dict[str, np.ndarray],
+    meta: Optional[Dict] = None
+):
+    """Write a snapshot to a temp file and atomically replace path with it
+
+    Nodes must be sorted (readers binary-search them). Readers that still
+    map the previous file keep a consistent view until they reload.
+    """
+    encoded = np.array([node.encode() for node in nodes], dtype=bytes)
+    width = max(encoded.dtype.itemsize, 1)
+    meta_bytes = json.dumps({**(meta or {}), "columns": list(columns)}).encode()
+
+    tmp = f"{path}.tmp.{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, generation, len(encoded), width, len(meta_bytes)))
+        f.write(meta_bytes + b"\0" * _pad8(len(meta_bytes)))
+        node_bytes = encoded.astype(f"S{width}").tobytes()
+        f.write(node_bytes + b"\0" * _pad8(len(node_bytes)))
+        for name in columns:
+            f.write(np.ascontiguousarray(columns[name], dtype="<f8").tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class StateView:
+    """One mapped snapshot; lookups binary-search the shared node array"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.generation, count, width, meta_len = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a shared state file")
+
+        offset = _HEADER.size
+        self.meta = json.loads(bytes(self._map[offset:offset + meta_len]))
+        offset += meta_len + _pad8(meta_len)
+        self.nodes = np.frombuffer(self._map, dtype=f"S{width}", count=count, offset=offset)
+        offset += count * width + _pad8(count * width)
+
+        self.columns: Dict[str, np.ndarray] = {}
+        for name in self.meta["columns"]:
+            self.columns[name] = np.frombuffer(self._map, dtype="<f8", count=count, offset=offset)
+            offset += count * 8
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def lookup(self, node: str) -> Optional[Dict[str, float]]:
+        """Column values for node (None if the snapshot doesn't know it)"""
+        key = node.encode()
+        if len(self.nodes) == 0 or len(key) > self.nodes.dtype.itemsize:
+            return None
+        i = int(np.searchsorted(self.nodes, key))
+        if i >= len(self.nodes) or self.nodes[i] != key:
+            return None
+        return {name: float(column[i]) for name, column in self.columns.items()}
+
+
+class SharedStateReader:
+    """Follows the state file, remapping when the writer replaces it
+
+    The file is stat()ed at most every check_interval seconds, so lookups
+    stay a pointer chase plus a binary search.
+    """
+
+    def __init__(self, path: str, check_interval: float = 0.5):
+        self.path = path
+        self.check_interval = check_interval
+        self._view: Optional[StateView] = None
+        self._stamp = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self.reloads = 0
+
+    def current(self) -> Optional[StateView]:
+        """Latest snapshot (None until the writer has produced one)"""
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._reload_if_changed(now)
+        return self._view
+
+    def lookup(self, node: str) -> Optional[Dict[str, float]]:
+        view = self.current()
+        return None if view is None else view.lookup(node)
+
+    def get_stats(self) -> Dict:
+        view = self._view
+        return {
+            "generation": view.generation if view else None,
+            "nodeCount": len(view) if view else 0,
+            "reloads": self.reloads,
+            "meta": {k: v for k, v in view.meta.items() if k != "columns"} if view else {}
+        }
+
+    def _reload_if_changed(self, now: float):
+        with self._lock:
+            if now < self._next_check:
+                return
+            self._next_check = now + self.check_interval
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                return
+            stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+            if stamp == self._stamp:
+                return
+            view = StateView(self.path)
+            if self._view is None or view.generation > self._view.generation:
+                self._view = view
+                self.reloads += 1
+            self._stamp = stamp
+
+
+def reputation_columns(records: Sequence[Dict], rank_snapshot=None) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """Per-target atom counts and mean overall from stored records, joined with PageRank scores
+
+    Columns are float64 with NaN where a value doesn't apply.
+    """
+    targets = [record.get("trustAtom", {}).get("target") or "" for record in records]
+    overall = np.fromiter(
+        (float(record.get("trustAtom", {}).get("overall") or 0.0) for record in records),
+        dtype=np.float64,
+        count=len(records)
+    )
+    valid = np.array([bool(t) for t in targets], dtype=bool)
+    nodes, target_idx = np.unique(np.array(targets, dtype=str)[valid], return_inverse=True)
+    counts = np.bincount(target_idx.reshape(-1), minlength=len(nodes))
+    sums = np.bincount(target_idx.reshape(-1), weights=overall[valid], minlength=len(nodes))
+    return target_reputation_columns(nodes, counts, sums, rank_snapshot)
+
+
+def target_reputation_columns(
+    targets: Sequence[str],
+    counts: np.ndarray,
+    sums: np.ndarray,
+    rank_snapshot=None
+) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """reputation_columns from per-target atom counts and summed overall (AtomStore.target_totals)"""
+    targets = np.array(targets, dtype=str)
+    rank_nodes = rank_snapshot.nodes if rank_snapshot is not None else []
+
+    nodes = np.union1d(targets, np.array(list(rank_nodes), dtype=str))
+    n = len(nodes)
+    atom_count = np.zeros(n)
+    average = np.full(n, np.nan)
+    graph_score = np.full(n, np.nan)
+
+    if len(targets):
+        target_idx = np.searchsorted(nodes, targets)
+        atom_count[target_idx] = counts
+        average[target_idx] = np.asarray(sums, dtype=np.float64) / counts
+    if rank_snapshot is not None and len(rank_nodes):
+        graph_score[np.searchsorted(nodes, np.array(rank_nodes, dtype=str))] = rank_snapshot.scores
+
+    return [str(node) for node in nodes], {
+        "atomCount": atom_count,
+        "averageOverall": average,
+        "graphScore": graph_score
+    }
+
+
+class SharedStateWriter:
+    """Owns the store: ingests atoms queued by workers and republishes the shared snapshot"""
+
+    def __init__(self, publisher, state_file: str, ingest_log: Optional[IngestLog] = None, interval: float = 1.0):
+        self.publisher = publisher
+        self.state_file = state_file
+        self.ingest_log = ingest_log
+        self.interval = interval
+
+        self.generation = 0
+        self.ingest_offset = 0
+        self.ingested = 0
+        self._rank_version = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Resume after the last snapshot this writer (or a previous one) produced
+        if os.path.exists(state_file):
+            try:
+                previous = StateView(state_file)
+                self.generation = previous.generation
+                self.ingest_offset = int(previous.meta.get("ingestOffset", 0))
+            except (ValueError, OSError, struct.error):
+                pass
+
+    def step(self) -> bool:
+        """Ingest queued atoms and rewrite the snapshot if anything changed"""
+        changed = self._ingest()
+        refresher = self.publisher.rank_refresher
+        rank_snapshot = refresher.snapshot if refresher is not None else None
+        rank_version = rank_snapshot.version if rank_snapshot is not None else None
+        if changed or rank_version != self._rank_version or self.generation == 0:
+            self._rank_version = rank_version
+            self.publish_state(rank_snapshot)
+            return True
+        return False
+
+    def publish_state(self, rank_snapshot=None) -> int:
+        """Write the current aggregates and scores as the next generation"""
+        store = self.publisher.store
+        nodes, columns = target_reputation_columns(*store.target_totals(), rank_snapshot)
+        self.generation += 1
+        write_state(self.state_file, self.generation, nodes, columns, meta={
+            "ingestOffset": self.ingest_offset,
+            "atomCount": len(store),
+            "rankVersion": rank_snapshot.version if rank_snapshot is not None else None,
+            "writtenAt": time.time()
+        })
+        return self.generation
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="state-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _ingest(self) -> bool:
+        if self.ingest_log is None:
+            return False
+        from .trust_atom import TrustAtomV7
+
+        changed = False
+        while True:
+            records, offset = self.ingest_log.read(self.ingest_offset)
+            if not records:
+                break
+            atoms = []
+            for record in records:
+                try:
+                    atoms.append(TrustAtomV7.from_jsonld(record["atom"]))
+                except Exception as error:
+                    print(f"⚠️  Skipping malformed ingest record: {error}")
+            if atoms:
+                self.publisher.publish_batch(atoms)
+                self.ingested += len(atoms)
+            self.ingest_offset = offset
+            changed = True
+        if changed:
+            self.ingest_offset = self.ingest_log.compact(self.ingest_offset)
+        return changed
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.step()
+            except Exception as error:
+                print(f"⚠️  Shared state write error: {error}")
+            self._stop.wait(self.interval)
+
+
+def run_state_writer(
+    storage_file: str,
+    state_file: str,
+    ingest_file: str,
+    outbox_file: Optional[str] = None,
+    interval: float = 1.0,
+    rank_interval: float = 300.0,
+    rank_refresh_after: int = 100,
+    hot_atoms: Optional[int] = None,
+    stake_ledger_file: Optional[str] = None,
+    sybil_strength: float = 0.0
+):
+    """Entry point of the designated writer process in multi-worker mode (blocks)"""
+    from .dkg_publisher import DKGPublisher
+    from .stake_ledger import StakeLedger
+
+    publisher = DKGPublisher(storage_file=storage_file, outbox_file=outbox_file, hot_atoms=hot_atoms)
+    if publisher.dkg_configured and publisher.outbox is not None:
+        publisher.start_outbox_drainer()
+    stake_ledger = StakeLedger(stake_ledger_file, read_only=True) if stake_ledger_file else None
+    publisher.start_rank_refresher(
+        interval=rank_interval,
+        refresh_after=rank_refresh_after,
+        stake_ledger=stake_ledger,
+        sybil_strength=sybil_strength
+    )
+    if stake_ledger is not None:
+        stake_ledger.follow()
+
+    writer = SharedStateWriter(publisher, state_file, IngestLog(ingest_file), interval=interval)
+    print(f"✍️  State writer {os.getpid()} serving {state_file}")
+    writer._run()
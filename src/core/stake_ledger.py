@@ -0,0 +1,275 @@
+"""Stake Ledger - Event-sourced TRAC stake history with point-in-time lookups"""
+
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_right
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+STAKE_EVENTS = ("register", "top_up", "slash")
+
+
+def stake_weight(stake: float) -> float:
+    """Stake weight multiplier (0.5x - 2.0x)"""
+    # Logarithmic scaling: 100 TRAC = 1.0x, 1000 TRAC = 1.5x, 10000 TRAC = 2.0x
+    if stake <= 0:
+        return 0.5  # Penalty for no stake
+    if stake < 100:
+        return 0.7
+    return min(1.0 + math.log10(stake / 100) * 0.5, 2.0)
+
+
+def stake_weights(stakes: np.ndarray) -> np.ndarray:
+    """stake_weight over an array of stakes"""
+    stakes = np.asarray(stakes, dtype=np.float64)
+    with np.errstate(divide="ignore"):
+        weights = np.minimum(1.0 + np.log10(stakes / 100) * 0.5, 2.0)
+    weights = np.where(stakes < 100, 0.7, weights)
+    return np.where(stakes <= 0, 0.5, weights)
+
+
+class StakeLedger:
+    """Append-only register / top-up / slash events with per-issuer timelines
+
+    Every event records the issuer's balance after it, so the stake at any
+    time is one bisect into that issuer's timeline. Dense balance snapshots
+    of all issuers (checkpoints) are taken every checkpoint_every events -
+    at least as many events apart as there are issuers, so they never cost
+    more memory than the events themselves - and "all stakes at time T"
+    starts from the nearest checkpoint instead of replaying from zero.
+    """
+
+    def __init__(self, ledger_file: Optional[str] = None, checkpoint_every: int = 1000, read_only: bool = False):
+        self.ledger_file = ledger_file
+        self.checkpoint_every = checkpoint_every
+        # Following a file another process writes: never append to or truncate it
+        self.read_only = read_only
+
+        self.events: List[Dict] = []
+        self.issuers: List[str] = []
+        self.issuer_index: Dict[str, int] = {}
+        self.balances: Dict[str, float] = {}
+
+        # Per issuer: event times and balance after each event
+        self._timelines: Dict[str, tuple] = {}
+        # All events in order, as parallel columns for bulk replay
+        self._times: List[float] = []
+        self._event_issuers: List[int] = []
+        self._event_balances: List[float] = []
+        # Dense balances after the first _checkpoint_seqs[i] events
+        self._checkpoint_seqs: List[int] = [0]
+        self._checkpoints: List[np.ndarray] = [np.zeros(0)]
+        self._listeners: List[Callable[[Dict], None]] = []
+        self._lock = threading.RLock()
+        # Bytes of the ledger file replayed so far
+        self._offset = 0
+        self._follower: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        if ledger_file:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def load(self) -> int:
+        """Replay the ledger file, returns the number of events"""
+        self._replay()
+        return len(self.events)
+
+    def catch_up(self) -> int:
+        """Apply events appended to the ledger file since the last replay, returns how many
+
+        Listeners are called for each, as if the events had been recorded here.
+        """
+        events = self._replay()
+        for event in events:
+            for listener in self._listeners:
+                listener(event)
+        return len(events)
+
+    def follow(self, interval: float = 5.0):
+        """Catch up with the ledger file every interval seconds in a background thread"""
+        if self._follower is None or not self._follower.is_alive():
+            self._stop.clear()
+            self._follower = threading.Thread(target=self._follow, args=(interval,), name="stake-ledger", daemon=True)
+            self._follower.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._follower is not None:
+            self._follower.join()
+
+    def _follow(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.catch_up()
+            except Exception as error:
+                print(f"⚠️  Stake ledger follow error: {error}")
+
+    def _replay(self) -> List[Dict]:
+        if not self.ledger_file or not os.path.exists(self.ledger_file):
+            return []
+        events = []
+        with self._lock, open(self.ledger_file, "rb" if self.read_only else "rb+") as log:
+            if os.fstat(log.fileno()).st_size == self._offset:
+                return events
+            log.seek(self._offset)
+            for line in log:
+                if not line.endswith(b"\n"):
+                    if not self.read_only:
+                        # Torn final write: cut it off so the next event starts on its own line
+                        log.truncate(self._offset)
+                    # (a follower leaves it: the writer may still be finishing the line)
+                    break
+                event = json.loads(line)
+                events.append(self._apply(event["issuer"], event["kind"], event["amount"], event["time"], persist=False))
+                self._offset += len(line)
+        return events
+
+    def subscribe(self, listener: Callable[[Dict], None]):
+        """Call listener with every new event (after it is recorded)"""
+        self._listeners.append(listener)
+
+    def register(self, issuer: str, amount: float, timestamp: Optional[float] = None) -> Dict:
+        """Set an issuer's stake to amount"""
+        return self._apply(issuer, "register", float(amount), timestamp)
+
+    def top_up(self, issuer: str, amount: float, timestamp: Optional[float] = None) -> Dict:
+        """Add amount to an issuer's stake"""
+        if amount <= 0:
+            raise ValueError("Top-up amount must be positive")
+        return self._apply(issuer, "top_up", float(amount), timestamp)
+
+    def slash(self, issuer: str, rate: float, timestamp: Optional[float] = None) -> Dict:
+        """Remove a fraction of an issuer's current stake"""
+        if not 0 < rate <= 1:
+            raise ValueError("Slashing rate must be in (0, 1]")
+        return self._apply(issuer, "slash", 0.0, timestamp, rate=rate)
+
+    def _apply(
+        self,
+        issuer: str,
+        kind: str,
+        amount: float,
+        timestamp: Optional[float],
+        persist: bool = True,
+        rate: Optional[float] = None
+    ) -> Dict:
+        if kind not in STAKE_EVENTS:
+            raise ValueError(f"Unknown stake event: {kind}")
+        if persist and self.read_only:
+            raise RuntimeError("Read-only stake ledger: record events in the process that writes the ledger file")
+        # Listeners run after the lock is released, so they may call back into the ledger
+        with self._lock:
+            timestamp = time.time() if timestamp is None else float(timestamp)
+            if self._times and timestamp < self._times[-1]:
+                raise ValueError("Stake events must be recorded in time order")
+
+            previous = self.balances.get(issuer, 0.0)
+            if rate is not None:
+                amount = previous * rate
+            if kind == "register":
+                balance = amount
+            elif kind == "top_up":
+                balance = previous + amount
+            else:
+                balance = max(previous - amount, 0.0)
+
+            index = self.issuer_index.get(issuer)
+            if index is None:
+                index = self.issuer_index[issuer] = len(self.issuers)
+                self.issuers.append(issuer)
+                self._timelines[issuer] = ([], [])
+
+            event = {
+                "seq": len(self.events),
+                "time": timestamp,
+                "issuer": issuer,
+                "kind": kind,
+                "amount": amount,
+                "balance": balance
+            }
+            self.events.append(event)
+            self.balances[issuer] = balance
+            times, balances = self._timelines[issuer]
+            times.append(timestamp)
+            balances.append(balance)
+            self._times.append(timestamp)
+            self._event_issuers.append(index)
+            self._event_balances.append(balance)
+
+            if len(self.events) - self._checkpoint_seqs[-1] >= max(self.checkpoint_every, len(self.issuers)):
+                self._checkpoints.append(self.stakes_at())
+                self._checkpoint_seqs.append(len(self.events))
+
+            if persist and self.ledger_file:
+                line = (json.dumps(event, separators=(",", ":")) + "\n").encode()
+                with open(self.ledger_file, "ab") as log:
+                    log.write(line)
+                self._offset += len(line)
+
+        if persist:
+            for listener in self._listeners:
+                listener(event)
+        return event
+
+    def stake_at(self, issuer: str, timestamp: Optional[float] = None) -> float:
+        """Issuer's stake at a time (now if omitted), O(log events of that issuer)"""
+        timeline = self._timelines.get(issuer)
+        if timeline is None:
+            return 0.0
+        if timestamp is None:
+            return self.balances[issuer]
+        times, balances = timeline
+        position = bisect_right(times, timestamp)
+        return balances[position - 1] if position else 0.0
+
+    def weight_at(self, issuer: str, timestamp: Optional[float] = None) -> float:
+        """Issuer's stake weight multiplier at a time"""
+        return stake_weight(self.stake_at(issuer, timestamp))
+
+    def stakes_at(self, timestamp: Optional[float] = None, issuers: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Stakes of all issuers (ledger order, or the given issuers) at a time"""
+        with self._lock:
+            end = len(self._times) if timestamp is None else bisect_right(self._times, timestamp)
+            position = bisect_right(self._checkpoint_seqs, end) - 1
+            start, snapshot = self._checkpoint_seqs[position], self._checkpoints[position]
+
+            stakes = np.zeros(len(self.issuers))
+            stakes[:len(snapshot)] = snapshot
+            if end > start:
+                # Later events overwrite earlier ones: keep the last per issuer
+                index = np.array(self._event_issuers[start:end])[::-1]
+                values = np.array(self._event_balances[start:end])[::-1]
+                index, last = np.unique(index, return_index=True)
+                stakes[index] = values[last]
+
+        if issuers is None:
+            return stakes
+        positions = np.array([self.issuer_index.get(issuer, -1) for issuer in issuers], dtype=np.int64)
+        padded = np.append(stakes, 0.0)  # unknown issuers (-1) read the trailing zero
+        return padded[positions]
+
+    def weights_at(self, timestamp: Optional[float] = None, issuers: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Stake weight multipliers of all issuers (or the given issuers) at a time"""
+        return stake_weights(self.stakes_at(timestamp, issuers))
+
+    def history(self, issuer: Optional[str] = None) -> List[Dict]:
+        """Recorded events, optionally for one issuer (audit trail)"""
+        if issuer is None:
+            return list(self.events)
+        return [event for event in self.events if event["issuer"] == issuer]
+
+    def get_stats(self) -> Dict:
+        return {
+            "events": len(self.events),
+            "issuers": len(self.issuers),
+            "checkpoints": len(self._checkpoints) - 1,
+            "slashes": sum(1 for event in self.events if event["kind"] == "slash")
+        }
@@ -1,38 +1,47 @@
 
 
-import math
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .stake_ledger import StakeLedger, stake_weight
 
 
 class StakeValidator:
     """Validates and manages TRAC staking for Sybil resistance"""
     
-    def __init__(self):
-        self.stake_registry: Dict[str, float] = {}
+    def __init__(self, ledger: Optional[StakeLedger] = None):
+        # Every stake change is an event, so past stakes stay queryable
+        self.ledger = ledger if ledger is not None else StakeLedger()
         self.min_stake_for_high_trust = 100.0  # TRAC
         self.slashing_rate = 0.1  # 10%
     
-    def register_stake(self, issuer: str, amount: float):
+    @property
+    def stake_registry(self) -> Mapping[str, float]:
+        """Current stake per issuer (read-only: changes go through the ledger's events)"""
+        return MappingProxyType(self.ledger.balances)
+    
+    def register_stake(self, issuer: str, amount: float, timestamp: Optional[float] = None):
         """Register stake for an issuer"""
-        self.stake_registry[issuer] = amount
+        self.ledger.register(issuer, amount, timestamp)
         print(f"✓ Registered {amount} TRAC stake for {issuer[:12]}...")
     
-    def get_stake(self, issuer: str) -> float:
-        """Get stake amount for issuer"""
-        return self.stake_registry.get(issuer, 0.0)
+    def top_up_stake(self, issuer: str, amount: float, timestamp: Optional[float] = None) -> float:
+        """Add to an issuer's stake, returns the new stake"""
+        return self.ledger.top_up(issuer, amount, timestamp)["balance"]
+    
+    def get_stake(self, issuer: str, at: Optional[float] = None) -> float:
+        """Get stake amount for issuer (at a past time if given)"""
+        return self.ledger.stake_at(issuer, at)
     
-    def calculate_stake_weight(self, issuer: str) -> float:
+    def calculate_stake_weight(self, issuer: str, at: Optional[float] = None) -> float:
         """Calculate stake weight multiplier (0.5x - 2.0x)"""
-        stake = self.get_stake(issuer)
-        
-        # Logarithmic scaling: 100 TRAC = 1.0x, 1000 TRAC = 1.5x, 10000 TRAC = 2.0x
-        if stake == 0:
-            return 0.5  # Penalty for no stake
-        if stake < 100:
-            return 0.7
-        
-        weight = 1.0 + math.log10(stake / 100) * 0.5
-        return min(weight, 2.0)  # Cap at 2x
+        return stake_weight(self.get_stake(issuer, at))
+    
+    def stake_weights_at(self, at: Optional[float] = None, issuers: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Stake weight multipliers of many issuers at once (ledger order if issuers omitted)"""
+        return self.ledger.weights_at(at, issuers)
     
     def can_publish_high_trust(self, issuer: str, trust_score: float) -> bool:
         """Check if issuer can publish high-trust atom"""
@@ -42,14 +51,13 @@ class StakeValidator:
         stake = self.get_stake(issuer)
         return stake >= self.min_stake_for_high_trust
     
-    def simulate_dispute(self, issuer: str, fraudulent: bool = True) -> Dict:
+    def simulate_dispute(self, issuer: str, fraudulent: bool = True, timestamp: Optional[float] = None) -> Dict:
         """Simulate dispute and slashing"""
         stake = self.get_stake(issuer)
         
         if fraudulent and stake > 0:
-            slashed = stake * self.slashing_rate
-            remaining = stake - slashed
-            self.stake_registry[issuer] = remaining
+            event = self.ledger.slash(issuer, self.slashing_rate, timestamp)
+            slashed, remaining = event["amount"], event["balance"]
             
             print(f"⚠️  Slashed {slashed} TRAC from {issuer[:12]}... ({remaining} remaining)")
             return {"slashed": slashed, "remaining": remaining}
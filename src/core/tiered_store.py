@@ -0,0 +1,266 @@
+"""Tiered Atom Store - Index columns for every atom in memory, atom bodies paged in from disk
+
+A TieredAtomStore keeps what lookups and aggregates read (DIDs, overall,
+content, mode, content IDs, kaIds) for every atom, and leaves the rest of
+each record in its segment file, memory-mapped and decoded on access.
+Only three things hold whole records in memory:
+
+  hot rows      atoms appended since the last full segment was sealed
+  patches       updated records of sealed rows, until compaction folds
+                them back into their segments
+  target cache  records of recently queried targets (LRU, hot_records max),
+                which answer target queries for issued / timestamp
+
+The directory layout is the same as AtomStore's, so either class can open
+a store written by the other.
+"""
+
+import os
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+from .atom_store import AtomStore, PATCH_FILE, _locked
+from .atom_table import _RECORD_KEYS, AtomTable, SegmentView, map_segment, read_patches, read_segment, write_patches
+from .content_hash import atom_content_id
+
+# Record fields without an in-memory column: read from the record bodies
+BODY_FIELDS = ("issued", "timestamp")
+
+
+class TieredAtomStore(AtomStore):
+    """AtomStore over a segment directory whose memory doesn't grow with the atoms' bodies
+
+    Records returned by by_target may come from the target cache and be
+    shared between callers - treat them as read-only.
+    """
+
+    def __init__(
+        self,
+        storage_file: str = "local_atoms",
+        segment_size: int = 65536,
+        load_workers: int = 0,
+        hot_records: int = 100000,
+        compact_after: Optional[int] = None
+    ):
+        super().__init__(storage_file, segment_size, load_workers)
+        if not self.segmented:
+            raise ValueError(f"A tiered store needs a segment directory, not a .json file: {storage_file}")
+        self.table = AtomTable(pager=self._page)
+        self.hot_records = hot_records
+        self.compact_after = compact_after if compact_after is not None else max(1, segment_size // 4)
+
+        # Sealed segments (full, never rewritten except by compaction) and their first rows
+        self._views: List[SegmentView] = []
+        self._starts: List[int] = []
+        self._sealed = 0
+        # Bodies of rows from _sealed on; saved as a short last segment until full
+        self._hot = AtomTable()
+        self._hot_dirty = False
+        # Updated records of sealed rows: sealed row -> row in _patches
+        self._patches = AtomTable()
+        self._patch_rows: Dict[int, int] = {}
+        self._patches_saved = True
+
+        # Target DID code -> its records, least recently queried first
+        self._cache: "OrderedDict[int, List[Dict]]" = OrderedDict()
+        self._cached = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.paged_in = 0
+        self.compactions = 0
+
+    # -- Persistence ----------------------------------------------------------
+
+    def _load_segments(self):
+        manifest = self._read_manifest()
+        if manifest is None:
+            return
+        self.table.reserve(manifest["total"])
+        segments = self._segments
+        tail = segments[-1] if segments and segments[-1]["count"] < self.segment_size else None
+        for columns in self._read_segments(map_segment, segments[:-1] if tail else segments):
+            self.table.extend(columns)
+            self._seal(SegmentView(columns))
+        if tail:
+            columns = read_segment(self._segment_path(tail["file"]))
+            self.table.extend(columns)
+            self._hot.extend(columns)
+
+        patches = manifest.get("patches")
+        if patches:
+            for row, record in read_patches(self._segment_path(patches["file"])):
+                self._patch_rows[row] = self._patches.append(record)
+            for row in self._patch_rows:
+                self.table.update(row, {})       # index columns from the patched record
+
+    @_locked
+    def save(self):
+        """Seal full segments of hot rows, rewrite the short last segment and the patch file"""
+        os.makedirs(self.storage_file, exist_ok=True)
+        while len(self._hot) >= self.segment_size:
+            self._seal_hot()
+
+        if self._hot_dirty and len(self._hot):
+            name = f"segment-{len(self._views):06d}.npz"
+            self._write_segment(name, self._hot.segment(0, len(self._hot)))
+            del self._segments[len(self._views):]
+            self._segments.append({"file": name, "start": self._sealed, "count": len(self._hot)})
+        self._hot_dirty = False
+
+        if len(self._patch_rows) >= self.compact_after:
+            self.compact()
+            return
+        if not self._patches_saved:
+            rows = sorted(self._patch_rows)
+            write_patches(self._segment_path(PATCH_FILE + ".tmp"), rows,
+                          [self._patches.record(self._patch_rows[row]) for row in rows])
+            os.replace(self._segment_path(PATCH_FILE + ".tmp"), self._segment_path(PATCH_FILE))
+            self._patches_saved = True
+        self._write_manifest({"file": PATCH_FILE, "count": len(self._patch_rows)} if self._patch_rows else None)
+
+    @_locked
+    def compact(self):
+        """Rewrite the segments of patched rows with the patches applied, then drop the patches"""
+        os.makedirs(self.storage_file, exist_ok=True)
+        for number in sorted({bisect_right(self._starts, row) - 1 for row in self._patch_rows}):
+            start, count = self._starts[number], len(self._views[number])
+            table = AtomTable()
+            table.extend_records(self._page(start, start + count))
+            path = self._write_segment(self._segments[number]["file"], table.segment(0, count))
+            self._views[number] = SegmentView(map_segment(path))
+        self._patches = AtomTable()
+        self._patch_rows = {}
+        self._patches_saved = True
+        self.compactions += 1
+        self._write_manifest()
+
+    def _seal_hot(self):
+        """Write the first segment_size hot rows as a sealed segment and map it"""
+        name = f"segment-{len(self._views):06d}.npz"
+        path = self._write_segment(name, self._hot.segment(0, self.segment_size))
+        del self._segments[len(self._views):]
+        self._segments.append({"file": name, "start": self._sealed, "count": self.segment_size})
+        rest = AtomTable()
+        rest.extend_records(self._hot.records(self.segment_size, len(self._hot)))
+        self._hot = rest
+        self._seal(SegmentView(map_segment(path)))
+
+    def _seal(self, view: SegmentView):
+        self._starts.append(self._sealed)
+        self._views.append(view)
+        self._sealed += len(view)
+
+    # -- Records --------------------------------------------------------------
+
+    @_locked
+    def append(self, record: Dict) -> int:
+        """Add a record and index it, returns its position"""
+        if record.get("contentId") is None:
+            record["contentId"] = atom_content_id(record.get("trustAtom", {}))
+        self._hot.append(record)
+        self._hot_dirty = True
+        position = super().append(record)
+        self._forget(int(self.table.target[position]))
+        return position
+
+    @_locked
+    def update(self, cid: str, **fields) -> Optional[Dict]:
+        """Update non-indexed fields (kaId, mode, ...) of the record with this content ID"""
+        row = self._find(cid)
+        if row is None:
+            return None
+        record = self.table.update(row, fields)
+        if row >= self._sealed:
+            self._hot.update(row - self._sealed, fields)
+            self._hot_dirty = True
+        else:
+            patch = self._patch_rows.get(row)
+            if patch is None:
+                self._patch_rows[row] = self._patches.append(record)
+            else:
+                self._patches.update(patch, fields)
+            self._patches_saved = False
+        self._forget(int(self.table.target[row]))
+        return record
+
+    @_locked
+    def by_target(self, target: str) -> List[Dict]:
+        """Records about a target (kept in the target cache for later queries)"""
+        code = self.table.dids.codes.get(target)
+        if code is None:
+            return []
+        records = self._cache.get(code)
+        if records is not None:
+            self._cache.move_to_end(code)
+            self.cache_hits += 1
+            return records
+
+        self.cache_misses += 1
+        records = super().by_target(target)
+        if len(records) <= self.hot_records:
+            self._cache[code] = records
+            self._cached += len(records)
+            while self._cached > self.hot_records:
+                _, evicted = self._cache.popitem(last=False)
+                self._cached -= len(evicted)
+        return records
+
+    @_locked
+    def target_fields(self, target: str, rows: Sequence[int], names: Sequence[str]) -> Dict[str, List]:
+        """Selected fields of rows about a target; body fields come from the target cache"""
+        body = [name for name in names if name in BODY_FIELDS]
+        out = self.table.fields(rows, [name for name in names if name not in BODY_FIELDS])
+        if body:
+            records = dict(zip(self.target_rows(target).tolist(), self.by_target(target)))
+            for name in body:
+                out[name] = [
+                    records[row].get(name) if name in _RECORD_KEYS else (records[row].get("trustAtom") or {}).get(name)
+                    for row in list(rows)
+                ]
+        return out
+
+    def _forget(self, target: int):
+        records = self._cache.pop(target, None)
+        if records is not None:
+            self._cached -= len(records)
+
+    def _page(self, start: int, stop: int) -> List[Dict]:
+        """Records of rows [start, stop) from sealed segments, the hot rows and the patches"""
+        records = []
+        row = start
+        while row < min(stop, self._sealed):
+            number = bisect_right(self._starts, row) - 1
+            first = self._starts[number]
+            end = min(stop, first + len(self._views[number]))
+            records.extend(self._views[number].records(row - first, end - first))
+            self.paged_in += end - row
+            row = end
+        if row < stop:
+            records.extend(self._hot.records(row - self._sealed, stop - self._sealed))
+
+        if self._patch_rows and start < self._sealed:
+            rows = range(start, min(stop, self._sealed))
+            patched = (
+                [row for row in rows if row in self._patch_rows] if len(rows) < len(self._patch_rows)
+                else [row for row in self._patch_rows if start <= row < stop]
+            )
+            for row in patched:
+                records[row - start] = self._patches.record(self._patch_rows[row])
+        return records
+
+    @_locked
+    def get_stats(self) -> Dict:
+        stats = super().get_stats()
+        stats.update({
+            "sealedAtoms": self._sealed,
+            "hotAtoms": len(self._hot),
+            "patchedAtoms": len(self._patch_rows),
+            "cachedTargets": len(self._cache),
+            "cachedAtoms": self._cached,
+            "cacheHits": self.cache_hits,
+            "cacheMisses": self.cache_misses,
+            "pagedIn": self.paged_in,
+            "compactions": self.compactions
+        })
+        return stats
@@ -1,12 +1,16 @@
 """Trust Atom v7 - Multi-dimensional verifiable trust primitive"""
 
 from datetime import datetime
+from functools import cached_property
 from typing import Optional, Dict, List
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from .content_hash import atom_content_id
 
 
 class TrustVector(BaseModel):
-    """8-dimensional trust vector"""
+    """8-dimensional trust vector (immutable, so scores derived from it can be cached)"""
+    model_config = ConfigDict(frozen=True)
+    
     honesty: float = Field(default=0.5, ge=0, le=1)
     expertise: float = Field(default=0.5, ge=0, le=1)
     bias: float = Field(default=0.5, ge=0, le=1)
@@ -15,6 +19,33 @@ class TrustVector(BaseModel):
     alignment: float = Field(default=0.5, ge=0, le=1)
     responsiveness: float = Field(default=0.5, ge=0, le=1)
     stake_weight: float = Field(default=1.0, ge=0.5, le=2.0)
+    
+    @cached_property
+    def overall(self) -> float:
+        """Stake-weighted score, computed once per vector"""
+        score = vector_score(vars(self))
+        
+        # Apply stake multiplier (capped at 2x)
+        score *= min(self.stake_weight, 2.0)
+        
+        return max(0.0, min(1.0, score))
+
+
+def vector_score(vector: Dict) -> float:
+    """Weighted average of trust dimensions (trustVector dict), before stake weighting"""
+    def get(name: str) -> float:
+        return float(vector.get(name, 0.5))
+    
+    # Weighted average (bias is inverted - lower is better)
+    return (
+        get("honesty") * 0.25 +
+        get("expertise") * 0.20 +
+        (1 - get("bias")) * 0.10 +
+        get("safety") * 0.20 +
+        get("speed") * 0.10 +
+        get("alignment") * 0.15 +
+        get("responsiveness") * 0.10
+    )
 
 
 class TrustAtomV7(BaseModel):
@@ -33,24 +64,13 @@ class TrustAtomV7(BaseModel):
     
     @property
     def overall(self) -> float:
-        """Calculate weighted overall score"""
-        tv = self.trust_vector
-        
-        # Weighted average (bias is inverted - lower is better)
-        score = (
-            tv.honesty * 0.25 +
-            tv.expertise * 0.20 +
-            (1 - tv.bias) * 0.10 +
-            tv.safety * 0.20 +
-            tv.speed * 0.10 +
-            tv.alignment * 0.15 +
-            tv.responsiveness * 0.10
-        )
-        
-        # Apply stake multiplier (capped at 2x)
-        score *= min(tv.stake_weight, 2.0)
-        
-        return max(0.0, min(1.0, score))
+        """Calculate weighted overall score (cached on the immutable trust vector)"""
+        return self.trust_vector.overall
+    
+    @property
+    def base_score(self) -> float:
+        """Overall score without the stake multiplier"""
+        return max(0.0, min(1.0, vector_score(vars(self.trust_vector))))
     
     def to_jsonld(self) -> Dict:
         """Export as JSON-LD for DKG"""
@@ -73,10 +93,29 @@ class TrustAtomV7(BaseModel):
             "issued": self.issued
         }
     
+    @classmethod
+    def from_jsonld(cls, data: Dict) -> "TrustAtomV7":
+        """Rebuild a Trust Atom from its to_jsonld() export"""
+        return cls(
+            issuer=data["issuer"],
+            target=data["target"],
+            trust_vector=TrustVector(**data.get("trustVector", {})),
+            content=data.get("content", ""),
+            evidence_ka=data.get("evidenceKA") or [],
+            expires=data.get("expires"),
+            replaces=data.get("replaces"),
+            required_stake=data.get("requiredStake", "0"),
+            x402_config=data.get("x402"),
+            issued=data["issued"]
+        )
+    
+    def content_id(self) -> str:
+        """Deterministic content hash (ignores issue time)"""
+        return atom_content_id(self.to_jsonld())
+    
     def to_dkg_asset(self) -> Dict:
         """Convert to DKG Knowledge Asset format - Fixed protected term conflict"""
-        import uuid
-        atom_id = f"urn:trustgraph:atom:{uuid.uuid4()}"
+        atom_id = f"urn:trustgraph:atom:{self.content_id()}"
         
         return {
             "public": {
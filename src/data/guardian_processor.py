@@ -95,6 +95,14 @@ class GuardianProcessor:
         print(f"✓ Processed {self.processed_count} Guardian edges into Trust Atoms")
         return atoms
     
+    @staticmethod
+    def node_attribute(guardian_data: Dict, attribute: str = "platform") -> Dict[str, str]:
+        """Map node DID → attribute value (e.g. platform) for grouped queries"""
+        return {
+            node["did"]: node.get(attribute, "unknown")
+            for node in guardian_data["nodes"]
+        }
+    
     @staticmethod
     def _random_hash(length: int) -> str:
         """Generate random hex hash"""
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Store Sync - Exchange only the missing Trust Atoms between two local stores
+
+    python sync_stores.py local_atoms.json other_node/local_atoms.json
+    python sync_stores.py local_atoms.json http://node-b:3000 [--pull-only]
+
+A peer is either another store file or a running MCP server (/sync endpoints).
+"""
+
+import argparse
+import os
+
+from src.core.atom_store import AtomStore
+from src.core.delta_sync import DeltaSync, HTTPSyncPeer, StoreReplica
+
+
+def _open_store(path: str) -> AtomStore:
+    store = AtomStore(path)
+    store.load()
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("store", help="Local store file")
+    parser.add_argument("peer", help="Peer store file or MCP server URL")
+    parser.add_argument("--pull-only", action="store_true", help="Don't send our atoms to the peer")
+    parser.add_argument("--secret", default=os.getenv("SYNC_PEER_SECRET"), help="Peer's SYNC_PEER_SECRET (for URLs)")
+    args = parser.parse_args()
+
+    local = _open_store(args.store)
+    if args.peer.startswith(("http://", "https://")):
+        peer_store = None
+        peer = HTTPSyncPeer(args.peer, secret=args.secret)
+    else:
+        peer_store = _open_store(args.peer)
+        peer = StoreReplica(peer_store)
+
+    print(f"🔄 Syncing {args.store} ({len(local)} atoms) with {args.peer}")
+    result = DeltaSync(StoreReplica(local)).sync(peer, push=not args.pull_only)
+
+    if result["pulled"]:
+        local.save()
+    if peer_store is not None and result["pushed"]:
+        peer_store.save()
+
+    print(f"✅ Pulled {result['pulled']} atoms, pushed {result['pushed']} ({result['mode']})")
+    print(f"   Round trips: {result['roundTrips']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Anomaly Detection Tests"""
+
+import os
+import random
+import tempfile
+
+from src.core.anomaly import AnomalyDetector, AnomalyRejected, ExponentialHistogram, WindowedCountMin, sketch_indexes
+from src.core.dkg_publisher import DKGPublisher
+from src.core.trust_atom import TrustAtomV7, TrustVector
+
+
+class _Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_sketches():
+    """Test 1: Windowed count-min never under-counts and forgets old buckets; EH tracks the window"""
+    print("Test 1: Sketches")
+
+    sketch = WindowedCountMin(window=60, buckets=6, width=256, depth=4)
+    rng = random.Random(2)
+    exact = {}
+    for i in range(3000):
+        key = f"did:{int(rng.paretovariate(1.2)) % 500}"
+        exact[key] = exact.get(key, 0) + 1
+        sketch.add(sketch_indexes(key, 256, 4), now=5.0)
+    for key, count in exact.items():
+        assert sketch.estimate(sketch_indexes(key, 256, 4), 5.0) >= count
+    assert sketch.estimate(sketch_indexes("did:1", 256, 4), 5.0 + 60) == 0
+
+    histogram = ExponentialHistogram(window=10, k=8)
+    times = sorted(rng.uniform(0, 100) for _ in range(5000))
+    for t in times:
+        histogram.add(t)
+    exact_recent = sum(1 for t in times if t > times[-1] - 10)
+    assert abs(histogram.count(times[-1]) - exact_recent) <= exact_recent / 8 + 1
+    print("✅ Pass\n")
+
+
+def test_bursts_flagged():
+    """Test 2: Issuer bursts and sudden target spikes are flagged; steady traffic is not"""
+    print("Test 2: Burst detection")
+
+    clock = _Clock()
+    detector = AnomalyDetector(clock=clock, issuer_limit=30, min_count=10)
+    for i in range(500):
+        clock.now += 7.0    # one atom every 7 s from different issuers: steady
+        assert not detector.observe(f"did:key:{i % 40}", f"did:web:site{i % 5}")["anomalous"]
+
+    verdicts = [detector.observe("did:key:spammer", f"did:web:t{i}") for i in range(30)]
+    assert not verdicts[8]["anomalous"] and "issuer_burst" in verdicts[9]["reasons"]
+    assert "issuer_limit" in verdicts[-1]["reasons"]
+
+    verdicts = [detector.observe(f"did:key:ring{i}", "did:web:fresh") for i in range(12)]
+    assert "target_burst" in verdicts[-1]["reasons"]
+    assert "did:key:spammer" in detector.flagged and "did:web:fresh" in detector.flagged
+
+    clock.now += 120
+    assert not detector.observe("did:key:spammer", "did:web:later")["anomalous"]
+    print("✅ Pass\n")
+
+
+def test_publisher_throttle_and_quarantine():
+    """Test 3: The publisher rejects or holds anomalous atoms before storing them"""
+    print("Test 3: Throttle / quarantine")
+
+    for action in ("throttle", "quarantine"):
+        detector = AnomalyDetector(action=action, clock=_Clock(), issuer_limit=5)
+        publisher = DKGPublisher(storage_file=os.path.join(tempfile.mkdtemp(), "atoms.json"), anomaly_detector=detector)
+        publisher.dkg_configured = False
+        atoms = [
+            TrustAtomV7(issuer="did:key:burst", target=f"did:web:{i}", trust_vector=TrustVector(honesty=0.9))
+            for i in range(8)
+        ]
+        for atom in atoms[:4]:
+            publisher.publish_trust_atom(atom)
+        try:
+            publisher.publish_trust_atom(atoms[4])
+            assert False, "anomalous atom stored"
+        except AnomalyRejected as rejected:
+            assert rejected.verdict["action"] == action and rejected.retry_after > 0
+
+        results = publisher.publish_batch(atoms[5:])
+        assert [r["success"] for r in results] == [False, False, False]
+        assert len(publisher.published_atoms) == 4
+        assert len(detector.quarantine) == (4 if action == "quarantine" else 0)
+        assert publisher.get_stats()["anomalies"]["anomalies"] == 4
+
+    content_id = next(iter(detector.quarantine))
+    assert publisher.release_quarantined(content_id).startswith("local:")
+    assert len(publisher.published_atoms) == 5 and len(detector.quarantine) == 3
+    print("✅ Pass\n")
+
+
+def test_quarantine_persisted_and_bounded():
+    """Test 4: Quarantine survives restarts, refuses atoms when full, and screens collections too"""
+    print("Test 4: Quarantine log")
+
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, "quarantine.log")
+    detector = AnomalyDetector(action="quarantine", clock=_Clock(), issuer_limit=2, max_quarantine=3, quarantine_file=path)
+    publisher = DKGPublisher(storage_file=os.path.join(tmp, "atoms.json"), anomaly_detector=detector)
+    publisher.dkg_configured = False
+    atoms = [
+        TrustAtomV7(issuer="did:key:burst", target=f"did:web:{i}", trust_vector=TrustVector(honesty=0.9))
+        for i in range(8)
+    ]
+
+    results = publisher.publish_batch(atoms[:6], collection_size=3)
+    assert [r["success"] for r in results] == [True, False, False, False, False, False]
+    assert [r["anomaly"]["action"] for r in results[1:]] == ["quarantine"] * 3 + ["throttle"] * 2
+    assert results[-1]["anomaly"]["quarantineFull"] and len(detector.quarantine) == 3
+
+    held = detector.quarantine.held()
+    assert publisher.release_quarantined(held[0]["contentId"]).startswith("local:")
+    assert publisher.discard_quarantined(held[1]["contentId"])
+
+    restarted = AnomalyDetector(action="quarantine", quarantine_file=path)
+    assert list(restarted.quarantine) == [held[2]["contentId"]]
+    assert restarted.quarantine.get(held[2]["contentId"])["atom"] == held[2]["atom"]
+    print("✅ Pass\n")
+
+
+def main():
+    print("🧪 Running Anomaly Detection Tests\n")
+
+    test_sketches()
+    test_bursts_flagged()
+    test_publisher_throttle_and_quarantine()
+    test_quarantine_persisted_and_bounded()
+
+    print("🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Atom Export / Import Tests"""
+
+import io
+import json
+import os
+import tempfile
+
+from src.core.atom_io import _JSONStream, import_records, iter_json_array, iter_records, write_records
+from src.core.atom_store import AtomStore
+from src.core.trust_atom import TrustAtomV7, TrustVector
+
+
+def _store(path, n=5):
+    store = AtomStore(path)
+    for i in range(n):
+        atom = TrustAtomV7(
+            issuer=f"did:key:{i}",
+            target="did:web:shop",
+            trust_vector=TrustVector(honesty=i / n),
+            content="" if i == 0 else f'review "{i}" [with] {{brackets}}',
+            x402_config={"price": "0.001"} if i % 2 else None
+        )
+        store.append({"kaId": f"local:{i}", "trustAtom": atom.to_jsonld(), "timestamp": atom.issued, "mode": "LOCAL"})
+    store.save()
+    return store
+
+
+def test_export_roundtrip():
+    """Test 1: NDJSON (gzip) and columnar exports read back identical records"""
+    print("Test 1: Export roundtrip")
+
+    directory = tempfile.mkdtemp()
+    store = _store(os.path.join(directory, "atoms.json"))
+    for name in ("atoms.ndjson", "atoms.ndjson.gz", "atoms.npz"):
+        path = os.path.join(directory, name)
+        assert write_records(iter_records(store.storage_file), path) == 5
+        assert list(iter_records(path)) == store.atoms, name
+    print("✅ Pass\n")
+
+
+def test_incremental_parser_small_chunks():
+    """Test 2: The incremental parser handles values split across reads"""
+    print("Test 2: Incremental JSON parsing")
+
+    document = {"total": 12345, "uals": ["a", "b"], "atoms": [{"x": 1.25, "s": "]},{"}, 123456789, [], {}]}
+    text = json.dumps(document, indent=2)
+    for chunk_size in (1, 2, 3, 7, 64):
+        header = {}
+        stream = _JSONStream(io.StringIO(text), chunk_size)
+        assert stream.value() == document
+        path = os.path.join(tempfile.mkdtemp(), "doc.json")
+        with open(path, "w") as f:
+            f.write(text)
+        assert list(iter_json_array(path, "atoms", header)) == document["atoms"]
+        assert header == {"total": 12345, "uals": ["a", "b"]}
+    print("✅ Pass\n")
+
+
+def test_import_merges_and_skips_existing():
+    """Test 3: Import appends new atoms, skips stored and repeated ones, and keeps UALs of published_uals.json"""
+    print("Test 3: Import")
+
+    directory = tempfile.mkdtemp()
+    source = _store(os.path.join(directory, "source.json"))
+    export = os.path.join(directory, "atoms.ndjson")
+    write_records(iter_records(source.storage_file), export)
+
+    destination = os.path.join(directory, "dest.json")
+    assert import_records(iter_records(export), destination)["imported"] == 5
+    result = import_records(iter_records(export), destination)
+    assert result == {"existing": 5, "imported": 0, "duplicates": 5, "total": 5}
+
+    atom = TrustAtomV7(issuer="did:key:new", target="did:web:shop")
+    uals_file = os.path.join(directory, "published_uals.json")
+    with open(uals_file, "w") as f:
+        json.dump({"total": 1, "uals": ["did:dkg:otp:20430/0xabc/7"], "atoms": [atom.to_jsonld()]}, f)
+    assert import_records(iter_records(uals_file), destination)["imported"] == 1
+
+    loaded = AtomStore(destination)
+    assert loaded.load() == 6
+    assert loaded.atoms[:5] == source.atoms
+    assert loaded.atoms[5]["kaId"] == "did:dkg:otp:20430/0xabc/7"
+    assert loaded.atoms[5]["mode"] == "DKG_TESTNET"
+    assert loaded.atoms[5]["contentId"] == atom.content_id()
+
+    # Atoms repeated within the source are imported once, legacy non-hex IDs included
+    repeated = [dict(record) for record in loaded.atoms[:2]] + [dict(loaded.atoms[0], contentId="legacy:1")] * 2
+    for path in (os.path.join(directory, "fresh.json"), os.path.join(directory, "fresh")):
+        result = import_records(repeated + repeated, path)
+        assert result == {"existing": 0, "imported": 3, "duplicates": 5, "total": 3}, path
+    print("✅ Pass\n")
+
+
+def main():
+    print("🧪 Running Atom Export / Import Tests\n")
+
+    test_export_roundtrip()
+    test_incremental_parser_small_chunks()
+    test_import_merges_and_skips_existing()
+
+    print("🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
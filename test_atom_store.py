@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""Atom Store and Publisher Index Tests"""
+
+import os
+import tempfile
+import threading
+
+from src.core.atom_store import AtomStore
+from src.core.content_hash import atom_content_id, local_ka_id
+from src.core.dkg_publisher import DKGPublisher
+from src.core.tiered_store import TieredAtomStore
+from src.core.trust_atom import TrustAtomV7, TrustVector
+
+
+def _record(issuer, target, overall=0.5):
+    return {
+        "kaId": f"local:{issuer}-{target}",
+        "trustAtom": {"issuer": issuer, "target": target, "overall": overall},
+        "mode": "LOCAL"
+    }
+
+
+def _store():
+    store = AtomStore(os.path.join(tempfile.mkdtemp(), "atoms.json"))
+    for issuer, target in [("a", "b"), ("b", "a"), ("b", "c"), ("c", "d"), ("a", "c"), ("a", "b")]:
+        store.append(_record(issuer, target))
+    return store
+
+
+def test_issuer_and_target_indexes():
+    """Test 1: Records are indexed by issuer and target"""
+    print("Test 1: Issuer and target indexes")
+
+    store = _store()
+    assert len(store.by_issuer("a")) == 3
+    assert len(store.by_target("c")) == 2
+    assert store.by_issuer("zzz") == []
+    assert store.trusted_by("a") == {"b", "c"}
+    assert store.trusters_of("a") == {"b"}
+    print("✅ Pass\n")
+
+
+def test_neighborhood_and_mutual():
+    """Test 2: k-hop neighborhoods and mutual trust"""
+    print("Test 2: Neighborhood and mutual trust")
+
+    store = _store()
+    assert store.neighborhood("a", hops=1) == {"b": 1, "c": 1}
+    assert store.neighborhood("a", hops=2) == {"b": 1, "c": 1, "d": 2}
+    assert store.neighborhood("d", hops=2, direction="in") == {"c": 1, "a": 2, "b": 2}
+    assert store.mutual_trust("a") == ["b"]
+    assert store.mutual_trust("d") == []
+    print("✅ Pass\n")
+
+
+def test_store_round_trip():
+    """Test 3: Indexes are rebuilt when the store is reloaded"""
+    print("Test 3: Store round trip")
+
+    store = _store()
+    store.save()
+    reloaded = AtomStore(store.storage_file)
+    assert reloaded.load() == 6
+    assert reloaded.mutual_trust("b") == ["a"]
+    print("✅ Pass\n")
+
+
+def test_publisher_queries():
+    """Test 4: Publisher exposes issuer and neighborhood queries"""
+    print("Test 4: Publisher queries")
+
+    publisher = DKGPublisher(storage_file=os.path.join(tempfile.mkdtemp(), "atoms.json"))
+    for issuer, target in [("did:a", "did:b"), ("did:b", "did:a"), ("did:b", "did:c")]:
+        publisher.publish_trust_atom(TrustAtomV7(
+            issuer=issuer,
+            target=target,
+            trust_vector=TrustVector(honesty=0.6)
+        ))
+
+    assert [a["target"] for a in publisher.query_by_issuer("did:b")] == ["did:a", "did:c"]
+    assert len(publisher.query_trust_atoms("did:a")) == 1
+    assert publisher.get_mutual_trust("did:a")["mutual"] == ["did:b"]
+    neighborhood = publisher.get_trust_neighborhood("did:a", hops=2)
+    assert neighborhood["neighborhood"] == {"1": ["did:b"], "2": ["did:c"]}
+    print("✅ Pass\n")
+
+
+def test_publisher_deduplicates():
+    """Test 5: Identical atoms get one content-addressed ID and are stored once"""
+    print("Test 5: Publisher deduplication")
+
+    publisher = DKGPublisher(storage_file=os.path.join(tempfile.mkdtemp(), "atoms.json"))
+    atoms = [
+        TrustAtomV7(issuer="did:a", target="did:b", trust_vector=TrustVector(honesty=0.6))
+        for _ in range(3)
+    ]
+    atoms.append(TrustAtomV7(issuer="did:a", target="did:c"))
+
+    results = publisher.publish_batch(atoms)
+    assert len({r["kaId"] for r in results}) == 2
+    assert [r.get("duplicate", False) for r in results] == [False, True, True, False]
+    assert publisher.publish_trust_atom(atoms[0]) == results[0]["kaId"]
+    assert len(publisher.published_atoms) == 2
+
+    reloaded = DKGPublisher(storage_file=publisher.local_storage_file)
+    assert atoms[0].content_id() in reloaded.store
+    print("✅ Pass\n")
+
+
+def test_segment_round_trip():
+    """Test 6: A segment directory reloads in parallel to the same records, updates included"""
+    print("Test 6: Segment directory round trip")
+
+    directory = os.path.join(tempfile.mkdtemp(), "atoms")
+    store = AtomStore(directory, segment_size=4)
+    for i in range(10):
+        jsonld = TrustAtomV7(issuer=f"did:{i % 3}", target=f"did:{i % 4}", content=f"atom {i}").to_jsonld()
+        store.append({
+            "kaId": f"ual:{i}" if i == 7 else local_ka_id(atom_content_id(jsonld)),
+            "contentId": atom_content_id(jsonld),
+            "trustAtom": jsonld,
+            "timestamp": "2025-01-01T00:00:00",
+            "mode": "LOCAL"
+        })
+    store.append({"contentId": "not-a-hash", "trustAtom": {"issuer": "did:0", "extra": [1, 2]}})
+    records = list(store.atoms)
+    store.save()
+    assert sorted(os.listdir(directory)) == [
+        "manifest.json", "segment-000000.npz", "segment-000001.npz", "segment-000002.npz"
+    ]
+
+    reloaded = AtomStore(directory, segment_size=4, load_workers=3)
+    assert reloaded.load() == 11
+    assert list(reloaded.atoms) == records
+    assert reloaded.get_by_content_id("not-a-hash")["trustAtom"]["extra"] == [1, 2]
+    assert len(reloaded.by_issuer("did:0")) == 5
+    assert reloaded.mode_counts() == {"LOCAL": 10}
+
+    reloaded.update(records[2]["contentId"], kaId="ual:2", mode="DKG_TESTNET")
+    reloaded.append(dict(records[0], contentId="f" * 64))
+    reloaded.save()
+    again = AtomStore(directory, segment_size=4)
+    again.load()
+    assert again.get_by_content_id(records[2]["contentId"])["kaId"] == "ual:2"
+    assert again.mode_counts() == {"LOCAL": 10, "DKG_TESTNET": 1}
+    assert again.get_by_content_id("f" * 64)["trustAtom"] == records[0]["trustAtom"]
+    assert list(again.atoms)[:2] == records[:2]
+    print("✅ Pass\n")
+
+
+def test_ranked_pages():
+    """Test 7: Ranked pages match a full sort, appended rows included"""
+    print("Test 7: Ranked pages")
+
+    written = AtomStore(os.path.join(tempfile.mkdtemp(), "atoms"))
+    scores = [(i * 37 % 101) / 100 for i in range(300)]
+    written.table.extend_records([_record(f"i{i % 3}", "t", overall) for i, overall in enumerate(scores)])
+    written.save()
+    store = AtomStore(written.storage_file)
+    store.load()
+    for overall in scores[:20]:
+        store.append(_record("i0", "t", overall))
+    scores += scores[:20]
+
+    expected = sorted(range(len(scores)), key=lambda row: (-scores[row], row))
+    rows, after = [], None
+    while True:
+        page = store.ranked_rows("t", after=after, limit=33)
+        if not page:
+            break
+        rows += page
+        after = page[-1]
+    assert rows == expected
+    assert store.atom_count("t") == 320 and store.atom_count("i0", by="issuer") == 120
+    assert store.ranked_rows("i1", by="issuer", limit=5) == [row for row in expected if row < 300 and row % 3 == 1][:5]
+    assert store.ranked_rows("nobody") == []
+    print("✅ Pass\n")
+
+
+def test_publisher_pages():
+    """Test 8: Listings page with a cursor and project the requested fields"""
+    print("Test 8: Publisher pagination and projection")
+
+    publisher = DKGPublisher(storage_file=os.path.join(tempfile.mkdtemp(), "atoms.json"))
+    for i in range(25):
+        publisher.publish_trust_atom(TrustAtomV7(
+            issuer=f"did:i{i}",
+            target="did:t",
+            trust_vector=TrustVector(honesty=(i % 10) / 10)
+        ))
+        publisher.publish_trust_atom(TrustAtomV7(issuer="did:t", target=f"did:i{i}"))
+
+    seen, cursor = [], None
+    while True:
+        page = publisher.list_trust_atoms("did:t", limit=10, cursor=cursor, fields=["issuer", "overall"])
+        assert page["atomCount"] == 25 and all(set(atom) == {"issuer", "overall"} for atom in page["atoms"])
+        seen += page["atoms"]
+        cursor = page["nextCursor"]
+        if cursor is None:
+            break
+    assert len(seen) == 25 and len({atom["issuer"] for atom in seen}) == 25
+    assert [float(atom["overall"]) for atom in seen] == sorted((float(atom["overall"]) for atom in seen), reverse=True)
+
+    by_issuer = publisher.list_atoms_by_issuer("did:t", limit=5000)
+    assert by_issuer["issuer"] == "did:t" and len(by_issuer["atoms"]) == 25 and by_issuer["nextCursor"] is None
+    for bad in ({"cursor": "x"}, {"cursor": "999"}, {"fields": ["secret"]}):
+        try:
+            publisher.list_trust_atoms("did:t", **bad)
+            assert False, bad
+        except ValueError:
+            pass
+
+    reputation = publisher.get_aggregate_reputation("did:t")
+    assert [a["issuer"] for a in reputation["atoms"]] == [a["issuer"] for a in seen[:10]]
+
+    first = publisher.get_mutual_trust("did:t", limit=20)
+    second = publisher.get_mutual_trust("did:t", limit=20, cursor=first["nextCursor"])
+    assert first["mutualCount"] == 25 and second["nextCursor"] is None
+    assert first["mutual"] + second["mutual"] == publisher.get_mutual_trust("did:t")["mutual"]
+    print("✅ Pass\n")
+
+
+def test_concurrent_appends():
+    """Test 9: Appends, updates and reads from several threads keep every record"""
+    print("Test 9: Concurrent appends")
+
+    directory = tempfile.mkdtemp()
+    for store in (AtomStore(os.path.join(directory, "atoms")), TieredAtomStore(os.path.join(directory, "tiered"), segment_size=4096)):
+        def append(worker):
+            for i in range(2000):
+                record = _record(f"i{worker}", f"t{i % 50}", i / 2000)
+                record["trustAtom"]["content"] = f"{worker}-{i}"
+                position = store.append(record)
+                if i % 7 == 0:
+                    store.update(record["contentId"], mode="DKG_TESTNET")
+                if i % 500 == 0:
+                    assert store.get_by_content_id(record["contentId"])["trustAtom"]["content"] == f"{worker}-{i}"
+                    assert position < len(store)
+
+        def read():
+            for _ in range(3):
+                for record in store.atoms:
+                    assert record["trustAtom"]["issuer"].startswith("i")
+                store.ranked_rows("t0", limit=20)
+
+        threads = [threading.Thread(target=append, args=(worker,)) for worker in range(4)]
+        threads.append(threading.Thread(target=read))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(store) == 8000
+        records = list(store.atoms)
+        assert all(store.position(record["contentId"]) == row for row, record in enumerate(records))
+        assert store.mode_counts()["DKG_TESTNET"] == 4 * 286
+        assert store.atom_count("t0") == 4 * 40
+        store.save()
+        reloaded = type(store)(store.storage_file)
+        assert reloaded.load() == 8000 and list(reloaded.atoms) == records
+    print("✅ Pass\n")
+
+
+def main():
+    print("🧪 Running Atom Store Tests\n")
+
+    test_issuer_and_target_indexes()
+    test_neighborhood_and_mutual()
+    test_store_round_trip()
+    test_publisher_queries()
+    test_publisher_deduplicates()
+    test_segment_round_trip()
+    test_ranked_pages()
+    test_publisher_pages()
+    test_concurrent_appends()
+
+    print("🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
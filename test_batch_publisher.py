@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Batched DKG Publishing Tests (against the in-process fake DKG)"""
+
+import os
+import tempfile
+import time
+
+from src.core.batch_publisher import BatchPublisher
+from src.core.dkg_publisher import DKGPublisher
+from src.core.fake_dkg import FakeDKG
+from src.core.trust_atom import TrustAtomV7, TrustVector
+
+
+def _atoms(n, issuer="did:key:batch"):
+    return [
+        TrustAtomV7(issuer=issuer, target=f"did:web:target{i}", trust_vector=TrustVector(honesty=0.6))
+        for i in range(n)
+    ]
+
+
+def _publisher(dkg):
+    return DKGPublisher(storage_file=os.path.join(tempfile.mkdtemp(), "atoms.json"), dkg=dkg)
+
+
+def test_collection_packs_atoms():
+    """Test 1: One DKG call per collection, one sub-ID per atom"""
+    print("Test 1: Collection packing")
+
+    dkg = FakeDKG()
+    publisher = _publisher(dkg)
+    atoms = _atoms(25)
+    results = publisher.publish_batch(atoms + atoms[:3], collection_size=10)
+
+    assert dkg.create_calls == 3
+    assert len(dkg.published_nodes()) == 25
+    assert all(r["success"] for r in results)
+    assert [r.get("duplicate", False) for r in results].count(True) == 3
+
+    first = publisher.published_atoms[0]
+    assert first["kaId"].startswith(first["collection"] + "#")
+    assert len({r["kaId"] for r in results}) == 25
+    assert publisher.get_stats()["dkgPublished"] == 25
+    print("✅ Pass\n")
+
+
+def test_collection_falls_back_to_local():
+    """Test 2: Unreachable node stores the whole collection locally"""
+    print("Test 2: Local fallback")
+
+    dkg = FakeDKG()
+    dkg.available = False
+    publisher = _publisher(dkg)
+    results = publisher.publish_collection(_atoms(5))
+
+    assert all(r["kaId"].startswith("local:") for r in results)
+    assert publisher.get_stats()["localPublished"] == 5
+    print("✅ Pass\n")
+
+
+def test_batch_publisher_size_and_timeout():
+    """Test 3: BatchPublisher flushes on size and on timeout"""
+    print("Test 3: Size and timeout flush")
+
+    dkg = FakeDKG()
+    batcher = BatchPublisher(_publisher(dkg), batch_size=4, flush_interval=0.2)
+
+    futures = [batcher.submit(atom) for atom in _atoms(6)]
+    assert dkg.create_calls == 1
+    assert all(f.done() for f in futures[:4])
+
+    deadline = time.time() + 5
+    while not futures[-1].done() and time.time() < deadline:
+        time.sleep(0.02)
+    assert dkg.create_calls == 2
+    assert futures[-1].result().startswith("did:dkg:")
+
+    batcher.close()
+    assert batcher.get_stats()["atomsPublished"] == 6
+    print("✅ Pass\n")
+
+
+def test_leftover_keeps_its_deadline():
+    """Test 4: Atoms left after a partial flush are flushed flush_interval after they arrived"""
+    print("Test 4: Leftover deadline")
+
+    dkg = FakeDKG()
+    batcher = BatchPublisher(_publisher(dkg), batch_size=10, flush_interval=0.6)
+    start = time.monotonic()
+    futures = [batcher.submit(atom) for atom in _atoms(3)]
+
+    time.sleep(0.4)
+    batcher.batch_size = 2
+    assert batcher.flush() == 2
+
+    # Due 0.6s after submit, not 0.6s after the partial flush
+    assert futures[-1].result(timeout=5).startswith("did:dkg:")
+    assert time.monotonic() - start < 0.85
+    batcher.close()
+    print("✅ Pass\n")
+
+
+def main():
+    print("🧪 Running Batch Publisher Tests\n")
+
+    test_collection_packs_atoms()
+    test_collection_falls_back_to_local()
+    test_batch_publisher_size_and_timeout()
+    test_leftover_keeps_its_deadline()
+
+    print("🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
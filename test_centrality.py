@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Graph Centrality Tests"""
+
+import random
+
+import networkx as nx
+import numpy as np
+
+from src.algorithms.centrality import approximate_betweenness, degree_distribution, hits_scores, weighted_degrees
+from src.algorithms.graph_builder import TrustGraphBuilder
+
+
+def _graph(nodes=150, edges=900, seed=1):
+    rng = random.Random(seed)
+    builder = TrustGraphBuilder("mean")
+    for _ in range(edges):
+        builder.add_edge(f"did:{rng.randrange(nodes)}", f"did:{rng.randrange(nodes)}", rng.random() + 0.01)
+    graph = builder.build()
+    reference = nx.DiGraph()
+    reference.add_nodes_from(str(node) for node in graph.nodes)
+    reference.add_weighted_edges_from(graph.iter_edges())
+    return graph, reference
+
+
+def _aligned(graph, scores):
+    return np.array([scores[str(node)] for node in graph.nodes])
+
+
+def test_hits():
+    """Test 1: HITS hubs and authorities match networkx"""
+    print("Test 1: HITS")
+
+    graph, reference = _graph()
+    hubs, authorities = hits_scores(graph, iterations=500, tol=1e-14)
+    expected_hubs, expected_authorities = (_aligned(graph, s) for s in nx.hits(reference, max_iter=1000, tol=1e-12))
+    assert np.allclose(hubs, expected_hubs / expected_hubs.max(), atol=1e-8)
+    assert np.allclose(authorities, expected_authorities / expected_authorities.max(), atol=1e-8)
+
+    # A node endorsing every trusted target is the top hub
+    builder = TrustGraphBuilder()
+    for target in ("did:b", "did:c", "did:d"):
+        builder.add_edge("did:a", target, 1.0)
+    builder.add_edge("did:e", "did:b", 1.0)
+    small = builder.build()
+    hubs, authorities = hits_scores(small)
+    assert small.nodes[np.argmax(hubs)] == "did:a" and small.nodes[np.argmax(authorities)] == "did:b"
+    print("✅ Pass\n")
+
+
+def test_degree_distribution():
+    """Test 2: Weighted degrees and their summary"""
+    print("Test 2: Degree distribution")
+
+    graph, reference = _graph()
+    out_weight, in_weight = weighted_degrees(graph)
+    assert np.allclose(out_weight, _aligned(graph, dict(reference.out_degree(weight="weight"))))
+    assert np.allclose(in_weight, _aligned(graph, dict(reference.in_degree(weight="weight"))))
+
+    distribution = degree_distribution(graph, bins=5)
+    for direction, weights in (("out", out_weight), ("in", in_weight)):
+        summary = distribution[direction]
+        assert np.isclose(summary["mean"], weights.mean()) and np.isclose(summary["max"], weights.max())
+        assert sum(bucket["nodes"] for bucket in summary["histogram"]) == int((weights > 0).sum())
+        assert len(summary["histogram"]) == 5 and set(summary["percentiles"]) == {"p50", "p90", "p99"}
+    assert distribution["out"]["isolated"] == sum(1 for _, d in reference.out_degree() if d == 0)
+    print("✅ Pass\n")
+
+
+def test_exact_betweenness():
+    """Test 3: Betweenness over every source matches networkx, serial or in a process pool"""
+    print("Test 3: Exact betweenness")
+
+    graph, reference = _graph()
+    expected = _aligned(graph, nx.betweenness_centrality(reference))
+    assert np.allclose(approximate_betweenness(graph, samples=None), expected)
+    assert np.allclose(approximate_betweenness(graph, samples=None, workers=2), expected)
+
+    # Edges with weight <= 0 (distrust) don't carry paths
+    builder = TrustGraphBuilder()
+    builder.add_edge("did:a", "did:b", 1.0)
+    builder.add_edge("did:b", "did:c", 1.0)
+    builder.add_edge("did:c", "did:d", -1.0)
+    chain = builder.build()
+    assert list(approximate_betweenness(chain, samples=None, normalized=False)) == [0.0, 1.0, 0.0, 0.0]
+    print("✅ Pass\n")
+
+
+def test_sampled_betweenness():
+    """Test 4: Sampled sources estimate betweenness and find the brokers"""
+    print("Test 4: Sampled betweenness")
+
+    graph, reference = _graph(nodes=400, edges=2400)
+    expected = _aligned(graph, nx.betweenness_centrality(reference))
+    estimate = approximate_betweenness(graph, samples=120, seed=3)
+    assert np.corrcoef(estimate, expected)[0, 1] > 0.8
+    assert len(set(np.argsort(-estimate)[:10]) & set(np.argsort(-expected)[:10])) >= 5
+    assert np.allclose(estimate, approximate_betweenness(graph, samples=120, seed=3, workers=2))
+    print("✅ Pass\n")
+
+
+def main():
+    print("🧪 Running Graph Centrality Tests\n")
+
+    test_hits()
+    test_degree_distribution()
+    test_exact_betweenness()
+    test_sampled_betweenness()
+
+    print("🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
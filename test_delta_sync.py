@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Delta Sync Tests"""
+
+import os
+import tempfile
+
+from src.core.atom_store import AtomStore
+from src.core.content_hash import atom_content_id
+from src.core.delta_sync import DeltaSync, RangeHashIndex, StoreReplica, diff_replicas
+from src.core.trust_atom import TrustAtomV7, TrustVector
+
+
+def _record(i, issuer="did:key:a"):
+    atom = TrustAtomV7(issuer=issuer, target=f"did:web:site{i}", trust_vector=TrustVector(honesty=0.5))
+    return {"kaId": f"local:{issuer}:{i}", "trustAtom": atom.to_jsonld(), "timestamp": atom.issued, "mode": "LOCAL"}
+
+
+def _stores(shared=2000):
+    directory = tempfile.mkdtemp()
+    a, b = AtomStore(os.path.join(directory, "a.json")), AtomStore(os.path.join(directory, "b.json"))
+    for i in range(shared):
+        record = _record(i)
+        a.append(dict(record))
+        b.append(dict(record))
+    return a, b
+
+
+def test_range_index_summaries():
+    """Test 1: Summaries depend only on the set of IDs, not insertion order or duplicates"""
+    print("Test 1: Range hash summaries")
+
+    a, b = RangeHashIndex(), RangeHashIndex()
+    cids = [f"{i * 7919:064x}" for i in range(500)]
+    for cid in cids:
+        a.add(cid)
+    for cid in reversed(cids):
+        b.add(cid)
+    assert not b.add(cids[0])
+    assert a.summary() == b.summary() and len(a) == 500
+    assert a.children("00") == b.children("00")
+    assert a.ids("") == sorted(cids)
+    b.add(f"{1:064x}")
+    assert a.summary() != b.summary()
+    print("✅ Pass\n")
+
+
+def test_merkle_sync_moves_only_the_difference():
+    """Test 2: First sync finds a small difference in a few round trips and converges"""
+    print("Test 2: Merkle sync")
+
+    a, b = _stores()
+    for i in range(3):
+        a.append(_record(i, issuer="did:key:only-a"))
+    for i in range(5):
+        b.append(_record(i, issuer="did:key:only-b"))
+
+    diff = diff_replicas(StoreReplica(a), StoreReplica(b))
+    assert len(diff["missingLocal"]) == 5 and len(diff["missingRemote"]) == 3
+    assert diff["roundTrips"] <= 2 * (a.range_index.depth + 1)
+
+    result = DeltaSync(StoreReplica(a)).sync(StoreReplica(b))
+    assert result["mode"] == "merkle"
+    assert (result["pulled"], result["pushed"]) == (5, 3)
+    assert len(a) == len(b) == 2008
+    assert a.range_index.summary() == b.range_index.summary()
+    print("✅ Pass\n")
+
+
+def test_sequence_cursor_on_second_sync():
+    """Test 3: Known peers exchange only records appended since the last sync"""
+    print("Test 3: Sequence cursors")
+
+    a, b = _stores(200)
+    sync = DeltaSync(StoreReplica(a))
+    assert sync.sync(StoreReplica(b))["pulled"] == 0
+
+    b.append(_record(1, issuer="did:key:late-b"))
+    a.append(_record(1, issuer="did:key:late-a"))
+    result = sync.sync(StoreReplica(b))
+    assert result["mode"] == "sequence"
+    assert (result["pulled"], result["pushed"]) == (1, 1)
+
+    again = sync.sync(StoreReplica(b))
+    assert (again["pulled"], again["pushed"]) == (0, 0)
+    assert a.range_index.summary() == b.range_index.summary()
+    print("✅ Pass\n")
+
+
+def test_store_id_survives_reload():
+    """Test 4: A store keeps its sync identity and index across save/load"""
+    print("Test 4: Store identity")
+
+    a, _ = _stores(10)
+    a.save()
+    loaded = AtomStore(a.storage_file)
+    assert loaded.load() == 10
+    assert loaded.store_id == a.store_id
+    assert loaded.range_index.summary() == a.range_index.summary()
+    print("✅ Pass\n")
+
+
+def test_accept_verifies_records():
+    """Test 5: Accepted records must hash to their contentId, be valid and pass admit"""
+    print("Test 5: Verified accept")
+
+    store, _ = _stores(0)
+    replica = StoreReplica(store, admit=lambda atom, record: atom.issuer != "did:key:blocked")
+    genuine = _record(1)
+    genuine["contentId"] = atom_content_id(genuine["trustAtom"])
+
+    forged = dict(genuine, trustAtom=dict(genuine["trustAtom"], content="fake"))
+    invalid = _record(2)
+    invalid["trustAtom"]["trustVector"]["honesty"] = 5.0
+    invalid["contentId"] = atom_content_id(invalid["trustAtom"])
+    blocked = _record(3, issuer="did:key:blocked")
+    blocked["contentId"] = atom_content_id(blocked["trustAtom"])
+
+    assert replica.accept([forged, {"contentId": genuine["contentId"]}, "junk", invalid, blocked]) == 0
+    assert replica.rejected == 5 and len(store) == 0
+    assert replica.accept([genuine, dict(genuine)]) == 1
+    late = _record(4)
+    late["contentId"] = atom_content_id(late["trustAtom"])
+    assert replica.accept([late], admit=lambda atom, record: False) == 0 and replica.rejected == 6
+    assert store.get_by_content_id(genuine["contentId"])["trustAtom"] == genuine["trustAtom"]
+    print("✅ Pass\n")
+
+
+def test_legacy_content_ids():
+    """Test 6: Records with legacy (non-sha256) content IDs are indexed and found by the diff"""
+    print("Test 6: Legacy content IDs")
+
+    a, b = _stores(300)
+    a.append(dict(_record(900), contentId="legacy-1"))
+    b.append(dict(_record(901), contentId="LEGACY-2"))
+
+    assert StoreReplica(a).info()["count"] == 301 and "legacy-1" in a.range_index
+    diff = diff_replicas(StoreReplica(a), StoreReplica(b))
+    assert diff["missingRemote"] == ["legacy-1"] and diff["missingLocal"] == ["LEGACY-2"]
+    print("✅ Pass\n")
+
+
+def main():
+    print("🧪 Running Delta Sync Tests\n")
+
+    test_range_index_summaries()
+    test_merkle_sync_moves_only_the_difference()
+    test_sequence_cursor_on_second_sync()
+    test_store_id_survives_reload()
+    test_accept_verifies_records()
+    test_legacy_content_ids()
+
+    print("🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Shared DKG Client Manager Tests"""
+
+import os
+import tempfile
+
+from src.core.dkg_client import DKGClientManager
+from src.core.dkg_publisher import DKGPublisher
+from src.core.fake_dkg import FakeDKG
+from src.core.trust_atom import TrustAtomV7, TrustVector
+
+
+def test_publishers_share_one_client():
+    """Test 1: Publishers built on one manager reuse a single client"""
+    print("Test 1: Shared client")
+
+    fake = FakeDKG()
+    manager = DKGClientManager(node_url="http://stub:8900", client_factory=lambda: fake)
+    tmp = tempfile.mkdtemp()
+    publishers = [
+        DKGPublisher(storage_file=os.path.join(tmp, f"atoms{i}.json"), client_manager=manager)
+        for i in range(3)
+    ]
+    assert manager.clients_built == 0
+
+    for i, publisher in enumerate(publishers):
+        publisher.publish_trust_atom(TrustAtomV7(
+            issuer="did:key:shared",
+            target=f"did:web:t{i}",
+            trust_vector=TrustVector(honesty=0.6)
+        ))
+
+    assert manager.clients_built == 1
+    assert fake.create_calls == 3
+    print("✅ Pass\n")
+
+
+def test_node_info_is_cached():
+    """Test 2: Health checks reuse the cached node info until it goes stale"""
+    print("Test 2: Cached node info")
+
+    fake = FakeDKG()
+    manager = DKGClientManager(info_ttl=60, client_factory=lambda: fake)
+    for _ in range(5):
+        assert manager.health_check()
+    assert fake.info_calls == 1
+
+    fake.available = False
+    assert manager.health_check()            # still within TTL
+    assert not manager.health_check(max_age=0)
+    assert manager.get_stats()["healthy"] is False
+
+    fake.available = True
+    assert manager.health_check(max_age=0)
+    assert manager.node_info()["version"] == "8.0.0-fake"
+    print("✅ Pass\n")
+
+
+def main():
+    print("🧪 Running DKG Client Manager Tests\n")
+
+    test_publishers_share_one_client()
+    test_node_info_is_cached()
+
+    print("🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""DKG Query Path Tests (against the in-process stub node)"""
+
+import os
+import tempfile
+import threading
+
+from src.core.dkg_publisher import DKGPublisher
+from src.core.fake_dkg import FakeDKG
+from src.core.query_cache import ReadThroughCache
+from src.core.trust_atom import TrustAtomV7, TrustVector
+
+
+def _publisher(dkg, **kwargs):
+    return DKGPublisher(storage_file=os.path.join(tempfile.mkdtemp(), "atoms.json"), dkg=dkg, **kwargs)
+
+
+def _atom(issuer, target="did:web:popular", honesty=0.6):
+    return TrustAtomV7(issuer=issuer, target=target, trust_vector=TrustVector(honesty=honesty))
+
+
+def test_reads_atoms_published_elsewhere():
+    """Test 1: Queries include atoms other nodes published, without duplicates"""
+    print("Test 1: Remote atoms")
+
+    dkg = FakeDKG()
+    other, me = _publisher(dkg), _publisher(dkg)
+    other.publish_batch([_atom("did:key:alice"), _atom("did:key:bob", honesty=0.4)])
+    me.publish_trust_atom(_atom("did:key:carol"))
+
+    results = me.query_trust_atoms("did:web:popular")
+    assert sorted(r["issuer"] for r in results) == ["did:key:alice", "did:key:bob", "did:key:carol"]
+    assert [r["overall"] for r in results] == sorted((r["overall"] for r in results), reverse=True)
+    assert me.get_aggregate_reputation("did:web:popular")["atomCount"] == 3
+    print("✅ Pass\n")
+
+
+def test_cache_ttl_negative_and_invalidation():
+    """Test 2: Hits are served from cache, misses are negatively cached, writes invalidate"""
+    print("Test 2: Read-through cache")
+
+    dkg = FakeDKG()
+    publisher = _publisher(dkg)
+    publisher.publish_trust_atom(_atom("did:key:alice"))
+
+    for _ in range(5):
+        publisher.query_trust_atoms("did:web:popular")
+    for _ in range(5):
+        assert publisher.query_trust_atoms("did:web:nobody") == []
+    assert dkg.query_calls == 2
+
+    publisher.publish_trust_atom(_atom("did:key:bob"))
+    assert len(publisher.query_trust_atoms("did:web:popular")) == 2
+    assert dkg.query_calls == 3
+
+    stats = publisher.query_cache.get_stats()
+    assert stats["hits"] == 4 and stats["negativeHits"] == 4
+    print("✅ Pass\n")
+
+
+def test_concurrent_misses_coalesce():
+    """Test 3: A burst of identical queries makes one upstream call"""
+    print("Test 3: Coalesced misses")
+
+    dkg = FakeDKG()
+    dkg.query_delay = 0.2
+    publisher = _publisher(dkg)
+    publisher.publish_trust_atom(_atom("did:key:alice"))
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(publisher.query_trust_atoms("did:web:popular")))
+        for _ in range(20)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert dkg.query_calls == 1
+    assert len(results) == 20 and all(len(r) == 1 for r in results)
+    print("✅ Pass\n")
+
+
+def test_node_failure_falls_back_to_local():
+    """Test 4: Unreachable node answers from local storage and caches nothing"""
+    print("Test 4: Local fallback")
+
+    dkg = FakeDKG()
+    publisher = _publisher(dkg)
+    publisher.publish_trust_atom(_atom("did:key:alice"))
+    dkg.available = False
+
+    assert len(publisher.query_trust_atoms("did:web:popular")) == 1
+    assert publisher.query_cache.get_stats()["entries"] == 0
+    print("✅ Pass\n")
+
+
+def test_concurrent_reputation_lookups_coalesce():
+    """Test 5: Identical concurrent reputation lookups share one aggregation"""
+    print("Test 5: Coalesced reputation lookups")
+
+    dkg = FakeDKG()
+    dkg.query_delay = 0.2
+    publisher = _publisher(dkg)
+    publisher.publish_trust_atom(_atom("did:key:alice"))
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(publisher.get_aggregate_reputation("did:web:popular")))
+        for _ in range(20)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(results) == 20 and all(r["atomCount"] == 1 for r in results)
+    stats = publisher.get_coalescing_stats()["reputation"]
+    assert stats["executed"] == 1 and stats["coalesced"] == 19
+    assert publisher.get_aggregate_reputation("did:web:popular")["atomCount"] == 1
+    assert publisher.reputation_flight.executed == 2
+    print("✅ Pass\n")
+
+
+def test_invalidation_is_per_key():
+    """Test 6: Invalidating one key drops an in-flight load of that key only"""
+    print("Test 6: Per-key invalidation")
+
+    release = threading.Event()
+    loading = threading.Semaphore(0)
+
+    def loader(key):
+        loading.release()
+        release.wait(5)
+        return [key]
+
+    cache = ReadThroughCache(loader)
+    threads = [threading.Thread(target=cache.get, args=(key,)) for key in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    assert loading.acquire(timeout=5) and loading.acquire(timeout=5)
+
+    cache.invalidate("a")                   # stale load of "a", unrelated to "b"
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert cache.get_stats()["entries"] == 1
+    cache.get("b")
+    assert cache.get_stats()["hits"] == 1
+
+    release.clear()
+    thread = threading.Thread(target=cache.get, args=("c",))
+    thread.start()
+    assert loading.acquire(timeout=5)
+    cache.invalidate()                      # everything, including the load in flight
+    release.set()
+    thread.join()
+    assert cache.get_stats()["entries"] == 0
+    print("✅ Pass\n")
+
+
+def main():
+    print("🧪 Running DKG Query Tests\n")
+
+    test_reads_atoms_published_elsewhere()
+    test_cache_ttl_negative_and_invalidation()
+    test_concurrent_misses_coalesce()
+    test_node_failure_falls_back_to_local()
+    test_concurrent_reputation_lookups_coalesce()
+    test_invalidation_is_per_key()
+
+    print("🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
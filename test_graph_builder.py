@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Trust Graph Builder Tests"""
+
+import numpy as np
+
+from src.algorithms.graph_builder import TrustGraphBuilder
+from src.core.trust_atom import TrustAtomV7, TrustVector
+
+
+def _build(merge):
+    builder = TrustGraphBuilder(merge=merge)
+    builder.add_edge("did:a", "did:b", 0.2, stake=1.0, timestamp=3.0)
+    builder.add_edge("did:a", "did:b", 0.8, stake=3.0, timestamp=1.0)
+    builder.add_edge("did:a", "did:c", 0.5)
+    builder.add_edge("did:b", "did:c", 0.4)
+    return builder.build()
+
+
+def test_merge_policies():
+    """Test 1: Duplicate edges collapse according to the merge policy"""
+    print("Test 1: Merge policies")
+
+    expected = {"latest": 0.2, "max": 0.8, "mean": 0.5, "stake_mean": 0.65}
+    for merge, weight in expected.items():
+        graph = _build(merge)
+        assert graph.edge_count == 3
+        edges = dict(graph.out_edges("did:a"))
+        assert abs(edges["did:b"] - weight) < 1e-9, merge
+        assert edges["did:c"] == 0.5
+    print("✅ Pass\n")
+
+
+def test_latest_is_order_independent():
+    """Test 2: 'latest' picks the newest atom regardless of ingestion order"""
+    print("Test 2: Latest is order independent")
+
+    forward = TrustGraphBuilder("latest")
+    forward.add_edge("x", "y", 0.1, timestamp=1.0)
+    forward.add_edge("x", "y", 0.9, timestamp=2.0)
+
+    backward = TrustGraphBuilder("latest")
+    backward.add_edge("x", "y", 0.9, timestamp=2.0)
+    backward.add_edge("x", "y", 0.1, timestamp=1.0)
+
+    assert forward.build().out_edges("x") == backward.build().out_edges("x") == [("y", 0.9)]
+    print("✅ Pass\n")
+
+
+def test_bulk_arrays():
+    """Test 3: Bulk array ingestion matches edge-by-edge ingestion"""
+    print("Test 3: Bulk arrays")
+
+    rng = np.random.default_rng(7)
+    issuers = rng.integers(0, 30, 2000).astype(str)
+    targets = rng.integers(0, 30, 2000).astype(str)
+    weights = rng.random(2000)
+
+    bulk = TrustGraphBuilder("mean")
+    bulk.add_arrays(issuers, targets, weights)
+    single = TrustGraphBuilder("mean")
+    for issuer, target, weight in zip(issuers, targets, weights):
+        single.add_edge(str(issuer), str(target), float(weight))
+
+    a, b = bulk.build(), single.build()
+    assert np.array_equal(a.indptr, b.indptr)
+    assert np.array_equal(a.indices, b.indices)
+    assert np.allclose(a.weights, b.weights)
+    assert a.counts.sum() == 2000
+    print(f"  2000 atoms → {a.edge_count} edges")
+    print("✅ Pass\n")
+
+
+def test_trust_atoms():
+    """Test 4: Trust Atoms become stake-weighted edges"""
+    print("Test 4: Trust Atoms")
+
+    atom = TrustAtomV7(
+        issuer="did:key:z6Mk1",
+        target="npub1target",
+        trust_vector=TrustVector(honesty=0.6)
+    )
+    builder = TrustGraphBuilder()
+    builder.add_trust_atom(atom, stake_weight=1.5)
+    graph = builder.build()
+
+    assert graph.node_count == 2
+    assert abs(graph.out_edges("did:key:z6Mk1")[0][1] - atom.overall * 1.5) < 1e-9
+
+    # stake_mean keeps a lone atom's edge stake-weighted and counts stake once when merging
+    builder = TrustGraphBuilder("stake_mean")
+    builder.add_trust_atom(atom, stake_weight=3.0)
+    assert abs(builder.build().out_edges("did:key:z6Mk1")[0][1] - atom.overall * 3.0) < 1e-9
+    other = TrustAtomV7(issuer="did:key:z6Mk1", target="npub1target", trust_vector=TrustVector(honesty=0.9))
+    builder.add_trust_atom(other, stake_weight=1.0)
+    expected = (atom.overall * 3.0 + other.overall * 1.0) / 2.0
+    assert abs(builder.build().out_edges("did:key:z6Mk1")[0][1] - expected) < 1e-9
+    assert TrustGraphBuilder().build().edge_count == 0
+    print("✅ Pass\n")
+
+
+def main():
+    print("🧪 Running Trust Graph Builder Tests\n")
+
+    test_merge_policies()
+    test_latest_is_order_independent()
+    test_bulk_arrays()
+    test_trust_atoms()
+
+    print("🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Publish Outbox Tests"""
+
+import os
+import tempfile
+import time
+
+from src.core.dkg_publisher import DKGPublisher
+from src.core.fake_dkg import FakeDKG
+from src.core.outbox import PublishOutbox
+from src.core.trust_atom import TrustAtomV7, TrustVector
+
+
+def _atom(target="did:web:outbox"):
+    return TrustAtomV7(issuer="did:key:outbox", target=target, trust_vector=TrustVector(honesty=0.6))
+
+
+def test_failed_publish_is_retried_and_promoted():
+    """Test 1: A failed DKG publish stays local, then the drainer promotes it"""
+    print("Test 1: Retry and promote")
+
+    tmp = tempfile.mkdtemp()
+    dkg = FakeDKG()
+    dkg.available = False
+    publisher = DKGPublisher(
+        storage_file=os.path.join(tmp, "atoms.json"),
+        dkg=dkg,
+        outbox_file=os.path.join(tmp, "outbox.log")
+    )
+
+    local_id = publisher.publish_trust_atom(_atom())
+    assert local_id.startswith("local:")
+    assert publisher.outbox.get_stats()["pending"] == 1
+
+    drainer = publisher.start_outbox_drainer(interval=60)
+    drainer.stop()
+    assert drainer.drain_once(now=time.time() + 3600).get("unreachable")
+
+    dkg.available = True
+    assert drainer.drain_once(now=time.time() + 3600)["confirmed"] == 1
+    record = publisher.published_atoms[0]
+    assert record["mode"] == "DKG_TESTNET" and record["localId"] == local_id
+    assert len(publisher.outbox) == 0
+
+    reloaded = DKGPublisher(storage_file=os.path.join(tmp, "atoms.json"))
+    assert reloaded.get_stats()["dkgPublished"] == 1
+    print("✅ Pass\n")
+
+
+def test_crash_recovery():
+    """Test 2: In-flight entries survive a crash, confirmed ones are compacted away"""
+    print("Test 2: Crash recovery")
+
+    log_file = os.path.join(tempfile.mkdtemp(), "outbox.log")
+    outbox = PublishOutbox(log_file, fsync=False)
+    for i in range(50):
+        outbox.enqueue(f"key{i}", {"n": i})
+        outbox.mark_in_flight(f"key{i}")
+    for i in range(48):
+        outbox.mark_confirmed(f"key{i}", f"ual{i}")
+    # Simulated crash: no close(), a torn final line
+    with open(log_file, "a") as f:
+        f.write('{"key": "key49", "sta')
+
+    recovered = PublishOutbox(log_file, fsync=False)
+    assert sorted(recovered.entries) == ["key48", "key49"]
+    assert all(e["state"] == "pending" for e in recovered.entries.values())
+    assert recovered.get_stats()["confirmed"] == 48
+    with open(log_file) as f:
+        assert len(f.readlines()) == 2
+    print("✅ Pass\n")
+
+
+def test_backoff_and_give_up():
+    """Test 3: Failures back off exponentially and give up after max_attempts"""
+    print("Test 3: Backoff")
+
+    outbox = PublishOutbox(os.path.join(tempfile.mkdtemp(), "outbox.log"), max_attempts=3, base_delay=10, fsync=False)
+    outbox.enqueue("k", {})
+    now = 1000.0
+    assert outbox.mark_failed("k", "boom", now=now) == "pending"
+    assert 1005 <= outbox.entries["k"]["nextAttempt"] <= 1010
+    assert outbox.due(now=now + 1) == []
+    assert outbox.mark_failed("k", "boom", now=now) == "pending"
+    assert 1010 <= outbox.entries["k"]["nextAttempt"] <= 1020
+    assert outbox.mark_failed("k", "boom", now=now) == "failed"
+    assert len(outbox) == 0 and outbox.get_stats()["failed"] == 1
+    print("✅ Pass\n")
+
+
+def test_promote_existing_local_atoms():
+    """Test 4: Atoms stored before the outbox existed are promoted once the DKG is reachable"""
+    print("Test 4: Promote local atoms")
+
+    tmp = tempfile.mkdtemp()
+    storage = os.path.join(tmp, "atoms.json")
+    DKGPublisher(storage_file=storage).publish_batch([_atom("did:web:a"), _atom("did:web:b")])
+
+    dkg = FakeDKG()
+    dkg.available = False
+    publisher = DKGPublisher(storage_file=storage, dkg=dkg, outbox_file=os.path.join(tmp, "outbox.log"))
+
+    # Starting the drainer queues the local atoms; nothing is published while the node is down
+    drainer = publisher.start_outbox_drainer(interval=60)
+    drainer.stop()
+    assert publisher.outbox.get_stats()["pending"] == 2
+    assert publisher.promote_local_atoms() == 0
+    assert drainer.drain_once().get("unreachable")
+    assert publisher.get_stats()["localPublished"] == 2
+
+    dkg.available = True
+    assert drainer.drain_once()["confirmed"] == 2
+    assert dkg.create_calls == 2
+    assert publisher.get_stats()["localPublished"] == 0
+    print("✅ Pass\n")
+
+
+def main():
+    print("🧪 Running Outbox Tests\n")
+
+    test_failed_publish_is_retried_and_promoted()
+    test_crash_recovery()
+    test_backoff_and_give_up()
+    test_promote_existing_local_atoms()
+
+    print("🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""x402 Payment Verification Tests (against the in-process fake chain)"""
+
+import os
+import tempfile
+import threading
+import time
+
+from src.core.fake_chain import FakeChain
+from src.core.payments import CreditLedger, PaymentVerifier
+
+PAY_TO = "0x00000000000000000000000000000000000000aa"
+
+
+def _tx(n):
+    return "0x" + f"{n:064x}"
+
+
+def test_prepaid_credits_from_one_lookup():
+    """Test 1: One on-chain check buys amount / price queries"""
+    print("Test 1: Prepaid credits")
+
+    chain = FakeChain()
+    chain.add_transfer(_tx(1), PAY_TO, amount=0.003)
+    verifier = PaymentVerifier(chain, PAY_TO, price=0.001)
+
+    assert [verifier.charge(_tx(1))["remaining"] for _ in range(3)] == [2, 1, 0]
+    exhausted = verifier.charge(_tx(1))
+    assert not exhausted["ok"] and exhausted["status"] == "exhausted"
+    assert chain.lookup_calls == 1
+    print("✅ Pass\n")
+
+
+def test_rejections_are_cached():
+    """Test 2: Bad proofs are rejected, and repeated bad proofs don't hit the chain"""
+    print("Test 2: Rejections")
+
+    chain = FakeChain()
+    chain.add_transfer(_tx(2), "0x00000000000000000000000000000000000000bb", amount=1.0)
+    chain.add_transfer(_tx(3), PAY_TO, amount=0.0001)
+    chain.add_transfer(_tx(4), PAY_TO, amount=1.0, timestamp=time.time() - 3 * 86400)
+    verifier = PaymentVerifier(chain, PAY_TO, price=0.001)
+
+    assert verifier.charge("not-a-tx-hash")["status"] == "invalid"
+    for n in (2, 3, 4, 5):
+        assert verifier.charge(_tx(n))["status"] == "invalid", n
+        assert verifier.charge(_tx(n))["status"] == "invalid", n
+    assert chain.lookup_calls == 4
+    print("✅ Pass\n")
+
+
+def test_slow_chain_stays_off_request_path():
+    """Test 3: Slow lookups return 'pending' quickly and are shared by concurrent requests"""
+    print("Test 3: Async verification")
+
+    chain = FakeChain()
+    chain.lookup_delay = 0.3
+    chain.add_transfer(_tx(6), PAY_TO, amount=0.1)
+    verifier = PaymentVerifier(chain, PAY_TO, price=0.001, wait_timeout=0.05)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(verifier.charge(_tx(6)))) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert all(r["status"] == "pending" for r in results)
+    assert chain.lookup_calls == 1
+
+    verifier.verify_async(_tx(6)).result()
+    assert verifier.charge(_tx(6))["remaining"] == 99
+    assert chain.lookup_calls == 1
+    print("✅ Pass\n")
+
+
+def test_eviction_keeps_spent_quota():
+    """Test 4: A proof pushed out of the LRU can't be re-verified into fresh credits"""
+    print("Test 4: LRU eviction")
+
+    chain = FakeChain()
+    for n in range(10, 14):
+        chain.add_transfer(_tx(n), PAY_TO, amount=0.002)
+    verifier = PaymentVerifier(chain, PAY_TO, price=0.001, max_entries=2)
+
+    verifier.charge(_tx(10))
+    verifier.charge(_tx(10))
+    for n in range(11, 14):
+        verifier.charge(_tx(n))
+    assert verifier.get_stats()["cachedProofs"] == 2
+
+    assert verifier.charge(_tx(10))["status"] == "exhausted"
+    assert verifier.get_stats()["chainLookups"] == 5
+    print("✅ Pass\n")
+
+
+def test_ledger_shares_quota():
+    """Test 5: Workers sharing a credit ledger can't each spend a proof's full quota, nor can a restart"""
+    print("Test 5: Shared credit ledger")
+
+    chain = FakeChain()
+    chain.add_transfer(_tx(20), PAY_TO, amount=0.005)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "credits.log")
+        workers = [PaymentVerifier(chain, PAY_TO, price=0.001, ledger=CreditLedger(path)) for _ in range(2)]
+        results = [workers[n % 2].charge(_tx(20)) for n in range(8)]
+        assert [r["ok"] for r in results] == [True] * 5 + [False] * 3
+        assert results[-1]["status"] == "exhausted"
+
+        # A writer that died mid-line leaves a fragment; the next reader drops it
+        with open(path, "ab") as log:
+            log.write(b'{"proof": "0x')
+        chain.add_transfer(_tx(21), PAY_TO, amount=0.002)
+        restarted = PaymentVerifier(chain, PAY_TO, price=0.001, ledger=CreditLedger(path))
+        assert restarted.charge(_tx(20))["status"] == "exhausted"
+        assert [restarted.charge(_tx(21))["remaining"] for _ in range(2)] == [1, 0]
+        assert CreditLedger(path).used(_tx(21)) == 2
+
+        # Compaction folds the log into one line per proof; other processes re-read it
+        compacting = CreditLedger(path, compact_bytes=1)
+        assert compacting.spend(_tx(22), 1, credits=3, paid_at=time.time()) == (True, 2)
+        with open(path) as log:
+            assert len(log.readlines()) == 3
+        assert workers[0].ledger.used(_tx(20)) == 5 and workers[0].ledger.used(_tx(22)) == 1
+    print("✅ Pass\n")
+
+
+def test_expired_proof_stays_spent():
+    """Test 6: A cached proof past max_proof_age is refused, even after the ledger compacts it away"""
+    print("Test 6: Expiry and compaction")
+
+    chain = FakeChain()
+    chain.add_transfer(_tx(30), PAY_TO, amount=0.002, timestamp=time.time() - 0.7)
+    chain.add_transfer(_tx(31), PAY_TO, amount=0.002)
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = CreditLedger(os.path.join(tmp, "credits.log"), max_age=1.0, compact_bytes=1)
+        verifier = PaymentVerifier(chain, PAY_TO, price=0.001, max_proof_age=1.0, ledger=ledger)
+        assert [verifier.charge(_tx(30))["status"] for _ in range(3)] == ["paid", "paid", "exhausted"]
+
+        time.sleep(0.4)
+        # Two charges grow the log past twice its compacted size, whatever the line lengths,
+        # so it compacts: tx 30 is past max_age
+        assert all(verifier.charge(_tx(31))["ok"] for _ in range(2))
+        assert ledger.used(_tx(30)) == 0
+        assert [verifier.charge(_tx(30))["status"] for _ in range(3)] == ["invalid"] * 3
+        assert ledger.spend(_tx(30), 1, credits=2, paid_at=time.time() - 2) == (False, 0)
+    print("✅ Pass\n")
+
+
+def main():
+    print("🧪 Running Payment Verification Tests\n")
+
+    test_prepaid_credits_from_one_lookup()
+    test_rejections_are_cached()
+    test_slow_chain_stays_off_request_path()
+    test_eviction_keeps_spent_quota()
+    test_ledger_shares_quota()
+    test_expired_proof_stays_spent()
+
+    print("🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""PageRank Refresher Tests"""
+
+import os
+import random
+import tempfile
+import time
+
+from src.algorithms.graph_builder import TrustGraphBuilder
+from src.algorithms.pagerank import TrustPageRank, pagerank_scores
+from src.algorithms.rank_refresher import PageRankRefresher
+from src.core.dkg_publisher import DKGPublisher
+from src.core.stake_ledger import StakeLedger
+from src.core.stake_validator import StakeValidator
+from src.core.trust_atom import TrustAtomV7, TrustVector
+
+
+def _record(issuer, target, overall=0.8):
+    return {"trustAtom": {"issuer": issuer, "target": target, "overall": overall}}
+
+
+def test_csr_pagerank_matches_networkx():
+    """Test 1: CSR power iteration agrees with the networkx implementation"""
+    print("Test 1: CSR PageRank")
+
+    rng = random.Random(3)
+    builder = TrustGraphBuilder("mean")
+    reference = TrustPageRank(iterations=200)
+    pairs = {(f"did:{rng.randrange(40)}", f"did:{rng.randrange(50)}") for _ in range(300)}
+    for issuer, target in sorted(pairs):
+        if issuer != target:
+            weight = rng.random()
+            builder.add_edge(issuer, target, weight)
+            reference.add_edge(issuer, target, weight)
+    graph = builder.build()
+
+    scores = pagerank_scores(graph, iterations=200, tol=1e-10)
+    expected = reference.compute()
+    assert len(scores) == len(expected)
+    for node, score in zip(graph.nodes, scores):
+        assert abs(score - expected[str(node)]) < 1e-4, node
+    print("✅ Pass\n")
+
+
+def test_refresh_after_new_atoms():
+    """Test 2: Enough new atoms trigger a refresh that swaps in a new snapshot"""
+    print("Test 2: Refresh after N atoms")
+
+    records = [_record("did:a", "did:b"), _record("did:c", "did:b")]
+    refresher = PageRankRefresher(lambda: records, interval=60, refresh_after=2)
+    refresher.start()
+    try:
+        deadline = time.time() + 5
+        while refresher.snapshot is None and time.time() < deadline:
+            time.sleep(0.01)
+        first = refresher.snapshot
+        assert first.version == 1 and refresher.score("did:b") == 1.0
+        assert refresher.score("did:unknown") is None
+
+        records.append(_record("did:b", "did:d"))
+        refresher.notify()
+        time.sleep(0.1)
+        assert refresher.snapshot is first
+
+        records.append(_record("did:d", "did:e"))
+        refresher.notify()
+        while refresher.snapshot is first and time.time() < deadline:
+            time.sleep(0.01)
+        assert refresher.snapshot.version == 2 and refresher.snapshot.atom_count == 4
+        assert first.score("did:e") is None and refresher.score("did:e") is not None
+    finally:
+        refresher.stop()
+    print("✅ Pass\n")
+
+
+def test_reputation_includes_graph_score():
+    """Test 3: Aggregate reputation carries the precomputed graph score"""
+    print("Test 3: graphScore in reputation")
+
+    publisher = DKGPublisher(storage_file=os.path.join(tempfile.mkdtemp(), "atoms.json"))
+    publisher.dkg_configured = False
+    publisher.publish_batch([
+        TrustAtomV7(issuer="did:key:alice", target="did:web:shop", trust_vector=TrustVector(honesty=0.9)),
+        TrustAtomV7(issuer="did:key:bob", target="did:web:shop", trust_vector=TrustVector(honesty=0.7)),
+    ])
+    assert publisher.get_aggregate_reputation("did:web:shop")["graphScore"] is None
+
+    publisher.start_rank_refresher(interval=60, refresh_after=1000)
+    publisher.stop_rank_refresher()
+    publisher.rank_refresher.refresh()
+    reputation = publisher.get_aggregate_reputation("did:web:shop")
+    assert reputation["graphScore"] == 1.0
+    assert publisher.get_aggregate_reputation("did:key:alice")["graphScore"] < 1.0
+    assert publisher.get_stats()["pageRank"]["snapshot"]["atomCount"] == 2
+    print("✅ Pass\n")
+
+
+def test_slash_reranks_without_rebuild():
+    """Test 4: A slash updates one issuer weight and re-ranks the cached graph"""
+    print("Test 4: Slashing propagation")
+
+    rng = random.Random(5)
+    records = [
+        {"trustAtom": {"issuer": f"did:{rng.randrange(60)}", "target": f"did:{rng.randrange(80)}",
+                       "trustVector": {"honesty": rng.random(), "stake_weight": 2.0}}}
+        for _ in range(600)
+    ]
+    validator = StakeValidator()
+    for i in range(60):
+        validator.register_stake(f"did:{i}", 100 * (i + 1), timestamp=1)
+
+    refresher = PageRankRefresher(lambda: records, interval=60, iterations=200, stake_ledger=validator.ledger)
+    before = refresher.refresh()
+    loader_calls = []
+    refresher.load_records = lambda: loader_calls.append(1) or records
+
+    for _ in range(20):
+        validator.simulate_dispute("did:59", timestamp=2)
+    assert refresher.get_stats()["pendingStakeChanges"] == 20
+    incremental = refresher.refresh_weights()
+    assert not loader_calls and incremental.incremental
+    assert incremental.score("did:59") != before.score("did:59")
+
+    full = refresher.refresh()
+    assert max(abs(a - b) for a, b in zip(incremental.scores, full.scores)) < 1e-4
+    assert incremental.iterations < full.iterations
+    print("✅ Pass\n")
+
+
+def test_followed_ledger_reaches_ranking():
+    """Test 5: Slashes written to the ledger file by another process re-rank a following server"""
+    print("Test 5: Followed stake ledger")
+
+    path = os.path.join(tempfile.mkdtemp(), "stake_ledger.log")
+    validator = StakeValidator(StakeLedger(path))
+    for issuer in ("did:a", "did:b"):
+        validator.register_stake(issuer, 10000, timestamp=1)
+    records = [_record("did:a", "did:x"), _record("did:b", "did:y")]
+
+    follower = StakeLedger(path, read_only=True)
+    refresher = PageRankRefresher(lambda: records, interval=60, stake_ledger=follower)
+    assert refresher.refresh_weights().version == 1     # nothing ranked yet: full refresh
+    before = refresher.snapshot
+
+    validator.simulate_dispute("did:a", timestamp=2)
+    assert follower.catch_up() == 1 and follower.stake_at("did:a") == 9000
+    assert refresher.get_stats()["pendingStakeChanges"] == 1
+    after = refresher.refresh_weights()
+    assert after.incremental and after.score("did:x") < before.score("did:x")
+
+    try:
+        follower.slash("did:b", 0.5)
+        assert False, "read-only ledger recorded an event"
+    except RuntimeError:
+        pass
+
+    # A graph without a snapshot (failed refresh) rebuilds instead of re-ranking
+    refresher._snapshot = None
+    assert not refresher.refresh_weights().incremental
+    print("✅ Pass\n")
+
+
+def main():
+    print("🧪 Running PageRank Refresher Tests\n")
+
+    test_csr_pagerank_matches_networkx()
+    test_refresh_after_new_atoms()
+    test_reputation_includes_graph_score()
+    test_slash_reranks_without_rebuild()
+    test_followed_ledger_reaches_ranking()
+
+    print("🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
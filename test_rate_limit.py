@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Rate Limiting Tests"""
+
+import threading
+
+from src.core.rate_limit import ConcurrencyLimiter, TokenBucketLimiter
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket():
+    """Test 1: Burst is admitted, then requests pass at the refill rate with a Retry-After hint"""
+    print("Test 1: Token bucket")
+
+    clock = _Clock()
+    limiter = TokenBucketLimiter(rate=2.0, burst=5, clock=clock)
+    assert all(limiter.acquire("agent-a")[0] for _ in range(5))
+    allowed, retry_after = limiter.acquire("agent-a")
+    assert not allowed and abs(retry_after - 0.5) < 1e-9
+    assert limiter.acquire("agent-b")[0]
+
+    clock.now += 0.5
+    assert limiter.acquire("agent-a")[0]
+    assert not limiter.acquire("agent-a")[0]
+    clock.now += 100
+    assert sum(limiter.acquire("agent-a")[0] for _ in range(10)) == 5
+    assert limiter.get_stats()["rejected"] == 7
+    print("✅ Pass\n")
+
+
+def test_bounded_keys():
+    """Test 2: The least recently used buckets are evicted beyond max_keys"""
+    print("Test 2: Bounded key eviction")
+
+    limiter = TokenBucketLimiter(rate=1.0, burst=1, max_keys=100, clock=_Clock())
+    for i in range(1000):
+        limiter.acquire(f"client-{i}")
+    limiter.acquire("client-999")
+    stats = limiter.get_stats()
+    assert stats["keys"] == 100 and stats["evicted"] == 900
+    assert not limiter.acquire("client-999")[0]
+    assert limiter.acquire("client-0")[0]          # evicted: starts with a full bucket
+    print("✅ Pass\n")
+
+
+def test_concurrency_limiter():
+    """Test 3: Requests beyond the concurrency cap are shed, not queued"""
+    print("Test 3: Concurrency limiter")
+
+    limiter = ConcurrencyLimiter(max_concurrent=4)
+    release = threading.Event()
+    results = []
+
+    def request():
+        admitted = limiter.try_acquire()
+        results.append(admitted)
+        if admitted:
+            release.wait()
+            limiter.release()
+
+    threads = [threading.Thread(target=request) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    while len(results) < 10:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    stats = limiter.get_stats()
+    assert results.count(True) == 4 and stats["shed"] == 6
+    assert stats["inFlight"] == 0 and stats["peak"] == 4
+    print("✅ Pass\n")
+
+
+def main():
+    print("🧪 Running Rate Limiting Tests\n")
+
+    test_token_bucket()
+    test_bounded_keys()
+    test_concurrency_limiter()
+
+    print("🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Reputation Query Tests"""
+
+import numpy as np
+
+from src.algorithms.reputation_queries import KLLSketch, StreamingTopK, top_k, top_k_by_group
+
+
+def test_top_k():
+    """Test 1: argpartition top-K matches a full sort"""
+    print("Test 1: Top-K")
+
+    scores = np.random.default_rng(1).random(10000)
+    assert list(top_k(scores, 25)) == list(np.argsort(-scores)[:25])
+    assert len(top_k(scores, 0)) == 0
+    assert len(top_k(scores[:5], 10)) == 5
+    print("✅ Pass\n")
+
+
+def test_top_k_by_group():
+    """Test 2: Grouped top-K and streaming top-K agree"""
+    print("Test 2: Grouped top-K")
+
+    rng = np.random.default_rng(2)
+    scores = rng.random(5000)
+    groups = rng.choice(["Twitter", "Reddit", "TikTok"], 5000)
+    ids = np.arange(5000).astype(str)
+
+    grouped = top_k_by_group(scores, groups, 10)
+    streaming = StreamingTopK(10)
+    for start in range(0, 5000, 700):
+        streaming.update(ids[start:start + 700], scores[start:start + 700], groups[start:start + 700])
+
+    for platform, indices in grouped.items():
+        mask = groups == platform
+        expected = np.sort(scores[mask])[::-1][:10]
+        assert np.allclose(scores[indices], expected)
+        assert [e["node"] for e in streaming.result(platform)] == list(ids[indices])
+    print("✅ Pass\n")
+
+
+def test_kll_sketch():
+    """Test 3: KLL quantiles stay accurate with bounded memory"""
+    print("Test 3: KLL sketch")
+
+    values = np.random.default_rng(3).random(200000)
+    sketch = KLLSketch(k=200, seed=0)
+    for start in range(0, len(values), 10000):
+        sketch.update(values[start:start + 10000])
+
+    for q in (0.1, 0.5, 0.9, 0.99):
+        estimate = sketch.quantile(q)
+        true_rank = (values <= estimate).mean()
+        assert abs(true_rank - q) < 0.02, (q, true_rank)
+
+    assert sketch.size() < 1000
+    print(f"  200000 values kept in {sketch.size()} items")
+    print("✅ Pass\n")
+
+
+def test_kll_merge():
+    """Test 4: Merged sketches summarize the union"""
+    print("Test 4: KLL merge")
+
+    a, b = KLLSketch(seed=1), KLLSketch(seed=2)
+    a.update(np.linspace(0, 0.5, 50000))
+    b.update(np.linspace(0.5, 1.0, 50000))
+    a.merge(b)
+
+    assert len(a) == 100000
+    assert abs(a.quantile(0.5) - 0.5) < 0.02
+    assert abs(a.rank(0.25) - 0.25) < 0.02
+    print("✅ Pass\n")
+
+
+def main():
+    print("🧪 Running Reputation Query Tests\n")
+
+    test_top_k()
+    test_top_k_by_group()
+    test_kll_sketch()
+    test_kll_merge()
+
+    print("🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
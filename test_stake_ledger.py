@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Stake Ledger Tests"""
+
+import os
+import random
+import tempfile
+
+import numpy as np
+
+from src.core.stake_ledger import StakeLedger, stake_weight, stake_weights
+from src.core.stake_validator import StakeValidator
+
+
+def test_point_in_time_stakes():
+    """Test 1: Stakes and weights are answered as of any past time"""
+    print("Test 1: Point-in-time lookups")
+
+    validator = StakeValidator()
+    validator.register_stake("did:key:alice", 1000, timestamp=10)
+    validator.top_up_stake("did:key:alice", 9000, timestamp=20)
+    validator.simulate_dispute("did:key:alice", timestamp=30)
+
+    assert validator.get_stake("did:key:alice", at=5) == 0
+    assert validator.get_stake("did:key:alice", at=10) == 1000
+    assert validator.get_stake("did:key:alice", at=25) == 10000
+    assert validator.get_stake("did:key:alice") == 9000
+    assert validator.calculate_stake_weight("did:key:alice", at=25) == 2.0
+    assert validator.calculate_stake_weight("did:key:alice", at=15) == 1.5
+    assert [e["kind"] for e in validator.ledger.history("did:key:alice")] == ["register", "top_up", "slash"]
+    assert validator.stake_registry == {"did:key:alice": 9000}
+    try:
+        validator.stake_registry["did:key:alice"] = 1e9
+        assert False, "stake changed without a ledger event"
+    except TypeError:
+        pass
+    print("✅ Pass\n")
+
+
+def test_bulk_weights_match_replay():
+    """Test 2: Bulk stakes at time T (via checkpoints) match per-issuer lookups"""
+    print("Test 2: Bulk weights at time T")
+
+    rng = random.Random(7)
+    ledger = StakeLedger(checkpoint_every=50)
+    issuers = [f"did:key:{i}" for i in range(40)]
+    for t in range(2000):
+        issuer = rng.choice(issuers)
+        action = rng.random()
+        if action < 0.3 or ledger.stake_at(issuer) == 0:
+            ledger.register(issuer, rng.uniform(0, 5000), timestamp=t)
+        elif action < 0.8:
+            ledger.top_up(issuer, rng.uniform(1, 500), timestamp=t)
+        else:
+            ledger.slash(issuer, 0.1, timestamp=t)
+
+    assert ledger.get_stats()["checkpoints"] > 10
+    for t in (-1, 0, 49, 50, 777, 1999, 5000):
+        expected = np.array([ledger.stake_at(issuer, t) for issuer in ledger.issuers])
+        assert np.array_equal(ledger.stakes_at(t), expected), t
+        assert np.allclose(ledger.weights_at(t), [stake_weight(s) for s in expected])
+
+    subset = ["did:key:3", "did:key:unknown", "did:key:1"]
+    assert list(ledger.stakes_at(900, subset)) == [ledger.stake_at(i, 900) for i in subset]
+    assert list(stake_weights([0, 50, 100, 1000, 1e6])) == [0.5, 0.7, 1.0, 1.5, 2.0]
+    print("✅ Pass\n")
+
+
+def test_ledger_file_replay():
+    """Test 3: The ledger file replays to the same history; events must be in time order"""
+    print("Test 3: Ledger file")
+
+    path = os.path.join(tempfile.mkdtemp(), "stake_ledger.log")
+    ledger = StakeLedger(path)
+    ledger.register("did:key:a", 500, timestamp=1)
+    ledger.slash("did:key:a", 0.5, timestamp=2)
+    ledger.top_up("did:key:b", 50, timestamp=3)
+
+    replayed = StakeLedger(path)
+    assert replayed.events == ledger.events
+    assert replayed.stake_at("did:key:a", 1.5) == 500 and replayed.stake_at("did:key:a") == 250
+
+    try:
+        replayed.register("did:key:a", 1, timestamp=0)
+        assert False, "out-of-order event accepted"
+    except ValueError:
+        pass
+
+    # A torn last line (crash mid-write) is cut off, so later events replay cleanly
+    with open(path, "a") as log:
+        log.write('{"seq":3,"time":4,"issuer":"did:key:')
+    torn = StakeLedger(path)
+    assert len(torn) == 3
+    torn.top_up("did:key:b", 25, timestamp=5)
+    assert StakeLedger(path).stake_at("did:key:b") == 75
+    print("✅ Pass\n")
+
+
+def main():
+    print("🧪 Running Stake Ledger Tests\n")
+
+    test_point_in_time_stakes()
+    test_bulk_weights_match_replay()
+    test_ledger_file_replay()
+
+    print("🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
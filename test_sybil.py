@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Sybil Detection Tests"""
+
+import os
+import random
+import tempfile
+
+import numpy as np
+
+from src.algorithms.graph_builder import TrustGraphBuilder
+from src.algorithms.pagerank import pagerank_scores
+from src.algorithms.rank_refresher import PageRankRefresher
+from src.algorithms.sybil import detect_sybils, label_propagation, mutual_edges, strongly_connected_components
+from src.core.dkg_publisher import DKGPublisher
+
+
+def _edges(seed=1):
+    """Random honest graph plus an 8-member unstaked ring and a 3-member directed cycle"""
+    rng = random.Random(seed)
+    honest = [f"did:h{i}" for i in range(200)]
+    edges = []
+    for _ in range(2000):
+        a, b = rng.sample(honest, 2)
+        edges.append((a, b, rng.random()))
+    ring = [f"did:s{i}" for i in range(8)]
+    edges += [(a, b, 1.0) for a in ring for b in ring if a != b]
+    edges += [(a, rng.choice(honest), 0.9) for a in ring]
+    edges += [("did:c0", "did:c1", 1.0), ("did:c1", "did:c2", 1.0), ("did:c2", "did:c0", 1.0)]
+    edges.append((honest[0], ring[0], 0.5))
+    return edges, ring
+
+
+def _graph(edges):
+    builder = TrustGraphBuilder("mean")
+    for a, b, w in edges:
+        builder.add_edge(a, b, w)
+    return builder.build()
+
+
+def test_building_blocks():
+    """Test 1: Mutual edges, label propagation and SCCs on a tiny graph"""
+    print("Test 1: Mutual edges / communities / SCC")
+
+    graph = _graph([("a", "b", 1), ("b", "a", 1), ("b", "c", 1), ("c", "d", 1), ("d", "c", 1), ("d", "e", 1)])
+    index = graph.node_index
+    mutual = {(str(graph.nodes[s]), str(graph.nodes[t])) for s, t, m in zip(graph.sources(), graph.indices, mutual_edges(graph)) if m}
+    assert mutual == {("a", "b"), ("b", "a"), ("c", "d"), ("d", "c")}
+
+    labels = label_propagation(graph, mutual_edges(graph))
+    assert labels[index["a"]] == labels[index["b"]] != labels[index["c"]] == labels[index["d"]]
+    assert labels[index["e"]] == -1
+
+    components = strongly_connected_components(graph)
+    assert components[index["a"]] == components[index["b"]] != components[index["c"]]
+    assert len(set(components.tolist())) == 3
+    print("✅ Pass\n")
+
+
+def test_ring_flagged_and_stake_clears():
+    """Test 2: Unstaked rings are flagged; the same ring with full stake is not"""
+    print("Test 2: Suspiciousness")
+
+    edges, ring = _edges()
+    graph = _graph(edges)
+    report = detect_sybils(graph)
+    assert set(report.suspicious()) == set(ring) | {"did:c0", "did:c1", "did:c2"}
+    assert report.score("did:h5") < 0.5
+
+    staked = np.full(graph.node_count, 2.0)
+    assert detect_sybils(graph, staked).suspicious() == []
+    print("✅ Pass\n")
+
+
+def test_down_weights_demote_ring():
+    """Test 3: Feeding the report back into PageRank lowers the ring's scores"""
+    print("Test 3: Edge down-weights")
+
+    edges, ring = _edges()
+    graph = _graph(edges)
+    report = detect_sybils(graph)
+    factors = report.edge_factors()
+    assert factors.min() < 0.1 and (factors > 0.85).sum() > 1900
+
+    index = graph.node_index
+    before = pagerank_scores(graph)
+    after = pagerank_scores(report.apply(), issuer_weights=report.flow_weights())
+    ring_rows = [index[node] for node in ring]
+    assert after[ring_rows].mean() < 0.5 * before[ring_rows].mean()
+
+    records = [{"trustAtom": {"issuer": a, "target": b, "overall": w}} for a, b, w in edges]
+    refresher = PageRankRefresher(lambda: records, sybil_strength=1.0)
+    snapshot = refresher.refresh()
+    assert snapshot.score(ring[0]) < 0.5 * before[index[ring[0]]] / before.max()
+    assert refresher.get_stats()["sybil"]["flaggedNodes"] == 11
+    print("✅ Pass\n")
+
+
+def test_publisher_passes_strength():
+    """Test 4: The publisher's background refresher gets the configured sybil_strength"""
+    print("Test 4: Publisher sybil_strength")
+
+    publisher = DKGPublisher(storage_file=os.path.join(tempfile.mkdtemp(), "atoms.json"))
+    refresher = publisher.start_rank_refresher(interval=3600, sybil_strength=0.5)
+    try:
+        assert refresher.sybil_strength == 0.5
+    finally:
+        publisher.stop_rank_refresher()
+    print("✅ Pass\n")
+
+
+def main():
+    print("🧪 Running Sybil Detection Tests\n")
+
+    test_building_blocks()
+    test_ring_flagged_and_stake_clears()
+    test_down_weights_demote_ring()
+    test_publisher_passes_strength()
+
+    print("🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
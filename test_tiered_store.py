@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Tiered Atom Store Tests"""
+
+import os
+import tempfile
+
+from src.core.atom_store import AtomStore
+from src.core.content_hash import atom_content_id, local_ka_id
+from src.core.dkg_publisher import DKGPublisher
+from src.core.tiered_store import TieredAtomStore
+from src.core.trust_atom import TrustAtomV7, TrustVector
+
+
+def _records(count):
+    records = []
+    for i in range(count):
+        jsonld = TrustAtomV7(issuer=f"did:{i % 5}", target=f"did:t{i % 7}", content=f"atom {i}").to_jsonld()
+        cid = atom_content_id(jsonld)
+        records.append({
+            "kaId": local_ka_id(cid),
+            "contentId": cid,
+            "trustAtom": jsonld,
+            "timestamp": "2025-01-01T00:00:00",
+            "mode": "LOCAL"
+        })
+    return records
+
+
+def _tiered(directory, records, **kwargs):
+    store = TieredAtomStore(directory, segment_size=8, **kwargs)
+    for record in records:
+        store.append(record)
+    store.save()
+    return store
+
+
+def test_bodies_stay_on_disk():
+    """Test 1: Sealed segments are paged in on access; only index columns are held"""
+    print("Test 1: Bodies paged in from segments")
+
+    directory = os.path.join(tempfile.mkdtemp(), "atoms")
+    records = _records(30)
+    _tiered(directory, records)
+
+    store = TieredAtomStore(directory, segment_size=8)
+    assert store.load() == 30
+    stats = store.get_stats()
+    assert stats["sealedAtoms"] == 24 and stats["hotAtoms"] == 6 and stats["pagedIn"] == 0
+    assert store.table.vector.size == 0 and store.table.issued.size == 0
+
+    assert list(store.atoms) == records
+    assert store.get_by_content_id(records[3]["contentId"]) == records[3]
+    assert store.mode_counts() == {"LOCAL": 30}
+    assert store.get_stats()["pagedIn"] >= 24
+
+    reloaded = AtomStore(directory)
+    reloaded.load()
+    assert list(reloaded.atoms) == records
+    print("✅ Pass\n")
+
+
+def test_patches_and_compaction():
+    """Test 2: Updates to sealed rows go to a patch file until compaction folds them in"""
+    print("Test 2: Patches and compaction")
+
+    directory = os.path.join(tempfile.mkdtemp(), "atoms")
+    records = _records(20)
+    store = _tiered(directory, records, compact_after=3)
+    store.update(records[1]["contentId"], mode="DKG_TESTNET", kaId="ual:1")
+    store.update(records[18]["contentId"], mode="DKG_TESTNET")
+    store.save()
+    assert os.path.exists(os.path.join(directory, "patches.npz"))
+
+    for reopened in (TieredAtomStore(directory, segment_size=8), AtomStore(directory)):
+        reopened.load()
+        assert reopened.get_by_content_id(records[1]["contentId"])["kaId"] == "ual:1"
+        assert reopened.mode_counts() == {"LOCAL": 18, "DKG_TESTNET": 2}
+
+    store.update(records[2]["contentId"], mode="DKG_TESTNET")
+    store.update(records[9]["contentId"], mode="DKG_TESTNET")
+    store.save()
+    assert store.get_stats()["compactions"] == 1 and store.get_stats()["patchedAtoms"] == 0
+    assert not os.path.exists(os.path.join(directory, "patches.npz"))
+
+    compacted = TieredAtomStore(directory, segment_size=8)
+    compacted.load()
+    assert compacted.mode_counts() == {"LOCAL": 16, "DKG_TESTNET": 4}
+    assert compacted.get_by_content_id(records[9]["contentId"])["mode"] == "DKG_TESTNET"
+    print("✅ Pass\n")
+
+
+def test_target_cache():
+    """Test 3: Queried targets are cached up to hot_records and dropped when they change"""
+    print("Test 3: Target cache")
+
+    directory = os.path.join(tempfile.mkdtemp(), "atoms")
+    records = _records(28)
+    store = _tiered(directory, records, hot_records=8)
+
+    assert len(store.by_target("did:t0")) == 4
+    assert len(store.by_target("did:t0")) == 4
+    assert len(store.by_target("did:t1")) == 4
+    stats = store.get_stats()
+    assert stats["cacheHits"] == 1 and stats["cacheMisses"] == 2 and stats["cachedAtoms"] == 8
+    store.by_target("did:t2")
+    assert store.get_stats()["cachedTargets"] == 2          # did:t0 evicted
+
+    store.append(_records(29)[28])                          # another atom about did:t0
+    store.update(records[1]["contentId"], mode="DKG_TESTNET")
+    assert len(store.by_target("did:t0")) == 5
+    assert store.by_target("did:t1")[0]["mode"] == "DKG_TESTNET"
+    print("✅ Pass\n")
+
+
+def test_publisher_stats_are_counts():
+    """Test 4: A tiered publisher answers stats and queries without listing atoms"""
+    print("Test 4: Publisher over a tiered store")
+
+    publisher = DKGPublisher(storage_file=os.path.join(tempfile.mkdtemp(), "atoms"), hot_atoms=100)
+    for target in ("did:b", "did:c", "did:b"):
+        publisher.publish_trust_atom(TrustAtomV7(issuer="did:a", target=target, trust_vector=TrustVector(honesty=0.6)))
+    assert isinstance(publisher.store, TieredAtomStore)
+
+    stats = publisher.get_stats()
+    assert "atoms" not in stats
+    assert stats["totalPublished"] == 2 and stats["localPublished"] == 2
+    assert stats["store"]["atoms"] == 2
+    assert len(publisher.query_trust_atoms("did:b")) == 1
+
+    # Body fields of a target page come from the target cache
+    page = publisher.list_trust_atoms("did:b", fields=["issuer", "issued", "timestamp"])
+    assert page["atoms"][0]["issued"] and page["atoms"][0]["timestamp"]
+    publisher.list_trust_atoms("did:b", fields=["issued"])
+    assert publisher.store.get_stats()["cacheHits"] == 1
+
+    try:
+        DKGPublisher(storage_file=os.path.join(tempfile.mkdtemp(), "atoms.json"), hot_atoms=100)
+        raise AssertionError("hot_atoms with a .json file accepted")
+    except ValueError:
+        pass
+    print("✅ Pass\n")
+
+
+def main():
+    print("🧪 Running Tiered Atom Store Tests\n")
+
+    test_bodies_stay_on_disk()
+    test_patches_and_compaction()
+    test_target_cache()
+    test_publisher_stats_are_counts()
+
+    print("🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
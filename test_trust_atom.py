@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """Trust Atom v7 Tests"""
 
+from pydantic import ValidationError
+
 from src.core.trust_atom import TrustAtomV7, TrustVector
 
 
@@ -125,6 +127,65 @@ def test_dkg_asset():
     print("✅ Pass\n")
 
 
+def test_content_id():
+    """Test 7: Content ID is deterministic"""
+    print("Test 7: Content ID")
+    
+    atom1 = TrustAtomV7(
+        issuer="did:key:z6Mk444",
+        target="npub1hash",
+        trust_vector=TrustVector(honesty=0.7),
+        issued="2025-01-01T00:00:00Z"
+    )
+    
+    atom2 = TrustAtomV7(
+        issuer="did:key:z6Mk444",
+        target="npub1hash",
+        trust_vector=TrustVector(honesty=0.7),
+        issued="2025-06-01T00:00:00Z"
+    )
+    
+    atom3 = TrustAtomV7(
+        issuer="did:key:z6Mk444",
+        target="npub1hash",
+        trust_vector=TrustVector(honesty=0.71)
+    )
+    
+    assert atom1.content_id() == atom2.content_id()
+    assert atom1.content_id() != atom3.content_id()
+    assert atom1.to_dkg_asset()["public"]["@id"] == atom2.to_dkg_asset()["public"]["@id"]
+    print("✅ Pass\n")
+
+
+def test_cached_overall():
+    """Test 8: JSON-LD round trip; overall is cached per immutable vector"""
+    print("Test 8: Cached overall")
+    
+    atom = TrustAtomV7(
+        issuer="did:key:z6Mk555",
+        target="npub1fast",
+        trust_vector=TrustVector(honesty=0.9, stake_weight=1.5),
+        content="Fast path",
+        required_stake="150"
+    )
+    jsonld = atom.to_jsonld()
+    replayed = TrustAtomV7.from_jsonld(jsonld)
+    
+    assert replayed == atom
+    assert replayed.to_jsonld() == jsonld and replayed.content_id() == atom.content_id()
+    assert replayed.is_valid() and replayed.overall == atom.overall
+    
+    assert "overall" in vars(atom.trust_vector)     # computed once, reused
+    atom.trust_vector = TrustVector(honesty=0.1)
+    assert atom.overall < replayed.overall
+    try:
+        atom.trust_vector.honesty = 1.0
+        assert False, "trust vector mutated"
+    except ValidationError:
+        pass
+    print("✅ Pass\n")
+
+
 def main():
     print("🧪 Running Trust Atom v7 Tests\n")
     
@@ -134,6 +195,8 @@ def main():
     test_validation()
     test_jsonld_export()
     test_dkg_asset()
+    test_content_id()
+    test_cached_overall()
     
     print("🎉 All tests passed!")
 